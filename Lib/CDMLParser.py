@@ -5,6 +5,7 @@ Parse a CDML/XML file
 from .cdxmllib import XMLParser
 from . import CDML
 import re
+from xml.parsers import expat
 from . import cdmsNode
 
 # Error constants
@@ -341,6 +342,101 @@ class CDMLParser(XMLParser):
         XMLParser.close(self)
 
 
+class ExpatCDMLParser(CDMLParser):
+    """CDML parser driven by the expat C tokenizer.
+
+    Builds the same node tree as CDMLParser: the start_/end_ handlers,
+    the DTD validation in handle_starttag and handle_data are shared, only
+    the tokenizing of the text is done by xml.parsers.expat.
+    """
+
+    def __init__(self, verbose=0):
+        CDMLParser.__init__(self, verbose)
+        self._data = []
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._startElement
+        parser.EndElementHandler = self._endElement
+        parser.CharacterDataHandler = self._characterData
+        parser.StartCdataSectionHandler = self._startCdata
+        parser.EndCdataSectionHandler = self._endCdata
+        self._parser = parser
+
+    # expat may split the content of an element, pass it to handle_data
+    # in one piece as cdxmllib does
+    def _flush(self):
+        if self._data:
+            data = ''.join(self._data)
+            self._data = []
+            self.handle_data(data)
+
+    def _characterData(self, data):
+        self._data.append(data)
+
+    # CDATA sections are reported to handle_cdata, not to handle_data
+    def _startCdata(self):
+        self._flush()
+
+    def _endCdata(self):
+        data = ''.join(self._data)
+        self._data = []
+        self.handle_cdata(data)
+
+    def _startElement(self, tag, attrs):
+        self._flush()
+        self.lineno = self._parser.CurrentLineNumber
+        method = self.elements.get(tag, (None, None))[0]
+        if method is not None:
+            self.handle_starttag(tag, method, attrs)
+        else:
+            self.unknown_starttag(tag, attrs)
+
+    def _endElement(self, tag):
+        self._flush()
+        self.lineno = self._parser.CurrentLineNumber
+        method = self.elements.get(tag, (None, None))[1]
+        if method is not None:
+            self.handle_endtag(tag, method)
+        else:
+            self.unknown_endtag(tag)
+
+    def feed(self, data):
+        self._parser.Parse(data, False)
+
+    def close(self):
+        self._parser.Parse('', True)
+        self._flush()
+
+
+def parseCDML(text):
+    """Parse a CDML document.
+
+    Parameters
+    ----------
+    text : CDML document, str or bytes
+
+    Returns
+    -------
+    Root node of the parse tree.
+
+    Notes
+    -----
+    The document is parsed with ExpatCDMLParser. Documents expat rejects
+    as malformed are parsed again with the more permissive CDMLParser.
+    """
+    p = ExpatCDMLParser()
+    try:
+        p.feed(text)
+        p.close()
+    except expat.ExpatError:
+        if isinstance(text, bytes):
+            text = text.decode('utf-8')
+        p = CDMLParser()
+        p.feed(text)
+        p.close()
+    return p.getRoot()
+
+
 if __name__ == '__main__':
     import sys
 
@@ -186,6 +186,9 @@ def commonAxes(a, bdom, omit=None):
             bj = bdom[j]
             if len(aj) != len(bj):
                 return None
+            elif aj is bj or (isinstance(aj, TransientAxis) and aj.sharesValues(bj)):
+                # results of previous operations share their axis values
+                common[j] = aj
             elif axisAllclose(aj, bj):
                 common[j] = aj
             else:
@@ -259,13 +262,21 @@ def commonGrid1(a, gb, axes):
 
     if result is not None:
         for item in result.getAxisList():
-            if item not in axes:
+            if not _hasAxis(axes, item):
                 result = None
                 break
 
     return result
 
 
+def _hasAxis(axes, item):
+    """Test whether item is one of axes, or a copy sharing its values."""
+    for axis in axes:
+        if axis is item or (isinstance(axis, TransientAxis) and axis.sharesValues(item)):
+            return True
+    return False
+
+
 class var_binary_operation:
     def __init__(self, mafunc):
         """
@@ -287,8 +298,11 @@ class var_binary_operation:
         ta = _makeMaskedArg(a)
         tb = _makeMaskedArg(b)
         maresult = self.mafunc(ta, tb, **kwargs)
-        return TransientVariable(
-            maresult, axes=axes, grid=grid, no_update_from=True, id=id)
+        result = TransientVariable(maresult, no_update_from=True, id=id)
+        if axes is not None:
+            # the axes and grid were checked by commonDomain and commonGrid
+            result._reuseDomain(axes, grid)
+        return result
 
     def reduce(self, target, axis=0):
         ttarget = _makeMaskedArg(target)
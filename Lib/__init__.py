@@ -6,6 +6,8 @@ CDMS module-level API
 from .error import CDMSError  # noqa
 from lazy_object_proxy import Proxy
 from . import dataset
+from . import variable
+from . import fvariable
 from . import selectors
 from . import avariable
 from . import tvariable
@@ -15,6 +17,8 @@ from . import mvVsWriter
 from . import mvVTKSGWriter
 from . import mvVTKUGWriter
 from . import mvCdmsRegrid
+from . import regridcache
+from . import cache
 from . import cdmsobj
 from . import axis
 from . import grid
@@ -25,7 +29,8 @@ __all__ = ["cdmsobj", "axis", "coord", "grid", "hgrid", "avariable",
            "sliceut", "error", "variable", "fvariable", "tvariable", "dataset",
            "database", "cache", "selectors", "MV2", "convention", "bindex",
            "auxcoord", "gengrid", "gsHost", "gsStaticVariable", "gsTimeVariable",
-           "mvBaseWriter", "mvSphereMesh", "mvVsWriter", "mvCdmsRegrid"]
+           "mvBaseWriter", "mvSphereMesh", "mvVsWriter", "mvCdmsRegrid",
+           "regridcache"]
 
 
 # CDMS datatypes
@@ -90,6 +95,17 @@ getNetcdf4Flag = Proxy(lambda: dataset.getNetcdf4Flag)
 setNetcdfUseParallelFlag = Proxy(lambda: dataset.setNetcdfUseParallelFlag)
 getNetcdfUseParallelFlag = Proxy(lambda: dataset.getNetcdfUseParallelFlag)
 
+setLazyOpenFlag = Proxy(lambda: dataset.setLazyOpenFlag)
+getLazyOpenFlag = Proxy(lambda: dataset.getLazyOpenFlag)
+setCdmlCacheDirectory = Proxy(lambda: dataset.setCdmlCacheDirectory)
+getCdmlCacheDirectory = Proxy(lambda: dataset.getCdmlCacheDirectory)
+setDatasetFilePoolSize = Proxy(lambda: dataset.setDatasetFilePoolSize)
+getDatasetFilePoolSize = Proxy(lambda: dataset.getDatasetFilePoolSize)
+setDatasetReadWorkers = Proxy(lambda: variable.setDatasetReadWorkers)
+getDatasetReadWorkers = Proxy(lambda: variable.getDatasetReadWorkers)
+setChunkedReadFlag = Proxy(lambda: fvariable.setChunkedReadFlag)
+getChunkedReadFlag = Proxy(lambda: fvariable.getChunkedReadFlag)
+
 getMpiRank = Proxy(lambda: dataset.getMpiRank)
 getMpiSize = Proxy(lambda: dataset.getMpiSize)
 
@@ -106,6 +122,9 @@ longitudeslice = Proxy(lambda: selectors.longitudeslice)
 latitudeslice = Proxy(lambda: selectors.latitudeslice)
 levelslice = Proxy(lambda: selectors.levelslice)
 timeslice = Proxy(lambda: selectors.timeslice)
+setSelectorFusionFlag = Proxy(lambda: selectors.setSelectorFusionFlag)
+getSelectorFusionFlag = Proxy(lambda: selectors.getSelectorFusionFlag)
+clearSelectorPlanCache = Proxy(lambda: selectors.clearSelectorPlanCache)
 
 order2index = Proxy(lambda: avariable.order2index)
 orderparse = Proxy(lambda: avariable.orderparse)
@@ -125,6 +144,20 @@ VTKSGWriter = Proxy(lambda: mvVTKSGWriter.VTKSGWriter)
 VTKUGWriter = Proxy(lambda: mvVTKUGWriter.VTKUGWriter)
 CdmsRegrid = Proxy(lambda: mvCdmsRegrid.CdmsRegrid)
 
+# Regridding weight cache
+setRegridCacheSize = Proxy(lambda: regridcache.setRegridCacheSize)
+getRegridCacheSize = Proxy(lambda: regridcache.getRegridCacheSize)
+setRegridCacheDirectory = Proxy(lambda: regridcache.setRegridCacheDirectory)
+getRegridCacheDirectory = Proxy(lambda: regridcache.getRegridCacheDirectory)
+getRegridCacheStats = Proxy(lambda: regridcache.getRegridCacheStats)
+clearRegridCache = Proxy(lambda: regridcache.clearRegridCache)
+
+# Cache of remote files
+setFileCacheDirectory = Proxy(lambda: cache.setFileCacheDirectory)
+getFileCacheDirectory = Proxy(lambda: cache.getFileCacheDirectory)
+setFileCacheSize = Proxy(lambda: cache.setFileCacheSize)
+getFileCacheSize = Proxy(lambda: cache.getFileCacheSize)
+
 # Gridspec is not installed by default so just pass on if it isn't installed
 try:
     from .gsStaticVariable import StaticFileVariable  # noqa
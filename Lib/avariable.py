@@ -14,7 +14,9 @@ from .error import CDMSError
 from .axis import axisMatchIndex, axisMatchAxis, axisMatches, unspecified, CdtimeTypes, AbstractAxis
 from . import selectors
 import copy
+from concurrent.futures import ThreadPoolExecutor
 from .mvCdmsRegrid import CdmsRegrid, getBoundList, _getCoordList
+from . import regridcache
 from regrid2.mvGenericRegrid import guessPeriodicity
 # import PropertiedClasses
 from .convention import CF1
@@ -860,6 +862,58 @@ class AbstractVariable(CdmsObj, Slab):
             result = result.item()
         return result
 
+    def iterchunks(self, axis='time', size=1, prefetch=True, **keys):
+        """Iterate over the variable in blocks along one axis.
+
+        Parameters
+        ----------
+        axis : axis specification (see axisMatches) or axis index, the
+               axis to iterate along. Default is the time axis.
+        size : number of axis values in each block. The last block may be
+               shorter.
+        prefetch : if True (default) the next block is read in a background
+                   thread while the current one is being processed.
+        **keys : other subSlice keywords (squeeze, order, grid, ...)
+
+        Returns
+        -------
+        Generator of TransientVariable blocks, as returned by subSlice.
+
+        Examples
+        --------
+            >>> for block in f['ta'].iterchunks('time', 12):
+            ...     process(block)
+        """
+        rank = self.rank()
+        if isinstance(axis, int):
+            index = axis + rank if axis < 0 else axis
+        else:
+            index = self.getAxisIndex(axis)
+        if index < 0 or index >= rank:
+            raise CDMSError('No axis matching %s' % str(axis))
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            raise CDMSError('Chunk size must be an integer >= 1')
+        length = self.shape[index]
+
+        def read(start):
+            slicelist = [slice(None)] * rank
+            slicelist[index] = slice(start, min(start + size, length))
+            return self.subSlice(*slicelist, **keys)
+
+        starts = list(range(0, length, size))
+        if not prefetch or len(starts) < 2:
+            for start in starts:
+                yield read(start)
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(read, starts[0])
+            for start in starts[1:]:
+                block = future.result()
+                future = pool.submit(read, start)
+                yield block
+            yield future.result()
+
     def expertSlice(self, slicelist):
         raise CDMSError(NotImplemented + 'expertSlice')
 
@@ -1069,18 +1123,7 @@ class AbstractVariable(CdmsObj, Slab):
         if(donew):
 
             wraps = splitSliceExt(wrapslice, length)
-
-            for kk in range(0, len(wraps)):
-                sl = wraps[kk]
-
-                slicelist[wrapdim] = sl
-
-                if(kk == 0):
-                    ar1 = self.getSlice(squeeze=0, *slicelist)
-                    result = ar1
-                else:
-                    ar2 = self.getSlice(squeeze=0, *slicelist)
-                    result = numpy.ma.concatenate((result, ar2), axis=wrapdim)
+            result = self._readWrapped(slicelist, wrapdim, wraps, length)
 
         else:
 
@@ -1149,6 +1192,71 @@ class AbstractVariable(CdmsObj, Slab):
         else:
             return result.getSlice(squeeze=0, raw=1)
 
+    def _readWrapped(self, slicelist, wrapdim, wraps, length):
+        """Read the pieces of a wraparound request into a single array.
+
+        Parameters
+        ----------
+        slicelist : list of slices, slicelist[wrapdim] is replaced by each piece
+        wrapdim : index of the wrapped (circular) dimension
+        wraps : list of slices within 0..length, as returned by splitSliceExt
+        length : length of the wrapped axis
+
+        Returns
+        -------
+        numpy.ma array, the pieces joined along wrapdim.
+
+        Notes
+        -----
+        When the pieces cover at least half of the axis the whole axis is
+        read once and the pieces are copied from memory, otherwise each piece
+        is read and copied in place into a preallocated result.
+        """
+        pieces = [sl.indices(length) for sl in wraps]
+        sizes = [len(range(*p)) for p in pieces]
+        total = sum(sizes)
+
+        if len(wraps) == 1:
+            slicelist[wrapdim] = wraps[0]
+            return self.getSlice(squeeze=0, *slicelist)
+
+        whole = None
+        if 2 * total >= length:
+            slicelist[wrapdim] = slice(0, length, 1)
+            whole = self.getSlice(squeeze=0, *slicelist)
+
+        data = mask = None
+        offset = 0
+        for sl, p, n in zip(wraps, pieces, sizes):
+            if n == 0:
+                continue
+            if whole is not None:
+                index = [slice(None)] * whole.ndim
+                index[wrapdim] = slice(*p)
+                if p[1] < 0:
+                    # Negative stride down to the first element
+                    index[wrapdim] = slice(p[0], None, p[2])
+                ar = whole[tuple(index)]
+            else:
+                slicelist[wrapdim] = sl
+                ar = self.getSlice(squeeze=0, *slicelist)
+            if data is None:
+                shape = list(ar.shape)
+                shape[wrapdim] = total
+                data = numpy.empty(shape, ar.dtype)
+                mask = numpy.zeros(shape, numpy.bool_)
+            index = [slice(None)] * data.ndim
+            index[wrapdim] = slice(offset, offset + n)
+            index = tuple(index)
+            data[index] = numpy.ma.getdata(ar)
+            mask[index] = numpy.ma.getmaskarray(ar)
+            offset += n
+
+        slicelist[wrapdim] = wraps[-1]
+        if not mask.any():
+            mask = numpy.ma.nomask
+        return numpy.ma.masked_array(data, mask=mask)
+
     def getValue(self, squeeze=1):
         """Get the entire set of values.
 
@@ -1324,8 +1432,14 @@ avariable.regrid: We chose regridMethod = %s for you among the following choices
                         isinstance(keywords['diag'], dict):
                     keywords['diag']['regridTool'] = 'regrid'
 
-                # the original cdms2 regridder
-                regridf = Horizontal(fromgrid, togrid)
+                # the original cdms2 regridder, weights are cached in memory
+                # and optionally on disk
+                key = regridcache.regridKey(fromgrid, togrid, 'regrid2', None)
+                regridf = regridcache.getRegridder(
+                    key,
+                    lambda: Horizontal(fromgrid, togrid),
+                    save=lambda r: r.getWeights(),
+                    load=lambda w: Horizontal(fromgrid, togrid, weights=w))
                 return regridf(self, missing=missing, order=order,
                                mask=mask, **keywords)
 
@@ -1336,18 +1450,26 @@ avariable.regrid: We chose regridMethod = %s for you among the following choices
 #            if numpy.any(self.mask == True):
 #                srcGridMask = getMinHorizontalMask(self)
 
-            # compute the interpolation weights
-            ro = CdmsRegrid(fromgrid, togrid,
-                            dtype=self.dtype,
-                            regridMethod=regridMethod,
-                            regridTool=regridTool,
-                            srcGridMask=srcGridMask,
-                            srcGridAreas=None,
-                            dstGridMask=None,
-                            dstGridAreas=None,
-                            **keywords)
-            # now interpolate
-            return ro(self, **keywords)
+            # compute the interpolation weights, or reuse the ones computed
+            # by a previous call with the same grids and options
+            key = regridcache.regridKey(fromgrid, togrid, regridTool,
+                                        regridMethod, dtype=self.dtype,
+                                        **keywords)
+            # the ESMF and LibCF tools are not reentrant, concurrent calls
+            # sharing the regridder wait for each other
+            with regridcache.useRegridder(
+                    key,
+                    lambda: CdmsRegrid(fromgrid, togrid,
+                                       dtype=self.dtype,
+                                       regridMethod=regridMethod,
+                                       regridTool=regridTool,
+                                       srcGridMask=srcGridMask,
+                                       srcGridAreas=None,
+                                       dstGridMask=None,
+                                       dstGridAreas=None,
+                                       **keywords)) as ro:
+                # now interpolate
+                return ro(self, **keywords)
 
     def pressureRegrid(self, newLevel, missing=None, order=None, method="log"):
         """Return the variable regridded to new pressure levels.
@@ -1473,148 +1595,15 @@ avariable.regrid: We chose regridMethod = %s for you among the following choices
         return singles
 
     def specs2slices(self, speclist, force=None):
-        """Create an equivalent list of slices from an index specification.
-           An index specification is a list of acceptable items, which are
-
-               * an integer
-               * a slice instance (slice(start, stop, stride))
-               * the object "unspecified"
-               * the object None
-               * a colon
-
-           The size of the speclist must be self.rank()
-
+        """Create an equivalent list of slices from an index specification,
+           see axesSpecs2slices.
         """
-        if len(speclist) != self.rank():
-            raise CDMSError("Incorrect length of speclist in specs2slices.")
-        slicelist = []
-        for i in range(self.rank()):
-            key = speclist[i]
-            if isinstance(key, int):  # x[i]
-                slicelist.append(slice(key, key + 1))
-            elif isinstance(key, slice):  # x[i:j:k]
-                slicelist.append(key)
-            elif key is unspecified or key is None or key == ':':
-                slicelist.append(slice(0, len(self.getAxis(i))))
-            elif key is Ellipsis:
-                raise CDMSError("Misuse of ellipsis in specification.")
-            elif isinstance(key, tuple):
-                slicelist.append(slice(*key))
-            else:
-                raise CDMSError('invalid index: %s' % str(key))
-        # Change default or negative start, stop to positive
-        for i in range(self.rank()):
-            axis = self.getAxis(i)
-            length = len(axis)
-            start = slicelist[i].start
-            stop = slicelist[i].stop
-            step = slicelist[i].step
-            #
-            # allow negative indices in a wrapped (isCircular() = 1) axis
-            #
-            circular = (axis.isCircular() and force is None)
-
-            altered = 0
-            if step is None:
-                altered = 1
-                step = 1
-
-            if ((start is None or stop is None or start <
-                 0 or stop < 0) and (circular == 0)):
-                altered = 1
-                adjustit = 1
-                if step > 0:
-                    if start is None:
-                        start = 0
-                    if stop is None:
-                        stop = length
-                    if start == -1 and stop == 0:
-                        stop = length
-                else:
-                    if start is None:
-                        start = length - 1
-                    if stop is None:
-                        # stop=-1
-                        adjustit = 0
-                if (start is None or start < 0):
-                    start = start % length
-                if (stop is None or stop < 0) and adjustit:
-                    stop = stop % length
-            if altered:
-                slicelist[i] = slice(start, stop, step)
-        return slicelist
+        axes = [self.getAxis(i) for i in range(self.rank())]
+        return axesSpecs2slices(axes, speclist, force)
 
     def reg_specs2slices(self, initspeclist, force=None):
-
-        # Don't use input to store return value
-        speclist = copy.copy(initspeclist)
-
-        for i in range(self.rank()):
-            item = speclist[i]
-            if isinstance(item, slice):
-                newitem = item
-            elif item == ':' or item is None or item is unspecified:
-                axis = self.getAxis(i)
-                newitem = slice(0, len(axis))
-            elif isinstance(item, list) or \
-                    isinstance(item, tuple):
-                axis = self.getAxis(i)
-                if len(item) == 2:        # (start,end)
-                    indexInterval = axis.mapIntervalExt(item)
-                elif len(item) == 3:      # (start,end,'xxx')
-                    coordInterval = (item[0], item[1])
-                    indexInterval = axis.mapIntervalExt(coordInterval, item[2])
-                elif len(item) == 4:
-                    coordInterval = (item[0], item[1])
-                    indexInterval = axis.mapIntervalExt(
-                        coordInterval, item[2], item[3])
-                elif len(item) == 5:
-                    coordInterval = (item[0], item[1])
-                    indexInterval = axis.mapIntervalExt(
-                        coordInterval, item[2], item[3], item[4])
-                elif len(item) == 6:
-                    coordInterval = (item[0], item[1])
-                    indexInterval = axis.mapIntervalExt(
-                        coordInterval, item[2], item[3], item[4], item[5])
-                else:
-                    raise CDMSError(
-                        InvalidRegion +
-                        "invalid format for coordinate interval: %s" %
-                        str(item))
-                if indexInterval is None:
-                    raise CDMSError(OutOfRange + str(item))
-                newitem = slice(
-                    indexInterval[0],
-                    indexInterval[1],
-                    indexInterval[2])
-            elif isinstance(item, numpy.floating) or \
-                    isinstance(item, float) or \
-                    isinstance(item, numpy.integer) or \
-                    isinstance(item, int) or \
-                    isinstance(item, int) or \
-                    isinstance(item, string_types) or \
-                    type(item) in CdtimeTypes:
-                axis = self.getAxis(i)
-                #
-                # default is 'ccn' in axis.mapIntervalExt
-                #
-                indexInterval = axis.mapIntervalExt((item, item))
-                if indexInterval is None:
-                    raise CDMSError(OutOfRange + str(item))
-                newitem = slice(
-                    indexInterval[0],
-                    indexInterval[1],
-                    indexInterval[2])
-            else:
-                raise CDMSError(
-                    InvalidRegion +
-                    "invalid format for coordinate interval: %s" %
-                    str(item))
-
-            speclist[i] = newitem
-
-        slicelist = self.specs2slices(speclist, force)
-        return slicelist
+        axes = [self.getAxis(i) for i in range(self.rank())]
+        return axesRegSpecs2slices(axes, initspeclist, force)
 
     def _decodedType(self):
         "The datatype after decoding."
@@ -1815,6 +1804,155 @@ __rp = r'\s*([-txyz0-9]{1,1}|\(\s*\w+\s*\)|[.]{3,3})\s*'
 __crp = re.compile(__rp)
 
 
+def axesSpecs2slices(axes, speclist, force=None):
+    """Create an equivalent list of slices from an index specification.
+       An index specification is a list of acceptable items, which are
+
+           * an integer
+           * a slice instance (slice(start, stop, stride))
+           * the object "unspecified"
+           * the object None
+           * a colon
+
+       The size of the speclist must be len(axes)
+
+    """
+    if len(speclist) != len(axes):
+        raise CDMSError("Incorrect length of speclist in specs2slices.")
+    slicelist = []
+    for i in range(len(axes)):
+        key = speclist[i]
+        if isinstance(key, int):  # x[i]
+            slicelist.append(slice(key, key + 1))
+        elif isinstance(key, slice):  # x[i:j:k]
+            slicelist.append(key)
+        elif key is unspecified or key is None or key == ':':
+            slicelist.append(slice(0, len(axes[i])))
+        elif key is Ellipsis:
+            raise CDMSError("Misuse of ellipsis in specification.")
+        elif isinstance(key, tuple):
+            slicelist.append(slice(*key))
+        else:
+            raise CDMSError('invalid index: %s' % str(key))
+    # Change default or negative start, stop to positive
+    for i in range(len(axes)):
+        axis = axes[i]
+        length = len(axis)
+        start = slicelist[i].start
+        stop = slicelist[i].stop
+        step = slicelist[i].step
+        #
+        # allow negative indices in a wrapped (isCircular() = 1) axis
+        #
+        circular = (axis.isCircular() and force is None)
+
+        altered = 0
+        if step is None:
+            altered = 1
+            step = 1
+
+        if ((start is None or stop is None or start <
+             0 or stop < 0) and (circular == 0)):
+            altered = 1
+            adjustit = 1
+            if step > 0:
+                if start is None:
+                    start = 0
+                if stop is None:
+                    stop = length
+                if start == -1 and stop == 0:
+                    stop = length
+            else:
+                if start is None:
+                    start = length - 1
+                if stop is None:
+                    # stop=-1
+                    adjustit = 0
+            if (start is None or start < 0):
+                start = start % length
+            if (stop is None or stop < 0) and adjustit:
+                stop = stop % length
+        if altered:
+            slicelist[i] = slice(start, stop, step)
+    return slicelist
+
+
+def axesRegSpecs2slices(axes, initspeclist, force=None):
+    """As axesSpecs2slices, first mapping coordinate intervals and values
+       on axes to index slices.
+    """
+
+    # Don't use input to store return value
+    speclist = copy.copy(initspeclist)
+
+    for i in range(len(axes)):
+        item = speclist[i]
+        if isinstance(item, slice):
+            newitem = item
+        elif item == ':' or item is None or item is unspecified:
+            axis = axes[i]
+            newitem = slice(0, len(axis))
+        elif isinstance(item, list) or \
+                isinstance(item, tuple):
+            axis = axes[i]
+            if len(item) == 2:        # (start,end)
+                indexInterval = axis.mapIntervalExt(item)
+            elif len(item) == 3:      # (start,end,'xxx')
+                coordInterval = (item[0], item[1])
+                indexInterval = axis.mapIntervalExt(coordInterval, item[2])
+            elif len(item) == 4:
+                coordInterval = (item[0], item[1])
+                indexInterval = axis.mapIntervalExt(
+                    coordInterval, item[2], item[3])
+            elif len(item) == 5:
+                coordInterval = (item[0], item[1])
+                indexInterval = axis.mapIntervalExt(
+                    coordInterval, item[2], item[3], item[4])
+            elif len(item) == 6:
+                coordInterval = (item[0], item[1])
+                indexInterval = axis.mapIntervalExt(
+                    coordInterval, item[2], item[3], item[4], item[5])
+            else:
+                raise CDMSError(
+                    InvalidRegion +
+                    "invalid format for coordinate interval: %s" %
+                    str(item))
+            if indexInterval is None:
+                raise CDMSError(OutOfRange + str(item))
+            newitem = slice(
+                indexInterval[0],
+                indexInterval[1],
+                indexInterval[2])
+        elif isinstance(item, numpy.floating) or \
+                isinstance(item, float) or \
+                isinstance(item, numpy.integer) or \
+                isinstance(item, int) or \
+                isinstance(item, int) or \
+                isinstance(item, string_types) or \
+                type(item) in CdtimeTypes:
+            axis = axes[i]
+            #
+            # default is 'ccn' in axis.mapIntervalExt
+            #
+            indexInterval = axis.mapIntervalExt((item, item))
+            if indexInterval is None:
+                raise CDMSError(OutOfRange + str(item))
+            newitem = slice(
+                indexInterval[0],
+                indexInterval[1],
+                indexInterval[2])
+        else:
+            raise CDMSError(
+                InvalidRegion +
+                "invalid format for coordinate interval: %s" %
+                str(item))
+
+        speclist[i] = newitem
+
+    slicelist = axesSpecs2slices(axes, speclist, force)
+    return slicelist
+
+
 def orderparse(order):
     """Parse an order string. Returns a list of axes specifiers.
 
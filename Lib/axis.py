@@ -132,6 +132,143 @@ tagToCalendar = {
     'climleap': cdtime.ClimLeapCalendar,
 }
 
+# Seconds per relative time unit, for the units converted by _reltimeFields.
+# Months and years depend on the calendar and are left to cdtime.
+_timeUnitSeconds = {
+    'second': 1., 'seconds': 1., 'sec': 1., 'secs': 1., 's': 1.,
+    'minute': 60., 'minutes': 60., 'min': 60., 'mins': 60.,
+    'hour': 3600., 'hours': 3600., 'hr': 3600., 'hrs': 3600., 'h': 3600.,
+    'day': 86400., 'days': 86400., 'd': 86400.,
+    'week': 604800., 'weeks': 604800.,
+}
+
+# Day of year at the start of each month, 365 day calendar
+_noLeapMonthStart = numpy.array(
+    [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334])
+
+# First day of the Gregorian part of the mixed calendar, 1582-10-15
+_mixedGregorianStart = -141427
+
+
+def _daysFromCivil(y, m, d):
+    """Days since 1970-1-1 of a proleptic Gregorian date (works on arrays)."""
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (m + numpy.where(m > 2, -3, 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civilFromDays(days):
+    """Proleptic Gregorian (year, month, day) arrays of days since 1970-1-1."""
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = numpy.where(mp < 10, mp + 3, mp - 9)
+    y = yoe + era * 400 + (m <= 2)
+    return y, m, d
+
+
+def _fieldsToDatetime64(year, month, day, hour, minute, second):
+    """datetime64[us] array of time fields, or None if one of the dates
+    does not exist in the proleptic Gregorian calendar (e.g. 360 day dates).
+    """
+    year, month, day = [numpy.asarray(f, dtype=numpy.int64)
+                        for f in (year, month, day)]
+    days = _daysFromCivil(year, month, day)
+    if not all(numpy.array_equal(a, b) for a, b in
+               zip(_civilFromDays(days), (year, month, day))):
+        return None
+    usec = numpy.round(numpy.asarray(second, dtype=numpy.float64) * 1.e6)
+    usec = usec.astype(numpy.int64) + 60000000 * (
+        60 * numpy.asarray(hour, dtype=numpy.int64) +
+        numpy.asarray(minute, dtype=numpy.int64))
+    return (days * 86400000000 + usec).astype('datetime64[us]')
+
+
+def _reltimeFields(values, units, calendar):
+    """Vectorized version of cdtime.reltime(value, units).tocomp(calendar).
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Relative time values.
+    units : str
+        Relative time units, "<unit> since <date>".
+    calendar : cdtime.Calendar
+        Calendar of the values.
+
+    Returns
+    -------
+    tuple
+        (year, month, day, hour, minute, second) lists, or None if the units
+        or calendar are not handled here and cdtime must be used instead.
+    """
+    words = units.split()
+    if len(words) < 3 or words[1].lower() != 'since':
+        return None
+    factor = _timeUnitSeconds.get(words[0].lower())
+    if factor is None:
+        return None
+    if calendar not in (cdtime.GregorianCalendar, cdtime.StandardCalendar,
+                        cdtime.MixedCalendar, cdtime.NoLeapCalendar,
+                        cdtime.Calendar360):
+        return None
+    values = numpy.asarray(values, dtype=numpy.float64)
+    if values.ndim != 1 or not numpy.isfinite(values).all():
+        return None
+
+    # Let cdtime parse the base date
+    base = cdtime.reltime(0, units).tocomp(calendar)
+    by, bm, bd = base.year, base.month, base.day
+    if calendar == cdtime.Calendar360:
+        basedays = by * 360 + (bm - 1) * 30 + bd - 1
+    elif calendar == cdtime.NoLeapCalendar:
+        basedays = by * 365 + int(_noLeapMonthStart[bm - 1]) + bd - 1
+    else:
+        basedays = int(_daysFromCivil(by, bm, bd))
+
+    # Split into whole days and seconds of day, rounded to the microsecond
+    seconds = values * factor + (base.hour * 3600. + base.minute * 60. + base.second)
+    seconds = numpy.round(seconds, 6)
+    days = numpy.floor(seconds / 86400.)
+    sod = numpy.round(seconds - days * 86400., 6)
+    # Rounding may carry a whole day over
+    carry = sod >= 86400.
+    days = days.astype(numpy.int64) + carry + basedays
+    sod = numpy.where(carry, sod - 86400., sod)
+
+    if calendar == cdtime.Calendar360:
+        year = days // 360
+        doy = days - year * 360
+        month = doy // 30 + 1
+        day = doy - (month - 1) * 30 + 1
+    elif calendar == cdtime.NoLeapCalendar:
+        year = days // 365
+        doy = days - year * 365
+        month = numpy.searchsorted(_noLeapMonthStart, doy, side='right')
+        day = doy - _noLeapMonthStart[month - 1] + 1
+    else:
+        if calendar == cdtime.MixedCalendar and len(days) > 0 and (
+                min(basedays, days.min()) < _mixedGregorianStart):
+            # Julian dates, leave them to cdtime
+            return None
+        year, month, day = _civilFromDays(days)
+    if len(year) > 0 and year.min() < 1:
+        return None
+
+    hour = (sod // 3600).astype(numpy.int64)
+    minute = ((sod - hour * 3600) // 60).astype(numpy.int64)
+    second = numpy.round(sod - hour * 3600 - minute * 60, 6)
+    return (year.tolist(), month.tolist(), day.tolist(),
+            hour.tolist(), minute.tolist(), second.tolist())
+
+
 # This is not an error message, it is used to detect which things have
 # been left as default indices or coordinates.
 unspecified = "No value specified."
@@ -410,23 +547,19 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
     half-open index interval [i,j), or None if the intersection is empty.
     """
 
-    indicator = indicator.lower()
-    length = len(axis)
+    return _mapLinearSorted(_linearSearch(axis, bounds), interval, indicator,
+                            epsilon)
 
-    # Make the interval and search array non-decreasing
-    x, y = interval
 
-    iind = indicator[2]
-
-    if x > y:
-        x, y = y, x
-        xind = indicator[1]
-        yind = indicator[0]
-
-    else:
-        xind = indicator[0]
-        yind = indicator[1]
+def _linearSearch(axis, bounds):
+    """Make the search array of mapLinearExt non-decreasing.
 
+    Returns
+    -------
+    (ar, bd, direc, epsilon) where ar and bd are the axis values and bounds
+    in increasing order, direc is 'inc' or 'dec' the direction of axis and
+    epsilon the default tolerance.
+    """
     if axis[0] > axis[-1]:
         ar = axis[::-1]
         if bounds[0, 0] < bounds[0, 1]:
@@ -442,12 +575,36 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
             bd = bounds[:, ::-1]
         direc = 'inc'
 
+    eps = 1.0e-5
+    if len(ar) > 1:
+        epsilon = eps * min(abs(ar[1] - ar[0]), abs(ar[-1] - ar[-2]))
+    else:
+        epsilon = eps
+    return ar, bd, direc, epsilon
+
+
+def _mapLinearSorted(search, interval, indicator='ccn', epsilon=None):
+    """mapLinearExt on a search array returned by _linearSearch."""
+    ar, bd, direc, defaultEpsilon = search
+    indicator = indicator.lower()
+    length = len(ar)
+
+    # Make the interval non-decreasing
+    x, y = interval
+
+    iind = indicator[2]
+
+    if x > y:
+        x, y = y, x
+        xind = indicator[1]
+        yind = indicator[0]
+
+    else:
+        xind = indicator[0]
+        yind = indicator[1]
+
     if(epsilon is None):
-        eps = 1.0e-5
-        if len(ar) > 1:
-            epsilon = eps * min(abs(ar[1] - ar[0]), abs(ar[-1] - ar[-2]))
-        else:
-            epsilon = eps
+        epsilon = defaultEpsilon
 
     #
     #  interval bound +/- epsilon
@@ -546,6 +703,13 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
 
     else:
 
+        # Nodes and bounds around the endpoints as Python floats, indexing
+        # numpy scalars in the loops below is comparatively slow
+        nodesI = ar[iStart:iEnd + 1].tolist()
+        boundsI = bd[iStart:iEnd + 1].tolist()
+        nodesJ = ar[jStart:jEnd + 1].tolist()
+        boundsJ = bd[jStart:jEnd + 1].tolist()
+
         # llllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllll
         #
         #  left interval check
@@ -556,9 +720,8 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
 
         for i in range(iStart, iEnd + 1):
 
-            nodeSubI = ar[i]
-            boundLeft = bd[i][0]
-            boundRight = bd[i][1]
+            nodeSubI = nodesI[i - iStart]
+            boundLeft, boundRight = boundsI[i - iStart]
 
             test = mapLinearIntersection(
                 xind,
@@ -580,9 +743,8 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
 
         for i in range(iStart, iEnd + 1):
 
-            nodeSubI = ar[i]
-            boundLeft = bd[i][0]
-            boundRight = bd[i][1]
+            nodeSubI = nodesI[i - iStart]
+            boundLeft, boundRight = boundsI[i - iStart]
 
             testB = mapLinearIntersection(
                 xind,
@@ -608,9 +770,8 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
 
         for j in range(jStart, jEnd + 1):
 
-            nodeSubI = ar[j]
-            boundLeft = bd[j][0]
-            boundRight = bd[j][1]
+            nodeSubI = nodesJ[j - jStart]
+            boundLeft, boundRight = boundsJ[j - jStart]
 
             #
             #  user test
@@ -642,9 +803,8 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
 
         for j in range(jStart, jEnd + 1):
 
-            nodeSubI = ar[j]
-            boundLeft = bd[j][0]
-            boundRight = bd[j][1]
+            nodeSubI = nodesJ[j - jStart]
+            boundLeft, boundRight = boundsJ[j - jStart]
 
             testB = mapLinearIntersection(
                 xind,
@@ -744,6 +904,45 @@ def mapLinearExt(axis, bounds, interval, indicator='ccn',
     return (iReturn, jReturn)
 
 
+class _AxisSearch(object):
+    """Coordinate search structure of an axis, see AbstractAxis._getSearch.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Cached data of the axis the structure was built from.
+    values : numpy.ndarray
+        Axis values.
+    bounds : numpy.ndarray
+        Axis bounds, (n,2).
+    """
+
+    def __init__(self, data, values, bounds):
+        self.data = data
+        self.length = len(values)
+        self.values = values
+        self.linear = _linearSearch(values, bounds)
+        self.valid = True
+        # Search arrays of the values extended by cycles, for wraparound
+        self._extended = {}
+
+    def extend(self, nCycle, cycle):
+        """Search array of the values repeated nCycle times (at least twice),
+        shifted by cycle each time."""
+        key = (nCycle, cycle)
+        if key not in self._extended:
+            ar = self.values
+            ncopies = max(int(numpy.ceil(nCycle)), 2)
+            bigar = numpy.concatenate(
+                [ar + k * cycle if k else ar for k in range(ncopies)])
+            bigarAxis = createAxis(bigar)
+            bd = bigarAxis.getBounds()
+            if bd is None:              # In case autobounds is off
+                bd = bigarAxis.genGenericBounds()
+            self._extended[key] = _linearSearch(bigar, bd)
+        return self._extended[key]
+
+
 def lookupArray(ar, value):
     """Lookup value in array ar.
 
@@ -910,8 +1109,6 @@ class AbstractAxis(CdmsObj):
         self.id = id
         # Cached data values
         self._data_ = None
-        # Cached wraparound values for circular axes
-        self._doubledata_ = None
 
     def __str__(self):
         return "\n".join(self.listall()) + "\n"
@@ -1223,11 +1420,72 @@ class AbstractAxis(CdmsObj):
         if self.isForecast():
             result = [forecast.comptime(t) for t in self[:]]
         else:
-            result = []
-            for val in self[:]:
-                result.append(cdtime.reltime(val, self.units).tocomp(calendar))
+            result = list(self._convertTime('comptime', calendar))
         return result
 
+    def _convertTime(self, kind, calendar):
+        """Convert the axis values to a list of time objects, with caching.
+
+        Parameters
+        ----------
+        kind : str
+            'comptime', 'dtg', 'datetime' or 'datetime64'.
+        calendar : cdtime.Calendar
+            Calendar used to convert relative time to component time.
+
+        Returns
+        -------
+        list
+            Converted values. The list is shared with the cache and must not
+            be modified by the caller.
+
+        Notes
+        -----
+        The conversion is vectorized with numpy for the common units and
+        calendars (see _reltimeFields) and falls back to cdtime otherwise.
+        Results are kept on the axis until its values, units or the
+        calendar change.
+        """
+        values = numpy.ma.filled(self[:])
+        key = (self.units, calendar)
+        cache = self.__dict__.get('_timecache_')
+        if cache is None or cache[0] != key or cache[1].shape != values.shape or \
+                not numpy.array_equal(cache[1], values):
+            cache = (key, numpy.array(values), {})
+            self.__dict__['_timecache_'] = cache
+        results = cache[2]
+        if kind in results:
+            return results[kind]
+
+        if 'fields' not in results:
+            fields = None
+            if values.dtype.kind in 'iuf':
+                fields = _reltimeFields(values, self.units, calendar)
+            if fields is None:
+                comptimes = [cdtime.reltime(val, self.units).tocomp(calendar) for val in values]
+                results['comptime'] = comptimes
+                fields = ([c.year for c in comptimes], [c.month for c in comptimes],
+                          [c.day for c in comptimes], [c.hour for c in comptimes],
+                          [c.minute for c in comptimes], [c.second for c in comptimes])
+            results['fields'] = fields
+        fields = results['fields']
+
+        if kind == 'comptime':
+            if 'comptime' not in results:
+                results['comptime'] = [cdtime.comptime(*c) for c in zip(*fields)]
+        elif kind == 'dtg':
+            results['dtg'] = ["%04d%02d%02d%02d" % c[:4] for c in zip(*fields)]
+        elif kind == 'datetime64':
+            results['datetime64'] = _fieldsToDatetime64(*fields)
+        elif kind == 'datetime':
+            import datetime
+            results['datetime'] = [
+                datetime.datetime(y, mo, d, h, mi, int(sec), int((sec - int(sec)) * 1000))
+                for y, mo, d, h, mi, sec in zip(*fields)]
+        else:
+            raise CDMSError("Unknown time conversion: %s" % kind)
+        return results[kind]
+
     #
     #  mf 20010418 -- output DTGs (YYYYMMDDHH)
     #
@@ -1243,25 +1501,9 @@ class AbstractAxis(CdmsObj):
         """
         if not hasattr(self, 'units'):
             raise CDMSError("No time units defined")
-        result = []
         if calendar is None:
             calendar = self.getCalendar()
-        for val in self[:]:
-            comptime = cdtime.reltime(val, self.units).tocomp(calendar)
-            s = repr(comptime)
-            tt = str.split(s, ' ')
-
-            ttt = str.split(tt[0], '-')
-            yr = int(ttt[0])
-            mo = int(ttt[1])
-            da = int(ttt[2])
-
-            ttt = str.split(tt[1], ':')
-            hr = int(ttt[0])
-            dtg = "%04d%02d%02d%02d" % (yr, mo, da, hr)
-            result.append(dtg)
-
-        return result
+        return list(self._convertTime('dtg', calendar))
 
     def asdatetime(self, calendar=None):
         """ Returns values as ``datetime.datetime`` if axis represents time.
@@ -1273,19 +1515,35 @@ class AbstractAxis(CdmsObj):
             then the calendar set in attributes will be used. If this is not set
             then the default calendar will be used.
         """
-        import datetime
         if not hasattr(self, 'units'):
             raise CDMSError("No time units defined")
-        result = []
         if calendar is None:
             calendar = self.getCalendar()
-        for val in self[:]:
-            c = cdtime.reltime(val, self.units).tocomp(calendar)
-            dtg = datetime.datetime(
-                c.year, c.month, c.day, c.hour, c.minute, int(c.second),
-                int((c.second - int(c.second)) * 1000))
-            result.append(dtg)
-        return result
+        return list(self._convertTime('datetime', calendar))
+
+    def asdatetime64(self, calendar=None):
+        """ Returns values as a ``numpy.datetime64[us]`` array if axis represents time.
+
+        Parameters
+        ----------
+        calendar : cdtime.Calendar
+            Calendar used to convert relative time to component time. If ``None``
+            then the calendar set in attributes will be used. If this is not set
+            then the default calendar will be used.
+
+        Notes
+        -----
+        Raises CDMSError if a date does not exist in the proleptic Gregorian
+        calendar, e.g. February 30 of a 360 day calendar.
+        """
+        if not hasattr(self, 'units'):
+            raise CDMSError("No time units defined")
+        if calendar is None:
+            calendar = self.getCalendar()
+        result = self._convertTime('datetime64', calendar)
+        if result is None:
+            raise CDMSError("Time values cannot be represented as datetime64")
+        return result.copy()
 
     def asRelativeTime(self, units=None):
         """ Returns values as relative time if axis represents time.
@@ -1624,6 +1882,7 @@ class AbstractAxis(CdmsObj):
         data : numpy.ndarray
             Data representing the axis.
         """
+        self._invalidateSearch()
         self.__setitem__(slice(None), data)
 
     def _time2value(self, value):
@@ -1691,6 +1950,44 @@ class AbstractAxis(CdmsObj):
 
         return(self.getModuloCycle())
 
+    def _getSearch(self):
+        """Get the coordinate search structure used by mapIntervalExt.
+
+        The structure is built on first use and kept until the values or
+        bounds of the axis are set.
+
+        Returns
+        -------
+        _AxisSearch
+        """
+        if self._data_ is None:
+            self._data_ = self.getData()
+        search = self.__dict__.get('_search_')
+        if search is None or not search.valid or \
+                search.data is not self._data_ or search.length != len(self):
+            bounds = self.getBounds()
+            if bounds is None:              # In case autobounds is off
+                bounds = self.genGenericBounds()
+            search = _AxisSearch(self._data_, self[:], bounds)
+            self.__dict__['_search_'] = search
+        return search
+
+    def _invalidateSearch(self):
+        """Drop the coordinate search structure, also for the shallow copies
+        of the axis sharing it, and bump the version of the axis.
+        """
+        search = self.__dict__.pop('_search_', None)
+        if search is not None:
+            search.valid = False
+        self.__dict__['_version_'] = self.__dict__.get('_version_', 0) + 1
+
+    def _getVersion(self):
+        """Get a counter incremented whenever the values or bounds of the
+        axis are set. Used to check that results derived from the
+        coordinates, such as compiled selections, are still valid.
+        """
+        return self.__dict__.get('_version_', 0)
+
     # TODO this is a bad signature, too confusing not explicit enough
     # mapInterval(self, x, y, left_endpoint, right_endpoint, cycle):
     def mapInterval(self, interval, indicator='ccn', cycle=None):
@@ -1810,8 +2107,8 @@ class AbstractAxis(CdmsObj):
                 "EEE: 3-character interval/intersection indicator incomplete or incorrect = " +
                 indicator)
 
-        if self._data_ is None:
-            self._data_ = self.getData()
+        search = self._getSearch()
+        ar = search.values
 
         # ttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttttt
         # Handle time types
@@ -1822,7 +2119,7 @@ class AbstractAxis(CdmsObj):
 
         # If the interval is reversed wrt self, reverse the interval and
         # set the stride to -1
-        if (interval[0] <= interval[1]) == (self[0] <= self[-1]):
+        if (interval[0] <= interval[1]) == (ar[0] <= ar[-1]):
             stride = 1
         else:
             stride = -1
@@ -1837,8 +2134,7 @@ class AbstractAxis(CdmsObj):
 
         xi, yi = interval
 
-        length = len(self)
-        ar = self[:]
+        length = len(ar)
         ar0 = ar[0]
         arn = ar[-1]
         armin = min(ar0, arn)
@@ -1859,8 +2155,6 @@ class AbstractAxis(CdmsObj):
             intervalLength = yi - xi
             intervalCycles = intervalLength / cycle
 
-            bd = self.getBounds()
-
             nPointsCycle = len(ar)
 
             ar0 = ar[0]
@@ -1903,26 +2197,10 @@ class AbstractAxis(CdmsObj):
             if(nCycle >= nCycleMax):
                 raise CDMSError(InvalidNCycles + repr(nCycle))
 
-            self._doubledata_ = numpy.concatenate((ar, ar + cycle))
-            k = 2
-            while(k < nCycle):
-                self._doubledata_ = numpy.concatenate(
-                    (self._doubledata_, ar + k * cycle))
-                k = k + 1
-
             # Map the canonical coordinate interval (xp,yp) in the 'extended' data array
-            # create axis to get the bounds array
 
-            bigar = self._doubledata_
-            bigarAxis = createAxis(bigar)
-            bd = bigarAxis.getBounds()
-            if bd is None:              # In case autobounds is off
-                bd = bigarAxis.genGenericBounds()
-
-            # run the more general mapLinearExt to get the indices
-
-            indexInterval = mapLinearExt(
-                bigar, bd, (xp, yp), indicator, wrapped=1)
+            indexInterval = _mapLinearSorted(
+                search.extend(nCycle, cycle), (xp, yp), indicator)
 
             #
             # check to make sure we got an interval
@@ -1949,10 +2227,7 @@ class AbstractAxis(CdmsObj):
             retval = (i, j)
 
         else:
-            bd = self.getBounds()
-            if bd is None:              # In case autobounds is off
-                bd = self.genGenericBounds()
-            retval = mapLinearExt(ar, bd, interval, indicator)
+            retval = _mapLinearSorted(search.linear, interval, indicator)
 
         if retval is not None:
             i, j = retval
@@ -2586,7 +2861,6 @@ class TransientAxis(AbstractAxis):
         else:
             self._data_ = numpy.array(data)
 
-        self._doubledata_ = None
         self._genericBounds_ = genericBounds
         self.setBounds(bounds, isGeneric=genericBounds)
 
@@ -2597,14 +2871,56 @@ class TransientAxis(AbstractAxis):
         return self._data_[low:high]
 
     def __setitem__(self, index, value):
+        self._invalidateSearch()
         self._data_[index] = numpy.ma.filled(value)
 
     def __setslice__(self, low, high, value):
+        self._invalidateSearch()
         self._data_[low:high] = numpy.ma.filled(value)
 
     def __len__(self):
         return len(self._data_)
 
+    def sharesValues(self, other):
+        """Test whether the values of other are the same array as the values
+        of self, e.g. for the axis copies made by TransientVariable.
+
+        Parameters
+        ----------
+        other : TransientAxis
+
+        Returns
+        -------
+        bool
+            True if both axes view the same memory with the same layout,
+            so their values are equal without being compared.
+        """
+        if self is other:
+            return True
+        if not isinstance(other, TransientAxis):
+            return False
+        a, b = self._data_, other._data_
+        return (a is b) or (
+            a is not None and b is not None and
+            a.__array_interface__ == b.__array_interface__)
+
+    def shallowCopy(self):
+        """Copy of the axis sharing the values and bounds arrays.
+
+        Attributes are copied, so the copy can be modified independently
+        unless the values or bounds are changed in place.
+
+        Returns
+        -------
+        cdms2.TransientAxis
+        """
+        mycopy = self.__class__.__new__(self.__class__)
+        for k, v in self.__dict__.items():
+            if isinstance(v, (list, dict)):
+                v = copy.copy(v)
+            mycopy.__dict__[k] = v
+        return mycopy
+
     @base_doc(AbstractAxis)
     def getBounds(self, isGeneric=None):
         """getBounds.
@@ -2671,6 +2987,7 @@ class TransientAxis(AbstractAxis):
         isGeneric : bool
             True if bounds are generic.
         """
+        self._invalidateSearch()
         if bounds is not None:
             if isinstance(bounds, numpy.ma.MaskedArray):
                 bounds = numpy.ma.filled(bounds)
@@ -2971,6 +3288,7 @@ class FileAxis(AbstractAxis):
             raise CDMSError(ReadOnlyAxis + self.id)
         if self.parent is None:
             raise CDMSError(FileWasClosed + self.id)
+        self._invalidateSearch()
         # need setslice to create a new shape using [newaxis]
         if(isinstance(index, slice)):
             if(index.start is not None):
@@ -2993,6 +3311,7 @@ class FileAxis(AbstractAxis):
             raise CDMSError(ReadOnlyAxis + self.id)
         if self.parent is None:
             raise CDMSError(FileWasClosed + self.id)
+        self._invalidateSearch()
         return self._obj_.setslice(*(low, high, numpy.ma.filled(value)))
 
     def __len__(self):
@@ -3062,6 +3381,7 @@ class FileAxis(AbstractAxis):
     @base_doc(AbstractAxis)
     def setBounds(self, bounds, persistent=0, validate=0,
                   index=None, boundsid=None, isGeneric=False):
+        self._invalidateSearch()
         if persistent:
             if index is None:
                 if validate:
@@ -4,8 +4,15 @@
 """Bin index for non-rectilinear grids"""
 
 from . import _bindex
+import hashlib
+import threading
+from collections import OrderedDict
 import numpy
 
+_binIndexCacheSize = 8
+_binIndexCache = OrderedDict()
+_binIndexCacheLock = threading.RLock()
+
 
 def bindexHorizontalGrid(latlin, lonlin):
     """Create a bin index for a horizontal grid.
@@ -89,3 +96,217 @@ def intersectHorizontalGrid(latspecs, lonspecs, latlin, lonlin, index):
         lonopt)
 
     return points[:npoints]
+
+
+def _inRange(values, start, end, options):
+    """Test start <= values <= end, with open or closed ends as in 'co'"""
+    if options[0] == 'c':
+        result = (values >= start)
+    else:
+        result = (values > start)
+    if options[1] == 'c':
+        result &= (values <= end)
+    else:
+        result &= (values < end)
+    return result
+
+
+def _concatenateRanges(starts, ends):
+    """Return the concatenation of arange(s, e) for s, e in starts, ends"""
+    lengths = ends - starts
+    total = lengths.sum()
+    if total == 0:
+        return numpy.zeros(0, dtype=numpy.intp)
+    shifts = numpy.repeat(starts - (numpy.cumsum(lengths) - lengths), lengths)
+    return numpy.arange(total, dtype=numpy.intp) + shifts
+
+
+class BinIndex(object):
+    """Bin index of the points of a non-rectilinear horizontal grid.
+
+    The points are sorted into nbini x nbinj longitude-latitude bins
+    covering the bounding box of the grid, the bin size is chosen so
+    that a bin holds about one point. Unlike bindexHorizontalGrid, the
+    index does not depend on the module state of _bindex, so it can be
+    shared between grids and saved to disk.
+
+    Parameters
+    ----------
+    latlin : latitude values, raveled if not 1-D.
+    lonlin : longitude values, raveled if not 1-D.
+    nbini : Optional number of longitude bins.
+    nbinj : Optional number of latitude bins.
+    """
+
+    def __init__(self, latlin, lonlin, nbini=None, nbinj=None):
+        lats = numpy.ravel(numpy.ma.filled(latlin)).astype(numpy.float64)
+        lons = numpy.mod(numpy.ravel(numpy.ma.filled(lonlin)), 360.0)
+        lons = lons.astype(numpy.float64)
+        # numpy.mod rounds tiny negative longitudes to 360.0
+        lons[lons >= 360.0] -= 360.0
+
+        # Missing coordinates do not set the extent of the bins
+        finite = numpy.isfinite(lats) & numpy.isfinite(lons)
+        inside = finite & (numpy.absolute(lats) <= 90.0)
+        npoints = max(numpy.count_nonzero(inside), 1)
+        if numpy.any(inside):
+            lat0, lat1 = lats[inside].min(), lats[inside].max()
+            lon0, lon1 = lons[inside].min(), lons[inside].max()
+        else:
+            lat0, lat1, lon0, lon1 = -90.0, 90.0, 0.0, 360.0
+        if nbini is None or nbinj is None:
+            ratio = (lon1 - lon0 + 1.e-6) / (lat1 - lat0 + 1.e-6)
+            nbini = int(min(npoints, max(1, round((npoints * ratio) ** 0.5))))
+            nbinj = max(1, npoints // nbini)
+
+        self.latitudes = lats
+        self.longitudes = lons
+        self.shape = (nbini, nbinj)
+        self.origin = (lon0, lat0)
+        self.deltas = ((lon1 - lon0) / nbini or 1.0,
+                       (lat1 - lat0) / nbinj or 1.0)
+
+        points = numpy.nonzero(finite)[0]
+        bins = (self._bins(lons[points], 0) * nbinj +
+                self._bins(lats[points], 1))
+        order = numpy.argsort(bins, kind='mergesort')
+        self.points = points[order]
+        self.offsets = numpy.zeros(nbini * nbinj + 1, dtype=numpy.intp)
+        numpy.cumsum(numpy.bincount(bins, minlength=nbini * nbinj),
+                     out=self.offsets[1:])
+
+    def _bins(self, values, axis):
+        """Bin numbers of values along axis 0 (longitude) or 1 (latitude)"""
+        bins = numpy.floor((values - self.origin[axis]) / self.deltas[axis])
+        return numpy.clip(bins, 0, self.shape[axis] - 1).astype(numpy.intp)
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    def __repr__(self):
+        return "<BinIndex, %d points, %d x %d bins>" % ((len(self),) +
+                                                        self.shape)
+
+    def save(self, path):
+        """Save the index to a .npz file.
+
+        Parameters
+        ----------
+        path : file name or open binary file.
+        """
+        numpy.savez(path, latitudes=self.latitudes,
+                    longitudes=self.longitudes, points=self.points,
+                    offsets=self.offsets, shape=numpy.array(self.shape),
+                    origin=numpy.array(self.origin),
+                    deltas=numpy.array(self.deltas))
+
+    @classmethod
+    def load(cls, path):
+        """Load an index saved with BinIndex.save.
+
+        Parameters
+        ----------
+        path : file name or open binary file.
+
+        Returns
+        -------
+        BinIndex
+        """
+        index = cls.__new__(cls)
+        with numpy.load(path) as f:
+            index.latitudes = f['latitudes']
+            index.longitudes = f['longitudes']
+            index.points = f['points']
+            index.offsets = f['offsets']
+            index.shape = tuple(int(n) for n in f['shape'])
+            index.origin = tuple(float(x) for x in f['origin'])
+            index.deltas = tuple(float(x) for x in f['deltas'])
+        return index
+
+    def _intersect1(self, slat, slon, elat, elon, latopt, lonopt):
+        """Points in a region not crossing the 0/360 longitude"""
+        if slon == elon and 'o' in lonopt:
+            return numpy.zeros(0, dtype=numpy.intp)
+        nbinj = self.shape[1]
+        si, ei = self._bins(numpy.array([slon, elon]), 0)
+        sj, ej = self._bins(numpy.array([slat, elat]), 1)
+        columns = numpy.arange(si, ei + 1) * nbinj
+        candidates = self.points[_concatenateRanges(
+            self.offsets[columns + sj], self.offsets[columns + ej + 1])]
+        keep = _inRange(self.latitudes[candidates], slat, elat, latopt)
+        keep &= _inRange(self.longitudes[candidates], slon, elon, lonopt)
+        return candidates[keep]
+
+    def intersect(self, latspecs, lonspecs):
+        """Intersect the indexed points with a lat-lon region.
+
+        Parameters
+        ----------
+        latspecs : latitude specs as defined in the grid module, or None.
+        lonspecs : longitude specs as defined in the grid module, or None.
+
+        Returns
+        -------
+        sorted array of the indices of the points in the intersection.
+        """
+        if latspecs is None:
+            slat, elat, latopt = -90.0, 90.0, 'cc'
+        else:
+            slat, elat, latopt = latspecs[:3]
+        if slat > elat:
+            slat, elat = elat, slat
+
+        if lonspecs is None or abs(lonspecs[1] - lonspecs[0]) >= 360.0:
+            slon, elon, lonopt = 0.0, 360.0, 'co'
+        else:
+            slon, elon, lonopt = lonspecs[:3]
+        if slon > elon:
+            slon, elon = elon, slon
+
+        schunk = numpy.floor(slon / 360.0)
+        echunk = numpy.floor(elon / 360.0)
+        slon -= 360.0 * schunk
+        elon -= 360.0 * echunk
+        if schunk == echunk:
+            points = self._intersect1(slat, slon, elat, elon, latopt, lonopt)
+        else:
+            points = numpy.concatenate((
+                self._intersect1(slat, slon, elat, 360.0,
+                                 latopt, lonopt[0] + 'o'),
+                self._intersect1(slat, 0.0, elat, elon,
+                                 latopt, 'c' + lonopt[1])))
+        return numpy.sort(points)
+
+
+def getBinIndex(latlin, lonlin):
+    """Return the bin index of a horizontal grid.
+
+    Indexes are shared between grids with the same coordinates, the most
+    recently used ones are kept in memory.
+
+    Parameters
+    ----------
+    latlin : latitude values.
+    lonlin : longitude values.
+
+    Returns
+    -------
+    BinIndex
+    """
+    latlin = numpy.ascontiguousarray(numpy.ma.filled(latlin))
+    lonlin = numpy.ascontiguousarray(numpy.ma.filled(lonlin))
+    h = hashlib.sha1()
+    for ar in latlin, lonlin:
+        h.update(str((ar.dtype.str, ar.shape)).encode())
+        h.update(ar.tobytes())
+    key = h.hexdigest()
+    with _binIndexCacheLock:
+        if key in _binIndexCache:
+            _binIndexCache.move_to_end(key)
+            return _binIndexCache[key]
+    index = BinIndex(latlin, lonlin)
+    with _binIndexCacheLock:
+        _binIndexCache[key] = index
+        while len(_binIndexCache) > _binIndexCacheSize:
+            _binIndexCache.popitem(last=False)
+    return index
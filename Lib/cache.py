@@ -1,15 +1,27 @@
 """
 CDMS cache management and file movement objects
+
+Remote files are copied into a cache directory shared by all processes of a
+user. The cache index is a small JSON file which is replaced atomically, so
+lookups do not need a lock. Updates of the index are serialized with an
+fcntl lock, and a transfer holds an fcntl lock on a file named after the
+cache key, so that other processes asking for the same file block on that
+lock until the transfer is done instead of polling the index. Locks are
+released by the kernel when a process dies, which leaves no stale locks.
+
+The total size of the cached files is bounded, see setFileCacheSize. When
+the bound is exceeded the least recently used files are removed.
 """
-import cdurllib
 import urllib.parse
 import tempfile
 import os
-import time
-import cdmsobj
-import sys
+import json
 import errno
-import shelve
+import fcntl
+import shutil
+import hashlib
+from . import cdurllib
+from . import cdmsobj
 from .error import CDMSError
 MethodNotImplemented = "Method not yet implemented"
 SchemeNotSupported = "Scheme not supported: "
@@ -18,9 +30,98 @@ TimeOutError = "Wait for read completion timed out:"
 GlobusNotSupported = "Globus interface not supported"
 RequestManagerNotSupported = "Request manager interface not supported (module reqm not found)"
 
-_lock_max_tries = 10                    # Number of tries for a lock
-_lock_naptime = 1                       # Seconds between lock tries
-_cache_tempdir = None                   # Default temporary directory
+_cache_tempdir = None                   # Default cache directory
+_cache_maxsize = 4 * 1024 ** 3          # Default bound of the cache size, in bytes
+_locks = {}                             # Open lock files, by lock name
+
+
+def setFileCacheDirectory(path):
+    """Set the directory where remote files are cached.
+
+       Parameters
+       ----------
+       path : directory name, or None to use <tempdir>/cdms.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _cache_tempdir
+    if path is not None:
+        path = os.path.abspath(os.path.expanduser(path))
+    _cache_tempdir = path
+
+
+def getFileCacheDirectory():
+    """Get the directory where remote files are cached.
+
+       Returns
+       -------
+       Directory name, created if necessary.
+    """
+    return os.path.dirname(lockpath(".index.lock"))
+
+
+def setFileCacheSize(value):
+    """Set the maximum total size of the cached files.
+
+       When a file is added and the total size exceeds this value, the least
+       recently used files are removed from the cache.
+
+       Parameters
+       ----------
+       value : size in bytes, an integer >= 0, or None for no bound.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _cache_maxsize
+    if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+        raise CDMSError("Error file cache size must be None or an integer >= 0")
+    _cache_maxsize = value
+
+
+def getFileCacheSize():
+    """Get the maximum total size of the cached files.
+
+       Returns
+       -------
+       Size in bytes, or None if the cache is not bounded.
+    """
+    return _cache_maxsize
+
+
+def _flock(path, exclusive=True):
+    """
+    Open <path> and lock it with fcntl.flock. Return the file descriptor.
+
+    If the lock file is removed by its holder while waiting for the lock, a
+    new file is created and locked instead, so a lock file may be removed by
+    the process holding the lock.
+    """
+    while True:
+        fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except OSError as err:
+            if err.errno != errno.ENOENT:
+                os.close(fd)
+                raise
+        os.close(fd)
+
+
+def _funlock(fd, path=None):
+    """
+    Release a lock acquired with _flock. If <path> is given, remove the lock file.
+    """
+    try:
+        if path is not None:
+            os.unlink(path)
+    finally:
+        os.close(fd)
 
 
 def lock(filename):
@@ -37,61 +138,29 @@ def lock(filename):
     -----
     This function is UNIX-specific.
 
-    It is important to delete the lock via unlock() if the process is
-    interrupted, otherwise subsequent locks will fail.
+    The lock is an fcntl lock, which the system releases if the process
+    exits without calling unlock().
     """
 
     path = lockpath(filename)
-
-    # Try to acquire a file-based lock
-    success = 0
-    tries = 0
-    while (not success) and (tries < _lock_max_tries):
-        try:
-            if cdmsobj._debug:
-                print(
-                    'Process %d: Trying to acquire lock %s' %
-                    (os.getpid(), path))
-            fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_EXCL, 0o666)
-
-        # If the open failed because the file already exists, keep trying, otherwise
-        # reraise the error
-        except OSError:
-            if sys.exc_value.errno != errno.EEXIST:
-                raise
-            tries = tries + 1
-        else:
-            if cdmsobj._debug:
-                print(
-                    'Process %d: Acquired lock %s after %d tries' %
-                    (os.getpid(), path, tries))
-            success = 1
-            break
-
-        # Sleep until next retry
-        if cdmsobj._debug:
-            print(
-                'Process %d: Failed to acquire lock %s, sleeping' %
-                (os.getpid(), path))
-        time.sleep(_lock_naptime)
-
-    # Error if the lock could not be acquired
-    if not success:
-        raise CDMSError(LockError + 'Could not acquire a lock on %s' % path)
-
-    # The lock succeeded, so just close the file - we don't need to write
-    # anything here
-    else:
-        os.close(fd)
+    if cdmsobj._debug:
+        print('Process %d: Trying to acquire lock %s' % (os.getpid(), path))
+    try:
+        fd = _flock(path)
+    except OSError as err:
+        raise CDMSError(LockError + 'Could not acquire a lock on %s: %s' % (path, err))
+    _locks[filename] = fd
+    if cdmsobj._debug:
+        print('Process %d: Acquired lock %s' % (os.getpid(), path))
 
 
 def unlock(filename):
     """
-    Delete a file-based lock with the given name.
+    Release a file-based lock with the given name.
 
     Usage : unlock(filename)
 
-    If the function returns, the lock was successfully deleted.
+    If the function returns, the lock was successfully released.
 
 
     Notes
@@ -102,7 +171,11 @@ def unlock(filename):
     path = lockpath(filename)
     if cdmsobj._debug:
         print('Process %d: Unlocking %s' % (os.getpid(), path))
-    os.unlink(path)
+    try:
+        fd = _locks.pop(filename)
+    except KeyError:
+        raise CDMSError(LockError + 'Lock %s is not held' % path)
+    _funlock(fd)
 
 
 def lockpath(filename):
@@ -115,14 +188,17 @@ def lockpath(filename):
     global _cache_tempdir
 
     if not _cache_tempdir:
-        tempfile.mktemp()
-        _cache_tempdir = os.path.join(tempfile.tempdir, 'cdms')
-        if not os.path.isdir(_cache_tempdir):
-            if cdmsobj._debug:
-                print(
-                    'Process %d: Creating cache directory %s' %
-                    (os.getpid(), _cache_tempdir))
-            os.mkdir(_cache_tempdir, 0o777)
+        _cache_tempdir = os.path.join(tempfile.gettempdir(), 'cdms')
+    if not os.path.isdir(_cache_tempdir):
+        if cdmsobj._debug:
+            print(
+                'Process %d: Creating cache directory %s' %
+                (os.getpid(), _cache_tempdir))
+        try:
+            os.makedirs(_cache_tempdir, 0o777)
+        except OSError:
+            if not os.path.isdir(_cache_tempdir):
+                raise
     return os.path.join(_cache_tempdir, filename)
 
 
@@ -183,6 +259,8 @@ def copyFile(fromURL, toURL, callback=None,
     """
     Copy file <fromURL> to local file <toURL>.
 
+        file: URLs are copied directly.
+
         For FTP transfers, if cache._useWindow is true, display a progress dialog,
         otherwise just print progress messages.
 
@@ -195,6 +273,12 @@ def copyFile(fromURL, toURL, callback=None,
     <useReplica> : is true if the request manager should search the replica catalog for the
                    actual file to transfer.
     """
+    (scheme, netloc, path, parameters, query,
+     fragment) = urllib.parse.urlparse(fromURL)
+    if scheme == 'file':
+        # Local source, e.g. a directory standing in for a remote server
+        shutil.copyfile(urllib.parse.unquote(path), toURL)
+        return
     if callback is None:
         if _useWindow:
             from . import gui
@@ -203,8 +287,6 @@ def copyFile(fromURL, toURL, callback=None,
             callback = gui.updateProgressGui
         else:
             callback = cdurllib.sampleReportHook
-    (scheme, netloc, path, parameters, query,
-     fragment) = urllib.parse.urlparse(fromURL)
     if scheme == 'ftp':
         if _transferMethod == _pythonTransfer:
             urlopener = cdurllib.CDURLopener()
@@ -270,33 +352,123 @@ def copyFile(fromURL, toURL, callback=None,
 # A simple data cache
 
 
+def _remove(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 class Cache:
+    """
+    Cache of remote files.
+
+    The index maps each cache key to the path and the size of a cached file.
+    The time a file was last used is kept as the modification time of the
+    file, so that a lookup does not need to rewrite the index.
+
+    Parameters
+    ----------
+    directory : cache directory, defaults to getFileCacheDirectory().
+
+    maxsize : maximum total size of the cached files in bytes, defaults to
+              getFileCacheSize().
+    """
 
     indexpath = None                    # Path of data cache index
 
-    def __init__(self):
-        if self.indexpath is None:
-            self.indexpath = lockpath(".index")
-            # This is a kluge to handle the very real possibility that
-            # a lock was left over from an aborted process. Unfortunately,
-            # this might also screw up a transfer in progress ...
+    def __init__(self, directory=None, maxsize=None):
+        if directory is None:
+            directory = getFileCacheDirectory()
+        elif not os.path.isdir(directory):
+            os.makedirs(directory, 0o777)
+        self.direc = os.path.abspath(directory)  # Cache directory
+        self.maxsize = maxsize
+        self.indexpath = os.path.join(self.direc, ".index.json")
+        self._lockpath = os.path.join(self.direc, ".index.lock")
+        self._index = None              # (stamp of the index file, entries)
+        # Remove entries of files which were deleted behind our back
+        self.clean()
+
+    def _readIndex(self):
+        """
+        Return the entries of the index. The result must not be modified.
+        """
+        try:
+            f = open(self.indexpath)
+        except (IOError, OSError):
+            return {}
+        with f:
+            st = os.fstat(f.fileno())
+            stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            if self._index is not None and self._index[0] == stamp:
+                return self._index[1]
             try:
-                unlock("index_lock")
-            except BaseException:
-                pass
-            lock("index_lock")
-            self.index = shelve.open(self.indexpath)  # Persistent cache index
+                entries = json.load(f)
+            except ValueError:
+                entries = {}
+        self._index = (stamp, entries)
+        return entries
+
+    def _writeIndex(self, entries):
+        """
+        Replace the index. The index lock must be held.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.direc, prefix=".index")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f, separators=(',', ':'))
+            # Make index file world writeable
+            os.chmod(tmp, 0o666)
+            os.replace(tmp, self.indexpath)
+        except BaseException:
+            _remove(tmp)
+            raise
+
+    def _lockIndex(self):
+        """
+        Lock the index. Return the lock and a copy of the entries.
+        """
+        fd = _flock(self._lockpath)
+        try:
+            entries = dict(self._readIndex())
+        except BaseException:
+            _funlock(fd)
+            raise
+        return fd, entries
+
+    def _keyLockPath(self, filekey):
+        return os.path.join(self.direc, ".%s.lock" % hashlib.sha1(filekey.encode('utf-8')).hexdigest())
+
+    def _trim(self, entries, keep):
+        """
+        Remove the least recently used files until the total size is within bounds.
+        """
+        maxsize = self.maxsize if self.maxsize is not None else _cache_maxsize
+        if maxsize is None:
+            return
+        total = sum(entry[1] for entry in entries.values())
+        if total <= maxsize:
+            return
+        used = []
+        for key, (path, size) in entries.items():
+            if key == keep:
+                continue
             try:
-                # Make index file world writeable
-                os.chmod(self.indexpath, 0o666)
-            except BaseException:
-                pass
-            self.index.close()
-            unlock("index_lock")
-            # Clean up pending read notifications in the cache. This will also
-            # mess up tranfers in progress...
-            self.clean()
-            self.direc = os.path.dirname(self.indexpath)  # Cache directory
+                used.append((os.stat(path).st_mtime, key))
+            except OSError:
+                used.append((0, key))   # The file is gone, drop the entry first
+        used.sort()
+        for mtime, key in used:
+            if total <= maxsize:
+                break
+            path, size = entries.pop(key)
+            if cdmsobj._debug:
+                print(
+                    'Process %d: Evicting cache file %s' %
+                    (os.getpid(), path))
+            _remove(path)
+            total -= size
 
     def get(self, filekey):
         """
@@ -307,65 +479,95 @@ class Cache:
         <filekey> : filekey for cache
         """
         filekey = str(filekey)
-        lock("index_lock")
+        entry = self._readIndex().get(filekey)
+        if entry is None:
+            return None
+        path = entry[0]
         try:
-            self.index = shelve.open(self.indexpath)
-            value = self.index[filekey]
-        except KeyError:
-            value = None
-        except BaseException:
-            self.index.close()
-            unlock("index_lock")
-            raise
-        self.index.close()
-        unlock("index_lock")
-        return value
+            # Mark the file as recently used
+            os.utime(path, None)
+        except OSError:
+            if not os.path.isfile(path):
+                return None
+        return path
 
     def put(self, filekey, path):
         """
         cache[filekey] = path
 
+        Adding a file may remove the least recently used files from the cache.
+
         Parameters
         ----------
         filekey : for cache
+
+        path : path of an existing file in the cache directory
         """
 
         filekey = str(filekey)
-
-        # Create a semaphore
-        lock("index_lock")
+        size = os.path.getsize(path)
+        fd, entries = self._lockIndex()
         try:
             if cdmsobj._debug:
                 print(
                     'Process %d: Adding cache file %s,\n   key %s' %
                     (os.getpid(), path, filekey))
-            self.index = shelve.open(self.indexpath)
-            self.index[filekey] = path
-        except BaseException:
-            self.index.close()
-            unlock("index_lock")
-            raise
-        self.index.close()
-        unlock("index_lock")
+            old = entries.get(filekey)
+            if old is not None and old[0] != path:
+                _remove(old[0])
+            entries[filekey] = [path, size]
+            self._trim(entries, filekey)
+            self._writeIndex(entries)
+        finally:
+            _funlock(fd)
 
     def deleteEntry(self, filekey):
         """
-        Delete a cache index entry.
+        Delete a cache index entry and the file it refers to.
 
         Parameters
         ----------
         <filekey> : filekey for cache
         """
         filekey = str(filekey)
+        fd, entries = self._lockIndex()
+        try:
+            entry = entries.pop(filekey, None)
+            if entry is not None:
+                _remove(entry[0])
+                self._writeIndex(entries)
+        finally:
+            _funlock(fd)
+
+    def _transfer(self, fromURL, filekey, lcpath, userid, useReplica):
+        """
+        Copy the file <fromURL> into the cache. The key lock must be held.
+        """
+
+        # Get a temporary file in the cache. Keep the extension, the file
+        # format may be deduced from it.
+        suffix = os.path.splitext(urllib.parse.urlparse(fromURL)[2])[1]
+        fd, toPath = tempfile.mkstemp(suffix=suffix, dir=self.direc)
+        os.close(fd)
 
-        # Create a semaphore
-        lock("index_lock")
-        self.index = shelve.open(self.indexpath)
+        # Copy to the temporary file
         try:
-            del self.index[filekey]
+            copyFile(
+                fromURL,
+                toPath,
+                lcpath=lcpath,
+                userid=userid,
+                useReplica=useReplica)
+            # Make cache files world writeable
+            os.chmod(toPath, 0o666)
+            # Add to the cache index
+            self.put(filekey, toPath)
         except BaseException:
-            pass
-        unlock("index_lock")
+            # Remove the temp file on error, then re-raise
+            _remove(toPath)
+            raise
+
+        return toPath
 
     def copyFile(self, fromURL, filekey, lcpath=None,
                  userid=None, useReplica=None):
@@ -382,38 +584,13 @@ class Cache:
         <useReplica> : is true iff the request manager should search the replica
                        catalog for the actual file to transfer.
         """
-
-        # Put a notification into the cache, that this file is being read.
-        self.put(filekey, "__READ_PENDING__")
-
-        # Get a temporary file in the cache
-        tempdir = tempfile.tempdir
-        tempfile.tempdir = self.direc
-        toPath = tempfile.mktemp()
-        tempfile.tempdir = tempdir
-
-        # Copy to the temporary file
+        filekey = str(filekey)
+        keypath = self._keyLockPath(filekey)
+        fd = _flock(keypath)
         try:
-            copyFile(
-                fromURL,
-                toPath,
-                lcpath=lcpath,
-                userid=userid,
-                useReplica=useReplica)
-            # Make cache files world writeable
-            os.chmod(toPath, 0o666)
-        except BaseException:
-            # Remove the notification on error, and the temp file, then
-            # re-raise
-            self.deleteEntry(filekey)
-            if os.path.isfile(toPath):
-                os.unlink(toPath)
-            raise
-
-        # Add to the cache index
-        self.put(filekey, toPath)
-
-        return toPath
+            return self._transfer(fromURL, filekey, lcpath, userid, useReplica)
+        finally:
+            _funlock(fd, keypath)
 
     def getFile(self, fromURL, filekey, naptime=5, maxtries=60,
                 lcpath=None, userid=None, useReplica=None):
@@ -423,14 +600,15 @@ class Cache:
         If the file is in the cache, read it.
 
         If another process is transferring it into the cache, wait for the
-        transfer to complete.
+        transfer to complete. The wait ends as soon as the other process
+        releases the lock of <filekey>, when the transfer is done or fails, or
+        when the process exits.
 
 
         Parameters
         ----------
-        <naptime> : is the number of seconds between retries,
-
-        <maxtries> : is the maximum number of retries. Otherwise, copy it from the remote file.
+        <naptime>, <maxtries> : are ignored, they are kept for compatibility.
+                                Waiting for a transfer does not poll the cache.
 
         <filekey> : is the cache index key. A good choice is (datasetDN, filename) where
 
@@ -454,50 +632,23 @@ class Cache:
         The function does not guarantee that the file is still in the cache
         by the time it returns.
         """
-        # If the file is being read into the cache, just wait for it
-        tempname = self.get(filekey)
-        # Note: This is not bulletproof: another process could set the cache at
-        # this point
-        if tempname is None:
-            fpath = self.copyFile(
-                fromURL,
-                filekey,
-                lcpath=lcpath,
-                userid=userid,
-                useReplica=useReplica)
-        elif tempname == "__READ_PENDING__":
-            success = 0
-            for i in range(maxtries):
-                if cdmsobj._debug:
-                    print(
-                        'Process %d: Waiting for read completion, %s' %
-                        (os.getpid(), repr(filekey)))
-                time.sleep(naptime)
-                tempname = self.get(filekey)
-
-                # The read failed, or the entry was deleted.
-                if tempname is None:
-                    fpath = self.copyFile(
-                        fromURL,
-                        filekey,
-                        lcpath=lcpath,
-                        userid=userid,
-                        useReplica=useReplica)
-
-                # The read is not yet complete
-                elif tempname == "__READ_PENDING__":
-                    continue
-
-                # The read is finished.
-                else:
-                    fpath = tempname
-                    success = 1
-                    break
-            if not success:
-                raise CDMSError(TimeOutError + repr(filekey))
-
-        else:
-            fpath = tempname
+        filekey = str(filekey)
+        fpath = self.get(filekey)
+        if fpath is None:
+            # Only one process transfers a given file, the others block
+            # here until it is done and then find it in the cache.
+            keypath = self._keyLockPath(filekey)
+            if cdmsobj._debug:
+                print(
+                    'Process %d: Waiting for lock of %s' %
+                    (os.getpid(), repr(filekey)))
+            fd = _flock(keypath)
+            try:
+                fpath = self.get(filekey)
+                if fpath is None:
+                    fpath = self._transfer(fromURL, filekey, lcpath, userid, useReplica)
+            finally:
+                _funlock(fd, keypath)
 
         if cdmsobj._debug:
             print(
@@ -508,37 +659,33 @@ class Cache:
     def delete(self):
         """
         Delete the cache.
+
+        Files which are being transferred are not removed.
         """
         if self.indexpath is not None:
-            lock("index_lock")
-            self.index = shelve.open(self.indexpath)
-            for key in list(self.index.keys()):
-                path = self.index[key]
-                if path == "__READ_PENDING__":
-                    continue  # Don't remove read-pending notifications
-                try:
+            fd, entries = self._lockIndex()
+            try:
+                for key, (path, size) in entries.items():
                     if cdmsobj._debug:
                         print(
                             'Process %d: Deleting cache file %s' %
                             (os.getpid(), path))
-                    os.unlink(path)
-                except BaseException:
-                    pass
-
-                del self.index[key]
-            self.index.close()
-            unlock("index_lock")
+                    _remove(path)
+                self._writeIndex({})
+            finally:
+                _funlock(fd)
             self.indexpath = None
 
     def clean(self):
         """
-        Clean pending read notifications.
+        Remove the entries of files which no longer exist.
         """
-        lock("index_lock")
-        self.index = shelve.open(self.indexpath)
-        for key in list(self.index.keys()):
-            path = self.index[key]
-            if path == "__READ_PENDING__":
-                del self.index[key]
-        self.index.close()
-        unlock("index_lock")
+        fd, entries = self._lockIndex()
+        try:
+            missing = [key for key, (path, size) in entries.items() if not os.path.isfile(path)]
+            if missing:
+                for key in missing:
+                    del entries[key]
+                self._writeIndex(entries)
+        finally:
+            _funlock(fd)
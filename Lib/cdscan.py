@@ -12,6 +12,9 @@ import string
 import cdtime
 import os.path
 import copy
+import functools
+import multiprocessing
+import pickle
 from cdms2 import cdmsNode
 import re
 from functools import reduce
@@ -113,9 +116,22 @@ Options:
     -j:        scan time as a vector dimension. Time values are listed
            individually. Turns off the -i option.
 
+    -J jobs, --jobs=jobs:
+                   number of processes used to read the files. The files are
+                   opened and read in parallel, then merged in the order they
+                   are listed, so the output is the same as with one process.
+                   Default: 1
+
     -l levels:     list of levels, comma-separated. Only specify if files are partitioned by
                    levels.
 
+    --manifest manifest_file:
+                   keep a summary of every scanned file (path, size, modification
+                   time, axes and variables) in manifest_file. On the next run with
+                   the same manifest, only the files which are new or were modified
+                   are read, the others are merged from their saved summary.
+                   The manifest is rewritten for the files of the current run.
+
     -m levelid:    name of the vertical level dimension. The default is the name of the
                    vertical level dimension
 
@@ -593,6 +609,207 @@ def cloneWithLatCheck(axis):
     return mycopy
 
 
+def allAxesVariable(f):
+    """Return a dummy variable on the axes of f which are not used by any
+    variable, or None."""
+    # Try to force all axes to be included, but only small ones, length<100.
+    # This section was motivated by a need to preserve the cloud axes isccp_prs,isccp_tau.
+    # If we ever need to preserve longer axes as well, we could create one
+    # variable per axis...
+    crude_var_axes = [[ax[0] for ax in var.getDomain()]
+                      for var in list(f.variables.values())]
+    var_axes = set().union(*crude_var_axes)
+    other_axes = list(set(f.axes.values()) - var_axes)
+    if len(other_axes) > 0:
+        other_axes = [ax for ax in other_axes if len(ax) < 100]
+        other_axes.sort(key=(lambda ax: ax.id))
+        axisvar = cdms2.createVariable(numpy.ones([len(ax) for ax in other_axes]),
+                                       axes=other_axes, id='allaxesdummy')
+        # all CdmsObj objects have this attribute, but for unknown
+        axisvar.autoApiInfo = None
+        # reasons datasetnode.dump() fails trying to dump this attribute's
+        # default value (jfp)
+        return axisvar
+    return None
+
+
+class AxisSummary(object):
+    """Picklable copy of the parts of a file axis read by cdscan."""
+
+    def __init__(self, axis):
+        self.id = axis.id
+        self.attributes = copyDict(axis.attributes)
+        self._values = axis[:]
+        self._bounds = axis.getBounds()
+        self._isTime = axis.isTime()
+        self._isLevel = axis.isLevel()
+        self._isLatitude = axis.isLatitude()
+        self._calendar = axis.getCalendar()
+
+    def __getattr__(self, name):
+        attributes = self.__dict__.get('attributes', {})
+        if name in attributes:
+            return attributes[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, key):
+        return copy.copy(self._values[key])
+
+    def __len__(self):
+        return len(self._values)
+
+    def getBounds(self):
+        return copy.copy(self._bounds)
+
+    def getCalendar(self):
+        return self._calendar
+
+    def isTime(self):
+        return self._isTime
+
+    def isLevel(self):
+        return self._isLevel
+
+    def isLatitude(self):
+        return self._isLatitude
+
+
+class VariableSummary(object):
+    """Picklable copy of the parts of a file variable read by cdscan.
+
+    axes maps the id() of the variable axes to their AxisSummary, so that
+    variables sharing an axis in the file share it in the summary.
+    """
+
+    def __init__(self, var, axes):
+        self.id = var.id
+        if 'name_in_file' in var.__dict__:
+            self.name_in_file = var.name_in_file
+        self.attributes = copyDict(var.attributes)
+        self._typecode = var.typecode()
+        self._size = var.size()
+        self._domain = []
+        for axis, start, length, truelen in var.getDomain():
+            if id(axis) not in axes:
+                axes[id(axis)] = AxisSummary(axis)
+            self._domain.append((axes[id(axis)], start, length, truelen))
+        ids = [id(item[0]) for item in var.getDomain()]
+        vartime = var.getTime()
+        self._time = None if vartime is None else ids.index(id(vartime))
+        varlev = var.getLevel()
+        self._level = None if varlev is None else ids.index(id(varlev))
+
+    def getDomain(self):
+        return self._domain
+
+    def getAxisIds(self):
+        return [item[0].id for item in self._domain]
+
+    def getTime(self):
+        return None if self._time is None else self._domain[self._time][0]
+
+    def getLevel(self):
+        return None if self._level is None else self._domain[self._level][0]
+
+    def typecode(self):
+        return self._typecode
+
+    def size(self):
+        return self._size
+
+
+class FileSummary(object):
+    """Picklable copy of the parts of a file read by cdscan, built in the
+    worker processes of a parallel scan (-J option)."""
+
+    def __init__(self, f, forecast=False):
+        self.attributes = copyDict(f.attributes)
+        summaries = {}
+        self.axes = OrderedDict()
+        for key, axis in f.axes.items():
+            summaries[id(axis)] = AxisSummary(axis)
+            self.axes[key] = summaries[id(axis)]
+        self.variables = OrderedDict()
+        for key, var in f.variables.items():
+            self.variables[key] = VariableSummary(var, summaries)
+        axisvar = allAxesVariable(f)
+        if axisvar is not None:
+            axisvar = VariableSummary(axisvar, {})
+        self.allaxesdummy = axisvar
+        self._values = {}
+        if forecast:
+            for name in ['nbdate', 'nbsec']:
+                self._values[name] = f(name)
+
+    def __getitem__(self, key):
+        if key in self.axes:
+            return self.axes[key]
+        return self.variables.get(key)
+
+    def __call__(self, name):
+        return self._values[name]
+
+    def close(self):
+        pass
+
+
+def scanFile(path, extraAttrs=[], forecast=False):
+    """Read a file for a parallel scan.
+
+    Returns
+    -------
+    A FileSummary, or None if the file cannot be opened.
+    """
+    try:
+        f = cdms2.open(path)
+    except BaseException:
+        return None
+    try:
+        addAttrs(f, extraAttrs)
+        return FileSummary(f, forecast)
+    finally:
+        f.close()
+
+
+# Version of the --manifest file format
+manifestVersion = 1
+
+
+def fileStamp(path):
+    """Return the (size, modification time) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime)
+
+
+def loadManifest(path, key):
+    """Load a scan manifest.
+
+    Returns
+    -------
+    Dictionary path => ((size, mtime), pickled FileSummary). It is empty if
+    the manifest does not exist or was written with other scan options (key).
+    """
+    try:
+        with open(path, 'rb') as f:
+            version, mkey, entries = pickle.load(f)
+    except (IOError, OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        return {}
+    if version != manifestVersion or mkey != key:
+        return {}
+    return entries
+
+
+def saveManifest(path, key, entries):
+    """Write a scan manifest, see loadManifest."""
+    tmppath = path + '.tmp'
+    with open(tmppath, 'wb') as f:
+        pickle.dump((manifestVersion, key, entries), f, pickle.HIGHEST_PROTOCOL)
+    os.replace(tmppath, path)
+
+
 def addAttrs(fobj, eattrs):
     """Add extra attributes to file/dataset fobj.
     eattrs has the form [(varid,attr,value), (varid,attr,value), ...]
@@ -718,9 +935,9 @@ def main(argv):
 
     try:
         args, lastargs = getopt.getopt(
-            argv[1:], "a:c:d:e:f:hi:jl:m:p:qr:s:t:x:",
+            argv[1:], "a:c:d:e:f:hi:jJ:l:m:p:qr:s:t:x:",
             ["include=", "include-file=", "exclude=", "exclude-file=", "forecast", "time-linear=",
-             "notrim-lat", "var-locate=", "ignore-open-error"])
+             "notrim-lat", "var-locate=", "ignore-open-error", "jobs=", "manifest="])
     except getopt.error:
         print(sys.exc_info()[1], file=sys.stderr)
         print(usage, file=sys.stderr)
@@ -754,6 +971,8 @@ def main(argv):
     excludePattern = None
     includePattern = None
     forecast = False
+    jobs = 1
+    manifestPath = None
     for flag, arg in args:
         if flag == '-a':
             aliasMapFile = arg
@@ -811,6 +1030,12 @@ def main(argv):
         elif flag == '-j':
             timeIsVector = 1
             timeIsLinear = None
+        elif flag in ('-J', '--jobs'):
+            jobs = int(arg)
+            if jobs < 1:
+                raise RuntimeError("--jobs option requires a positive integer")
+        elif flag == '--manifest':
+            manifestPath = arg
         elif flag == '-l':
             splitOnLevel = 1
             levelstr = arg.split(',')
@@ -1052,6 +1277,7 @@ def main(argv):
 
     boundsmap = {}                      # boundsmap : varid => timebounds_id
     boundsdict = {}                     # Same as vardict for time bounds
+    scanpaths = []
     for path in fileargs:
         path = path.strip()
 
@@ -1068,309 +1294,347 @@ def main(argv):
             mobj = re.match(excludePattern, base)
             if mobj is not None:
                 continue
-
+        scanpaths.append(path)
+
+    # With --manifest, only new or modified files are read, the others are
+    # taken from the summaries saved by the previous scan.
+    toscan = scanpaths
+    if manifestPath is not None:
+        manifestKey = (extraAttrs, forecast)
+        oldManifest = loadManifest(manifestPath, manifestKey)
+        manifest = OrderedDict()
+        stamps = dict((path, fileStamp(path)) for path in scanpaths)
+        toscan = [path for path in scanpaths
+                  if stamps[path] is None or path not in oldManifest or
+                  oldManifest[path][0] != stamps[path]]
         if verbose:
-            print(path)
-        try:
-            f = cdms2.open(path)
-        except BaseException:
-            if not ignoreOpenError:
-                raise RuntimeError('Error opening file ' + path)
-            else:
-                print(
-                    'Warning: cannot open file, skipping: %s' %
-                    path, file=sys.stderr)
-                continue
-
-        # Add/modify attributes
-        addAttrs(f, extraAttrs)
-
-        # Determine the variable ID suffix, if any
-        varsuffix = None
-        if modelMapFile is not None:
-            for direc in modelDirs:
-                mo = re.match(direc, path)
-                if mo is not None:
-                    suffixPattern = modelMap[direc]
-
-                    def gensuffix(m, mo=mo):
-                        i = int(m.group(1))
-                        return mo.group(i)
-                    varsuffix = re.sub(r'\\g<(\d)>', gensuffix, suffixPattern)
-                    break
-
-        # Copy the global attribute dictionary if necessary. Note that copy.copy
-        # can't be used here, since .attributes is now a 'fake' dictionary.
-        if global_attrs is None:
-            global_attrs = copyDict(f.attributes)
+            print('%d of %d files changed since the last scan' % (len(toscan), len(scanpaths)))
 
-        basepath = path[dirlen:]
-        if template is not None and template.match(basepath) is None:
+    # With -J the files are read by a pool of processes, but merged below in
+    # the order of the arguments.
+    pool = None
+    useSummaries = manifestPath is not None
+    try:
+        if jobs > 1 and len(toscan) > 1:
+            pool = multiprocessing.Pool(min(jobs, len(toscan)))
+            summaries = pool.imap(functools.partial(scanFile, extraAttrs=extraAttrs, forecast=forecast),
+                                  toscan, chunksize=max(1, len(toscan) // (16 * jobs)))
+            useSummaries = True
+        elif useSummaries:
+            summaries = (scanFile(path, extraAttrs, forecast) for path in toscan)
+        toscan = set(toscan)
+
+        for path in scanpaths:
             if verbose:
-                print('Warning: path %s does not match template %s' % (
-                    basepath, templatestr), file=sys.stderr)
-
-        # Find time boundary variables
-        boundsids = []
-        if splitOnTime:
-            tmpdict = {}
-            for axisname in f.axes.keys():
-                axis = f[axisname]
-                # was if axis.isTime() and hasattr(axis, 'bounds'):
-                if axis.isTime() and (axis.getBounds() is not None):
-                    tmpdict[axis.bounds] = 1
-            boundsids = list(tmpdict.keys())
-
-        # For forecasts, get the time at which the forecast begins (tau=0) which
-        # is nbdate,nbsec
-        if forecast:
-            # f('nbdate') is numpy.int32 which gets truncated
-            nbdate = numpy.int(f('nbdate'))
-            nbsec = f('nbsec')
-            # hopefully nbsec<(seconds per day)=86400<100000
-            fctau0 = nbdate * 100000 + nbsec
-            fctau0time = cdtime.abstime(nbdate, "day as %Y%m%d")
-            fctau0time = fctau0time.add(
-                nbsec, cdtime.Seconds)  # fctau0 as type comptime
-            fc_time_attrs = []
-
-        varnames = list(f.variables.keys())
-
-        # Try to force all axes to be included, but only small ones, length<100.
-        # This section was motivated by a need to preserve the cloud axes isccp_prs,isccp_tau.
-        # If we ever need to preserve longer axes as well, we could create one
-        # variable per axis...
-        crude_var_axes = [[ax[0] for ax in var.getDomain()]
-                          for var in list(f.variables.values())]
-        var_axes = set().union(*crude_var_axes)
-        other_axes = list(set(f.axes.values()) - var_axes)
-        if len(other_axes) > 0:
-            other_axes = [ax for ax in other_axes if len(ax) < 100]
-            other_axes.sort(key=(lambda ax: ax.id))
-            axisvar = cdms2.createVariable(numpy.ones([len(ax) for ax in other_axes]),
-                                           axes=other_axes, id='allaxesdummy')
-            # all CdmsObj objects have this attribute, but for unknown
-            axisvar.autoApiInfo = None
-            # reasons datasetnode.dump() fails trying to dump this attribute's
-            # default value (jfp)
-            varnames.append(axisvar.id)
-        # ...try to force all axes to be considered
-
-        varnames = sorted(varnames)
-        for varname in varnames:
-
-            # If --var-locate is specified for the variable, match the basename
-            # before processing
-            if varLocate is not None and varname in varLocate:
-                varpattern = varLocate[varname]
-                base = os.path.basename(path)
-                mobj = re.match(varpattern, base)
-                if mobj is None:
+                print(path)
+            if not useSummaries:
+                try:
+                    f = cdms2.open(path)
+                except BaseException:
+                    f = None
+            elif path in toscan:
+                f = next(summaries)
+                if manifestPath is not None and f is not None:
+                    # Saved before the loop below renames variables
+                    manifest[path] = (stamps[path], pickle.dumps(f, pickle.HIGHEST_PROTOCOL))
+            else:
+                manifest[path] = oldManifest[path]
+                f = pickle.loads(oldManifest[path][1])
+            if f is None:
+                if not ignoreOpenError:
+                    raise RuntimeError('Error opening file ' + path)
+                else:
+                    print(
+                        'Warning: cannot open file, skipping: %s' %
+                        path, file=sys.stderr)
                     continue
 
-            # was var = f.variables[varname]
-            if varname == 'allaxesdummy':
-                var = axisvar
-            else:
-                var = f.variables[varname]
-
-            # Reset the variable ID to any specified alias
-            if aliasMapFile is not None:
-                varalias = aliasMap.get(var.id)
-                if varalias is not None:
-                    var.name_in_file = var.id
-                    var.id = varalias
-                    varname = varalias
-
-            # Append a suffix to the variable ID, if applicable
-            if varsuffix is not None:
-                if not hasattr(var, 'name_in_file'):
-                    var.name_in_file = var.id
-                var.id += varsuffix
-                varname += varsuffix
-
-            # [timestart, timeend, levstart, levend, path, timeid, levid, calendar, fctau0]
-            varentry = [None] * 9
-            varentry[4] = basepath
-            varentry[8] = fctau0
-
-            # Generate a temporary domain entry, and
-            # create axis dictionary entries.
-            domain = var.getDomain()
+            # Add/modify attributes
+            if not useSummaries:
+                addAttrs(f, extraAttrs)
+
+            # Determine the variable ID suffix, if any
+            varsuffix = None
+            if modelMapFile is not None:
+                for direc in modelDirs:
+                    mo = re.match(direc, path)
+                    if mo is not None:
+                        suffixPattern = modelMap[direc]
+
+                        def gensuffix(m, mo=mo):
+                            i = int(m.group(1))
+                            return mo.group(i)
+                        varsuffix = re.sub(r'\\g<(\d)>', gensuffix, suffixPattern)
+                        break
+
+            # Copy the global attribute dictionary if necessary. Note that copy.copy
+            # can't be used here, since .attributes is now a 'fake' dictionary.
+            if global_attrs is None:
+                global_attrs = copyDict(f.attributes)
+
+            basepath = path[dirlen:]
+            if template is not None and template.match(basepath) is None:
+                if verbose:
+                    print('Warning: path %s does not match template %s' % (
+                        basepath, templatestr), file=sys.stderr)
+
+            # Find time boundary variables
+            boundsids = []
+            if splitOnTime:
+                tmpdict = {}
+                for axisname in f.axes.keys():
+                    axis = f[axisname]
+                    # was if axis.isTime() and hasattr(axis, 'bounds'):
+                    if axis.isTime() and (axis.getBounds() is not None):
+                        tmpdict[axis.bounds] = 1
+                boundsids = list(tmpdict.keys())
+
+            # For forecasts, get the time at which the forecast begins (tau=0) which
+            # is nbdate,nbsec
             if forecast:
-                tempdomain = ['fctau0']
+                # f('nbdate') is numpy.int32 which gets truncated
+                nbdate = numpy.int(f('nbdate'))
+                nbsec = f('nbsec')
+                # hopefully nbsec<(seconds per day)=86400<100000
+                fctau0 = nbdate * 100000 + nbsec
+                fctau0time = cdtime.abstime(nbdate, "day as %Y%m%d")
+                fctau0time = fctau0time.add(
+                    nbsec, cdtime.Seconds)  # fctau0 as type comptime
+                fc_time_attrs = []
+
+            varnames = list(f.variables.keys())
+
+            # Try to force all axes to be considered
+            if useSummaries:
+                axisvar = f.allaxesdummy
             else:
-                # List of axis names and/or objects (if not partitioned)
-                tempdomain = []
-            for axis, start, length, truelen in domain:
-                if (splitOnTime and (axis.isTime() or axis.id == timeid)) or \
-                   (splitOnLevel and (axis.isLevel() or axis.id == levelid)):
-                    tempdomain.append(axis.id)
-                elif forecast and (axis.isTime() or axis.id == timeid):
-                    # time axis isn't split but needs special treatment for
-                    # forecasts
-                    tempdomain.append(axis.id)
-                    fc_time_attrs.append(axis.attributes)
+                axisvar = allAxesVariable(f)
+            if axisvar is not None:
+                varnames.append(axisvar.id)
+
+            varnames = sorted(varnames)
+            for varname in varnames:
+
+                # If --var-locate is specified for the variable, match the basename
+                # before processing
+                if varLocate is not None and varname in varLocate:
+                    varpattern = varLocate[varname]
+                    base = os.path.basename(path)
+                    mobj = re.match(varpattern, base)
+                    if mobj is None:
+                        continue
+
+                # was var = f.variables[varname]
+                if varname == 'allaxesdummy':
+                    var = axisvar
                 else:
-                    axis = cloneWithLatCheck(axis)  # Transient copy
-                    if axis.id in axisdict:
-                        currentaxis = axisdict[axis.id]
-
-                        # Check that the axis has the same length and values as the saved value. If not,
-                        # create an unambiguous name in the axis dictionary.
-                        if compareaxes(axis, currentaxis):
-                            sepname = disambig(
-                                axis.id, axisdict, len(axis), compareaxes, axis)
-                            axis.name_in_file = axis.id
-                            axis.id = sepname
-
+                    var = f.variables[varname]
+
+                # Reset the variable ID to any specified alias
+                if aliasMapFile is not None:
+                    varalias = aliasMap.get(var.id)
+                    if varalias is not None:
+                        var.name_in_file = var.id
+                        var.id = varalias
+                        varname = varalias
+
+                # Append a suffix to the variable ID, if applicable
+                if varsuffix is not None:
+                    if not hasattr(var, 'name_in_file'):
+                        var.name_in_file = var.id
+                    var.id += varsuffix
+                    varname += varsuffix
+
+                # [timestart, timeend, levstart, levend, path, timeid, levid, calendar, fctau0]
+                varentry = [None] * 9
+                varentry[4] = basepath
+                varentry[8] = fctau0
+
+                # Generate a temporary domain entry, and
+                # create axis dictionary entries.
+                domain = var.getDomain()
+                if forecast:
+                    tempdomain = ['fctau0']
+                else:
+                    # List of axis names and/or objects (if not partitioned)
+                    tempdomain = []
+                for axis, start, length, truelen in domain:
+                    if (splitOnTime and (axis.isTime() or axis.id == timeid)) or \
+                       (splitOnLevel and (axis.isLevel() or axis.id == levelid)):
+                        tempdomain.append(axis.id)
+                    elif forecast and (axis.isTime() or axis.id == timeid):
+                        # time axis isn't split but needs special treatment for
+                        # forecasts
+                        tempdomain.append(axis.id)
+                        fc_time_attrs.append(axis.attributes)
+                    else:
+                        axis = cloneWithLatCheck(axis)  # Transient copy
+                        if axis.id in axisdict:
+                            currentaxis = axisdict[axis.id]
+
+                            # Check that the axis has the same length and values as the saved value. If not,
+                            # create an unambiguous name in the axis dictionary.
+                            if compareaxes(axis, currentaxis):
+                                sepname = disambig(
+                                    axis.id, axisdict, len(axis), compareaxes, axis)
+                                axis.name_in_file = axis.id
+                                axis.id = sepname
+
+                                # Fix boundary variable names if using suffixes.
+                                if varsuffix is not None and hasattr(
+                                        axis, 'bounds'):
+                                    axis.bounds += varsuffix
+                                axisdict[sepname] = axis
+                            else:
+                                axis = currentaxis
+                        else:
                             # Fix boundary variable names if using suffixes.
-                            if varsuffix is not None and hasattr(
-                                    axis, 'bounds'):
+                            if varsuffix is not None and hasattr(axis, 'bounds'):
                                 axis.bounds += varsuffix
-                            axisdict[sepname] = axis
-                        else:
-                            axis = currentaxis
-                    else:
-                        # Fix boundary variable names if using suffixes.
-                        if varsuffix is not None and hasattr(axis, 'bounds'):
-                            axis.bounds += varsuffix
-                        axisdict[axis.id] = axis
-                    tempdomain.append(axis)
-
-            # Create a dictionary entry for the variable if not already there.
-            if var.id in boundsids:
-                boundsattrs = copyDict(var.attributes)
-                boundsdict[var.id] = [tempdomain, boundsattrs, var.typecode()]
-                continue                # Don't set a filemap entry until axes are sorted out
-            elif var.id not in vardict:
-                varattrs = copyDict(var.attributes)
-                if varsuffix is not None or aliasMapFile is not None:
-                    varattrs['name_in_file'] = var.name_in_file
-                vardict[var.id] = [tempdomain, varattrs, var.typecode()]
-            else:
-                currentdomain, attrs, tcode = vardict[var.id]
-                if comparedomains(currentdomain, tempdomain):
-                    sepname = disambig(
-                        var.id, vardict, var.size(), compareVarDictValues, (tempdomain, None))
-                    saveid = var.id
-                    varname = var.id = sepname
+                            axisdict[axis.id] = axis
+                        tempdomain.append(axis)
+
+                # Create a dictionary entry for the variable if not already there.
+                if var.id in boundsids:
+                    boundsattrs = copyDict(var.attributes)
+                    boundsdict[var.id] = [tempdomain, boundsattrs, var.typecode()]
+                    continue                # Don't set a filemap entry until axes are sorted out
+                elif var.id not in vardict:
                     varattrs = copyDict(var.attributes)
-                    var.name_in_file = varattrs['name_in_file'] = saveid
-                    vardict[sepname] = [tempdomain, varattrs, var.typecode()]
-
-            # Create a filemap entry for this variable/file, if split on time
-            # or forecast
-            axisids = [x[0].id for x in var.getDomain()]
-            if splitOnTime or forecast:
-                vartime = None
-                if timeid is not None:
-                    if timeid in axisids:
-                        vartime = f.axes.get(timeid)
-                    else:
-                        if verbose:
-                            print(
-                                'Warning, time axis %s not found, -t option ignored' %
-                                timeid, file=sys.stderr)
-                if vartime is None:
-                    vartime = var.getTime()
-                if vartime is not None:
-                    if not overrideCalendar:
-                        calendar = vartime.getCalendar()
-                    if referenceTime is None:
-                        referenceTime = vartime.units
-                    if verbose and not forecast:
-                        print('Setting reference time units to', referenceTime)
-                    if timeIsLinear is None and timeIsVector is None:
-                        timeIsLinear = (referenceTime[0].lower().split() in
-                                        ['hour',
-                                         'hours',
-                                         'minute',
-                                         'minutes',
-                                         'second',
-                                         'seconds'])
-                        if timeIsLinear and verbose:
-                            print('Setting time representation to "linear"')  # '
-                    if timeIsLinear and referenceDelta is None:
-                        if len(vartime) > 1:
-                            time1 = timeindex(
-                                vartime[1], vartime.units, referenceTime, None, calendar)
-                            time0 = timeindex(
-                                vartime[0], vartime.units, referenceTime, None, calendar)
-                            referenceDelta = time1 - time0
+                    if varsuffix is not None or aliasMapFile is not None:
+                        varattrs['name_in_file'] = var.name_in_file
+                    vardict[var.id] = [tempdomain, varattrs, var.typecode()]
+                else:
+                    currentdomain, attrs, tcode = vardict[var.id]
+                    if comparedomains(currentdomain, tempdomain):
+                        sepname = disambig(
+                            var.id, vardict, var.size(), compareVarDictValues, (tempdomain, None))
+                        saveid = var.id
+                        varname = var.id = sepname
+                        varattrs = copyDict(var.attributes)
+                        var.name_in_file = varattrs['name_in_file'] = saveid
+                        vardict[sepname] = [tempdomain, varattrs, var.typecode()]
+
+                # Create a filemap entry for this variable/file, if split on time
+                # or forecast
+                axisids = [x[0].id for x in var.getDomain()]
+                if splitOnTime or forecast:
+                    vartime = None
+                    if timeid is not None:
+                        if timeid in axisids:
+                            vartime = f.axes.get(timeid)
                         else:
-                            referenceDelta = 1
-                        if verbose:
-                            print('Setting time delta to', referenceDelta)
-
-#                    starttime = vartime[0]
-#                    endtime = vartime[-1]
-                    startindex = timeindex(
-                        vartime[0],
-                        vartime.units,
-                        referenceTime,
-                        referenceDelta,
-                        calendar)
-                    endindex = timeindex(
-                        vartime[-1], vartime.units, referenceTime, referenceDelta, calendar)
-                    if forecast:
-                        # split on forecast, hence no split on time
-                        varentry[0] = None
-                        varentry[1] = None
-                        referenceTime = None
-                    else:
-                        varentry[0] = startindex
-                        varentry[1] = endindex
-                    varentry[5] = vartime.id
-                    varentry[7] = calendar
-
-                    if (basepath, vartime.id) not in timedict:
-                        values = vartime[:]
-                        timedict[(basepath, vartime.id)] = (
-                            values, vartime.units, calendar)
-
-            if splitOnLevel:
-                varlev = None
-                if (levelid is not None) and (levelid in axisids):
-                    varlev = f.axes.get(levelid)
-                if varlev is None:
-                    varlev = var.getLevel()
-                if varlev is not None:
-                    startlev = varlev[0]
-                    if isinstance(startlev, numpy.ndarray):
-                        startlev = startlev[0]
-                    endlev = varlev[-1]
-                    if isinstance(endlev, numpy.ndarray):
-                        endlev = endlev[0]
-                    varentry[2] = startlev
-                    varentry[3] = endlev
-                    varentry[6] = varlev.id
-
-                    if (basepath, varlev.id, None) not in levdict:
-                        values = varlev[:]
-                        levdict[(basepath, varlev.id)] = (
-                            values, varlev.units, None)
-
-            if forecast:
-                if (basepath, 'fctau0') not in fcdict:
-                    fcdict[(basepath, 'fctau0')] = ([fctau0], "", None)
-
-            if varname in filemap:
-                filemap[varname].append(tuple(varentry))
-            else:
-                filemap[varname] = [tuple(varentry)]
-
-            # Set boundsmap : varid => timebounds_id
-            # was if splitOnTime and vartime is not None and hasattr(vartime,
-            # "bounds") and not boundsmap.has_key(varname):
-            if splitOnTime and vartime is not None and (vartime.getBounds() is not None) and\
-                    varname not in boundsmap:
-                boundsmap[varname] = vartime.bounds
-
-            # End of loop "for varname in varnames"
-
-        f.close()
-        # End of loop "for path in fileargs"
+                            if verbose:
+                                print(
+                                    'Warning, time axis %s not found, -t option ignored' %
+                                    timeid, file=sys.stderr)
+                    if vartime is None:
+                        vartime = var.getTime()
+                    if vartime is not None:
+                        if not overrideCalendar:
+                            calendar = vartime.getCalendar()
+                        if referenceTime is None:
+                            referenceTime = vartime.units
+                        if verbose and not forecast:
+                            print('Setting reference time units to', referenceTime)
+                        if timeIsLinear is None and timeIsVector is None:
+                            timeIsLinear = (referenceTime[0].lower().split() in
+                                            ['hour',
+                                             'hours',
+                                             'minute',
+                                             'minutes',
+                                             'second',
+                                             'seconds'])
+                            if timeIsLinear and verbose:
+                                print('Setting time representation to "linear"')  # '
+                        if timeIsLinear and referenceDelta is None:
+                            if len(vartime) > 1:
+                                time1 = timeindex(
+                                    vartime[1], vartime.units, referenceTime, None, calendar)
+                                time0 = timeindex(
+                                    vartime[0], vartime.units, referenceTime, None, calendar)
+                                referenceDelta = time1 - time0
+                            else:
+                                referenceDelta = 1
+                            if verbose:
+                                print('Setting time delta to', referenceDelta)
+
+    #                    starttime = vartime[0]
+    #                    endtime = vartime[-1]
+                        startindex = timeindex(
+                            vartime[0],
+                            vartime.units,
+                            referenceTime,
+                            referenceDelta,
+                            calendar)
+                        endindex = timeindex(
+                            vartime[-1], vartime.units, referenceTime, referenceDelta, calendar)
+                        if forecast:
+                            # split on forecast, hence no split on time
+                            varentry[0] = None
+                            varentry[1] = None
+                            referenceTime = None
+                        else:
+                            varentry[0] = startindex
+                            varentry[1] = endindex
+                        varentry[5] = vartime.id
+                        varentry[7] = calendar
+
+                        if (basepath, vartime.id) not in timedict:
+                            values = vartime[:]
+                            timedict[(basepath, vartime.id)] = (
+                                values, vartime.units, calendar)
+
+                if splitOnLevel:
+                    varlev = None
+                    if (levelid is not None) and (levelid in axisids):
+                        varlev = f.axes.get(levelid)
+                    if varlev is None:
+                        varlev = var.getLevel()
+                    if varlev is not None:
+                        startlev = varlev[0]
+                        if isinstance(startlev, numpy.ndarray):
+                            startlev = startlev[0]
+                        endlev = varlev[-1]
+                        if isinstance(endlev, numpy.ndarray):
+                            endlev = endlev[0]
+                        varentry[2] = startlev
+                        varentry[3] = endlev
+                        varentry[6] = varlev.id
+
+                        if (basepath, varlev.id, None) not in levdict:
+                            values = varlev[:]
+                            levdict[(basepath, varlev.id)] = (
+                                values, varlev.units, None)
+
+                if forecast:
+                    if (basepath, 'fctau0') not in fcdict:
+                        fcdict[(basepath, 'fctau0')] = ([fctau0], "", None)
+
+                if varname in filemap:
+                    filemap[varname].append(tuple(varentry))
+                else:
+                    filemap[varname] = [tuple(varentry)]
+
+                # Set boundsmap : varid => timebounds_id
+                # was if splitOnTime and vartime is not None and hasattr(vartime,
+                # "bounds") and not boundsmap.has_key(varname):
+                if splitOnTime and vartime is not None and (vartime.getBounds() is not None) and\
+                        varname not in boundsmap:
+                    boundsmap[varname] = vartime.bounds
+
+                # End of loop "for varname in varnames"
+
+            f.close()
+            # End of loop "for path in fileargs"
+    finally:
+        # Also stops the workers when the merge fails
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    if manifestPath is not None:
+        saveManifest(manifestPath, manifestKey, manifest)
 
     # ------------------------------------------------------------------------
 
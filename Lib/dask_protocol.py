@@ -1,6 +1,8 @@
 import zlib
+import numpy
 from . import tvariable
 from . import fvariable
+from . import axis
 from cdms2 import open
 import distributed.protocol
 
@@ -10,14 +12,119 @@ TransientVariable = tvariable.TransientVariable
 createVariable = tvariable.createVariable
 
 
+def _encodeValue(value):
+    """Convert an attribute value to types the (msgpack) header accepts"""
+    if isinstance(value, numpy.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': value.dtype.str}
+    if isinstance(value, numpy.generic):
+        return {'__ndarray__': value.item(), 'dtype': value.dtype.str}
+    if isinstance(value, (list, tuple)):
+        return [_encodeValue(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+def _decodeValue(value):
+    if isinstance(value, dict) and '__ndarray__' in value:
+        result = numpy.array(value['__ndarray__'], dtype=value['dtype'])
+        if result.ndim == 0:
+            result = result[()]
+        return result
+    if isinstance(value, list):
+        return [_decodeValue(v) for v in value]
+    return value
+
+
+def _encodeAttributes(attributes):
+    return dict((k, _encodeValue(v)) for k, v in attributes.items()
+                if k != "autoApiInfo")
+
+
+def _decodeAttributes(attributes):
+    return dict((k, _decodeValue(v)) for k, v in attributes.items())
+
+
+def _frame(ar, header):
+    """Describe ar in header and return it as a raw byte frame"""
+    ar = numpy.ascontiguousarray(ar)
+    header.append({'dtype': ar.dtype.str, 'shape': list(ar.shape)})
+    return memoryview(ar.reshape(-1).view(numpy.uint8))
+
+
+def _unframe(frame, header):
+    ar = numpy.frombuffer(frame, dtype=header['dtype'])
+    if not ar.flags.writeable:
+        # Variables are expected to be writeable
+        ar = ar.copy()
+    return ar.reshape(header['shape'])
+
+
 def serialize_TV(tv):
-    state = zlib.compress(tv.dumps().encode("utf-8"))
-    return {"TV": state}, []
+    """Serialize a TransientVariable for dask.distributed.
+
+    The data, mask, axis values and bounds are sent as raw buffer frames
+    without copying; only the shapes, dtypes, ids and attributes go into
+    the header.
+    """
+    data = numpy.ma.getdata(tv)
+    if data.dtype.hasobject:
+        # No buffer to send, fall back to JSON
+        return {"TV": zlib.compress(tv.dumps().encode("utf-8"))}, []
+
+    frames = []
+    arrays = []
+    frames.append(_frame(data, arrays))
+    mask = numpy.ma.getmask(tv)
+    if mask is not numpy.ma.nomask:
+        frames.append(_frame(mask, arrays))
+
+    axes = []
+    for ax in tv.getAxisList():
+        axheader = {'id': ax.id,
+                    'attributes': _encodeAttributes(ax.attributes),
+                    'arrays': []}
+        frames.append(_frame(ax[:], axheader['arrays']))
+        bounds = ax.getExplicitBounds()
+        if bounds is not None:
+            frames.append(_frame(bounds, axheader['arrays']))
+        axes.append(axheader)
+
+    header = {'id': tv.id,
+              'fill_value': _encodeValue(tv.fill_value),
+              'attributes': _encodeAttributes(tv.attributes),
+              'arrays': arrays,
+              'axes': axes}
+    return header, frames
 
 
 def deserialize_TV(header, frames):
-    TV = header['TV']
-    newvar = createVariable(TV, fromJSON=True)
+    if 'TV' in header:
+        return createVariable(header['TV'], fromJSON=True)
+
+    frames = iter(frames)
+    arrays = header['arrays']
+    data = _unframe(next(frames), arrays[0])
+    mask = numpy.ma.nomask
+    if len(arrays) > 1:
+        mask = _unframe(next(frames), arrays[1])
+
+    axes = []
+    for axheader in header['axes']:
+        values = _unframe(next(frames), axheader['arrays'][0])
+        bounds = None
+        if len(axheader['arrays']) > 1:
+            bounds = _unframe(next(frames), axheader['arrays'][1])
+        ax = axis.createAxis(values, bounds=bounds, id=axheader['id'])
+        for k, v in _decodeAttributes(axheader['attributes']).items():
+            setattr(ax, k, v)
+        axes.append(ax)
+
+    attributes = _decodeAttributes(header['attributes'])
+    attributes.pop('id', None)
+    newvar = createVariable(data, mask=mask, copy=0, axes=axes,
+                            fill_value=_decodeValue(header['fill_value']),
+                            attributes=attributes, id=header['id'])
     return newvar
 
 
@@ -9,7 +9,7 @@ import os
 import re
 import string
 import sys
-from .CDMLParser import CDMLParser
+from .CDMLParser import parseCDML
 from .cdmsobj import CdmsObj
 from .dataset import Dataset
 
@@ -116,10 +116,7 @@ def loadString(text, uri, parent=None, datapath=None):
 
         <datapath> : is the location of data files relative to the parent database URL.
     """
-    p = CDMLParser()
-    p.feed(text)
-    p.close()
-    return Dataset(uri, 'r', p.getRoot(), parent, datapath)
+    return Dataset(uri, 'r', parseCDML(text), parent, datapath)
 
 
 class AbstractDatabase(CdmsObj):
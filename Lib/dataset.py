@@ -18,7 +18,12 @@ except ImportError:
     from urllib import urlopen
 from . import cdmsobj
 import re
-from .CDMLParser import CDMLParser
+import threading
+import hashlib
+import pickle
+import tempfile
+from .CDMLParser import parseCDML
+from .sliceut import PartitionIndex
 from .cdmsobj import CdmsObj
 from .axis import Axis, FileAxis, FileVirtualAxis, isOverlapVector
 from .coord import FileAxis2D, DatasetAxis2D
@@ -33,6 +38,7 @@ from .cdmsNode import CdDatatypes
 from . import convention
 import warnings
 from collections import OrderedDict
+from collections.abc import MutableMapping
 from six import string_types
 from .util import getenv_bool
 
@@ -118,6 +124,13 @@ _IndexList5 = re.compile(
 
 _NPRINT = 20
 _showCompressWarnings = True
+# Default number of idle read-only file handles kept open by a Dataset
+_filePoolSize = 8
+# Build variables, axes and grids of read-only files on first access
+_lazyOpen = False
+# Directory of pickled CDML parse trees, None disables the cache
+_cdmlCacheDirectory = None
+_cdmlCacheVersion = 1
 
 
 def setCompressionWarnings(value=None):
@@ -399,6 +412,127 @@ def getNetcdfDeflateLevelFlag():
     return Cdunif.CdunifGetNCFLAGS("deflate_level")
 
 
+def setDatasetFilePoolSize(value):
+    """Set the number of read-only file handles kept open by datasets.
+
+       Parameters
+       ----------
+       value : integer >= 0, 0 disables the pool. Applies to datasets
+               opened afterwards, see Dataset.setFilePoolSize.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _filePoolSize
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise CDMSError("Error file pool size must be an integer >= 0")
+    _filePoolSize = value
+
+
+def getDatasetFilePoolSize():
+    """Get the number of read-only file handles kept open by datasets.
+
+       Returns
+       -------
+       Default file pool size.
+    """
+    return _filePoolSize
+
+
+def setLazyOpenFlag(value):
+    """Build the variables, axes and grids of files opened read-only the
+    first time they are accessed, instead of in cdms2.open.
+
+       Parameters
+       ----------
+       value : 0/1, False/True.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _lazyOpen
+    if value not in [True, False, 0, 1]:
+        raise CDMSError("Error lazy open flag must be 1/0 or true/False")
+    _lazyOpen = value in [1, True]
+
+
+def getLazyOpenFlag():
+    """Get the lazy open flag.
+
+       Returns
+       -------
+       Lazy open flag value.
+    """
+    return _lazyOpen
+
+
+def setCdmlCacheDirectory(path):
+    """Set the directory where parsed CDML files are cached.
+
+       The parse tree of each XML dataset opened from a local file is
+       stored there, keyed by the file path, size and modification time,
+       so that opening the dataset again skips the XML parsing.
+
+       Parameters
+       ----------
+       path : directory name, or None to disable the cache.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _cdmlCacheDirectory
+    if path is not None:
+        path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isdir(path):
+            os.makedirs(path)
+    _cdmlCacheDirectory = path
+
+
+def getCdmlCacheDirectory():
+    """Get the directory where parsed CDML files are cached.
+
+       Returns
+       -------
+       Directory name or None if the cache is disabled.
+    """
+    return _cdmlCacheDirectory
+
+
+def _cdmlCachePath(path):
+    name = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest()
+    return os.path.join(_cdmlCacheDirectory, "cdml_%s.pkl" % name)
+
+
+def _cdmlCacheLoad(key):
+    cachepath = _cdmlCachePath(key[0])
+    if not os.path.exists(cachepath):
+        return None
+    try:
+        with open(cachepath, 'rb') as f:
+            cachekey, root = pickle.load(f)
+    except Exception:
+        # A corrupted or incompatible entry is simply parsed again
+        return None
+    if cachekey != key:
+        return None
+    return root
+
+
+def _cdmlCacheSave(key, root):
+    cachepath = _cdmlCachePath(key[0])
+    fd, tmp = tempfile.mkstemp(dir=_cdmlCacheDirectory, suffix='.pkl')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, root), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cachepath)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 def useNetcdf3():
     """ Turns off (0) NetCDF flags for shuffle/cuDa/deflatelevel
     Output files are generated as NetCDF3 Classic after that
@@ -417,13 +551,20 @@ def useNetcdf3():
 
 
 def load(path):
+    key = None
+    if _cdmlCacheDirectory is not None:
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns, _cdmlCacheVersion)
+        root = _cdmlCacheLoad(key)
+        if root is not None:
+            return root
     fd = open(path)
     text = fd.read()
     fd.close()
-    p = CDMLParser()
-    p.feed(text)
-    p.close()
-    return p.getRoot()
+    root = parseCDML(text)
+    if key is not None and root is not None:
+        _cdmlCacheSave(key, root)
+    return root
 
 # Create a tree from a URI
 # URI is of the form scheme://netloc/path;parameters?query#fragment
@@ -437,10 +578,7 @@ def loadURI(uri):
     fd = urlopen(uripath)
     text = fd.read()
     fd.close()
-    p = CDMLParser()
-    p.feed(text)
-    p.close()
-    return p.getRoot()
+    return parseCDML(text)
 
 # Create a dataset
 # 'path' is the XML file name, or netCDF filename for simple file create
@@ -713,6 +851,99 @@ except BaseException:
     pass
 
 
+_unbuilt = object()
+
+
+class _LazyMapping(MutableMapping):
+    """Dictionary whose values are built the first time they are accessed.
+
+    Parameters
+    ----------
+    keys : keys known in advance, in order.
+    build : callable build(key) returning the value of a key.
+    finish : Optional callable finish(key, value), called once the value is
+             stored, so that it can look the key up again.
+    prepare : Optional callable run once before the first access, for
+              mappings whose keys are only known after other objects are built.
+    """
+
+    def __init__(self, keys, build, finish=None, prepare=None):
+        self.data = OrderedDict((key, _unbuilt) for key in keys)
+        self._build = build
+        self._finish = finish
+        self._prepare = prepare
+
+    def _ready(self):
+        if self._prepare is not None:
+            prepare, self._prepare = self._prepare, None
+            prepare()
+
+    def __getitem__(self, key):
+        self._ready()
+        value = self.data[key]
+        if value is _unbuilt:
+            value = self._build(key)
+            self.data[key] = value
+            if self._finish is not None:
+                try:
+                    self._finish(key, value)
+                except BaseException:
+                    # do not keep a half initialized value
+                    self.data[key] = _unbuilt
+                    raise
+        return value
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __delitem__(self, key):
+        del self.data[key]
+
+    def __contains__(self, key):
+        self._ready()
+        return key in self.data
+
+    def __iter__(self):
+        self._ready()
+        return iter(list(self.data.keys()))
+
+    def __len__(self):
+        self._ready()
+        return len(self.data)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def builtValues(self):
+        "Values which have already been built."
+        return [v for v in self.data.values() if v is not _unbuilt]
+
+    def reset(self, key):
+        "Forget the value of key, it is built again on the next access."
+        self.data[key] = _unbuilt
+
+
+class _PooledFile(object):
+    """Read-only file handle checked out of a Dataset file pool.
+
+    Behaves like the wrapped Cdunif.CdunifFile, except that close()
+    returns the handle to the pool.
+    """
+
+    def __init__(self, dataset, filename, fileobj):
+        self._dataset_ = dataset
+        self._filename_ = filename
+        self._file_ = fileobj
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_file_'], name)
+
+    def close(self):
+        if self._file_ is not None:
+            self._dataset_._releaseFile(self._filename_, self._file_)
+            self._file_ = None
+
+
 class Dataset(CdmsObj, cuDataset):
 
     def __init__(self, uri, mode, datasetNode=None,
@@ -747,6 +978,11 @@ class Dataset(CdmsObj, cuDataset):
         self.grids = {}
         self.xlinks = {}
         self._gridmap_ = {}
+        # Idle read-only file handles: filename => [CdunifFile, ...], in LRU order
+        self._filepool_ = OrderedDict()
+        self._filepoolsize_ = _filePoolSize
+        self._filepoollock_ = threading.Lock()
+        self._filepoolstats_ = {'hits': 0, 'misses': 0, 'evictions': 0}
         # Gridmap:(latname,lonname,order,maskname,gridclass) => grid
         (scheme, netloc, xmlpath, parameters,
          query, fragment) = urlparse(uri)
@@ -898,44 +1134,39 @@ class Dataset(CdmsObj, cuDataset):
             self._filemap_ = {}
             filemap = parseFileMap(self.cdms_filemap)
             for varlist, varmap in filemap:
+                timemap = {}
+                levmap = {}
+                # The for loop was:
+                # for tstart, tend, levstart, levend, path in varmap:
+                # but now there _may_ be an additional item before path...
+                for varm1 in varmap:
+                    tstart, tend, levstart, levend = varm1[0:4]
+                    if tstart is not None:
+                        # Collect unique (tstart, tend) tuples
+                        timemap[(tstart, tend)] = 1
+                    if levstart is not None:
+                        levmap[(levstart, levend)] = 1
+
+                # The partitions are shared by all variables of the varmap,
+                # and searched by bisection in expertPaths
+                if len(timemap) > 0:
+                    tpart = PartitionIndex(timemap)
+                else:
+                    tpart = None
+                if len(levmap) > 0:
+                    levpart = PartitionIndex(levmap)
+                else:
+                    levpart = None
+
                 for varname in varlist:
-                    timemap = {}
-                    levmap = {}
-                    fcmap = {}
-                    # The for loop was:
-                    # for tstart, tend, levstart, levend, path in varmap:
-                    # but now there _may_ be an additional item before path...
                     for varm1 in varmap:
                         tstart, tend, levstart, levend = varm1[0:4]
                         if (len(varm1) >= 6):
                             forecast = varm1[4]
                         else:
                             forecast = None
-                        path = varm1[-1]
                         self._filemap_[
-                            (varname, tstart, levstart, forecast)] = path
-                        if tstart is not None:
-                            # Collect unique (tstart, tend) tuples
-                            timemap[(tstart, tend)] = 1
-                        if levstart is not None:
-                            levmap[(levstart, levend)] = 1
-                        if forecast is not None:
-                            fcmap[(forecast, forecast)] = 1
-                    tkeys = list(timemap.keys())
-                    if len(tkeys) > 0:
-                        tkeys.sort()
-                        tpart = [list(x) for x in tkeys]
-                    else:
-                        tpart = None
-                    levkeys = list(levmap.keys())
-                    if len(levkeys) > 0:
-                        levkeys.sort()
-                        levpart = [list(x) for x in levkeys]
-                    else:
-                        levpart = None
-                    fckeys = list(fcmap.keys())
-                    if len(fckeys) > 0:
-                        fckeys.sort()
+                            (varname, tstart, levstart, forecast)] = varm1[-1]
                     if varname in self.variables:
                         self.variables[varname]._varpart_ = [tpart, levpart]
 
@@ -964,6 +1195,7 @@ class Dataset(CdmsObj, cuDataset):
         self.xlinks = {}
         self.parent = None
         self._status_ = 'closed'
+        self._closeFilePool()
 
 # Note: Removed to allow garbage collection of reference cycles
 # def __del__(self):
@@ -1104,10 +1336,98 @@ class Dataset(CdmsObj, cuDataset):
         result = sorted(list(pathdict.keys()))
         return result
 
+    def setFilePoolSize(self, value):
+        """Set the number of idle read-only file handles kept open.
+
+           Parameters
+           ----------
+           value : integer >= 0, 0 disables the pool.
+
+           Returns
+           -------
+           No return value.
+        """
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise CDMSError("Error file pool size must be an integer >= 0")
+        with self._filepoollock_:
+            self._filepoolsize_ = value
+            evicted = self._trimFilePool()
+        for f in evicted:
+            f.close()
+
+    def getFilePoolSize(self):
+        """Get the number of idle read-only file handles kept open."""
+        return self._filepoolsize_
+
+    def getFilePoolStats(self):
+        """Get the file pool counters.
+
+           Returns
+           -------
+           Dictionary with the number of 'hits' (an open handle was reused),
+           'misses' (the file was opened), 'evictions' and the current
+           number of idle handles 'size'.
+        """
+        with self._filepoollock_:
+            stats = dict(self._filepoolstats_)
+            stats['size'] = sum(len(x) for x in self._filepool_.values())
+        return stats
+
+    def _trimFilePool(self):
+        # Remove least recently used handles, the caller closes them
+        evicted = []
+        npool = sum(len(x) for x in self._filepool_.values())
+        while npool > self._filepoolsize_:
+            filename, handles = next(iter(self._filepool_.items()))
+            evicted.append(handles.pop(0))
+            if len(handles) == 0:
+                del self._filepool_[filename]
+            self._filepoolstats_['evictions'] += 1
+            npool -= 1
+        return evicted
+
+    def _releaseFile(self, filename, f):
+        with self._filepoollock_:
+            self._filepool_.setdefault(filename, []).append(f)
+            self._filepool_.move_to_end(filename)
+            evicted = self._trimFilePool()
+        for g in evicted:
+            g.close()
+
+    def _closeFilePool(self):
+        with self._filepoollock_:
+            self._filepoolsize_ = 0
+            evicted = self._trimFilePool()
+        for f in evicted:
+            f.close()
+
     # Open a data file associated with this dataset.
     # <filename> is relative to the self.datapath
     # <mode> is the open mode.
     def openFile(self, filename, mode):
+        """Open a data file of the dataset.
+
+        Read-only handles are taken from a pool of recently used files when
+        possible; closing the returned file puts it back in the pool.
+        """
+        if mode != 'r' or self._filepoolsize_ == 0:
+            return self._openFile(filename, mode)
+
+        with self._filepoollock_:
+            handles = self._filepool_.get(filename)
+            if handles:
+                f = handles.pop()
+                if len(handles) == 0:
+                    del self._filepool_[filename]
+                self._filepoolstats_['hits'] += 1
+            else:
+                f = None
+                self._filepoolstats_['misses'] += 1
+        if f is None:
+            f = self._openFile(filename, mode)
+        return _PooledFile(self, filename, f)
+
+    def _openFile(self, filename, mode):
 
         # Opened via a local XML file?
         if self.parent is None:
@@ -1331,137 +1651,222 @@ class CdmsFile(CdmsObj, cuDataset):
             coordsaux = self._convention_.getAxisAuxIds(
                 self._file_.variables, coords1d)
 
-            # Build variable list
-            for name in list(self._file_.variables.keys()):
-                if name not in coords1d:
-                    cdunifvar = self._file_.variables[name]
-                    if name in coordsaux:
-                        # Put auxiliary coordinate axes with variables, since there may be
-                        # a dimension with the same name.
-                        if len(cdunifvar.shape) == 2:
-                            self.variables[name] = FileAxis2D(
-                                self, name, cdunifvar)
-                        else:
-                            self.variables[name] = FileAuxAxis1D(
-                                self, name, cdunifvar)
-                    else:
-                        self.variables[name] = FileVariable(
-                            self, name, cdunifvar)
-
-            # Build axis list
-            for name in sorted(self._file_.dimensions.keys()):
-                if name in coords1d:
-                    cdunifvar = self._file_.variables[name]
-                elif name in coordsaux:
-                    cdunifvar = self._file_.variables[name]
-                else:
-                    cdunifvar = None
-                self.axes[name] = FileAxis(self, name, cdunifvar)
-            self.axes = OrderedDict(sorted(list(self.axes.items())))
+            if self._mode_ == 'r' and _lazyOpen:
+                self._initLazyDomains(coords1d, coordsaux)
+            else:
+                self._initDomains(coords1d, coordsaux)
+        except BaseException:
+            self.close()
+            raise
 
-            # Attach boundary variables
-            for name in coordsaux:
-                var = self.variables[name]
-                bounds = self._convention_.getVariableBounds(self, var)
-                var.setBounds(bounds)
+    def _newVariable(self, name):
+        cdunifvar = self._file_.variables[name]
+        if name in self._coordsaux_:
+            # Put auxiliary coordinate axes with variables, since there may be
+            # a dimension with the same name.
+            if len(cdunifvar.shape) == 2:
+                return FileAxis2D(self, name, cdunifvar)
+            else:
+                return FileAuxAxis1D(self, name, cdunifvar)
+        return FileVariable(self, name, cdunifvar)
 
-            self.dictdict = {
-                'variable': self.variables,
-                'axis': self.axes,
-                'rectGrid': self.grids,
-                'curveGrid': self.grids,
-                'genericGrid': self.grids}
+    def _newAxis(self, name):
+        if name in self._coords1d_ or name in self._coordsaux_:
+            cdunifvar = self._file_.variables[name]
+        else:
+            cdunifvar = None
+        return FileAxis(self, name, cdunifvar)
+
+    def _initDomains(self, coords1d, coordsaux):
+        "Build all variables, axes and grids of the file."
+        self._coords1d_ = coords1d
+        self._coordsaux_ = coordsaux
+
+        # Build variable list
+        for name in list(self._file_.variables.keys()):
+            if name not in coords1d:
+                self.variables[name] = self._newVariable(name)
+
+        # Build axis list
+        for name in sorted(self._file_.dimensions.keys()):
+            self.axes[name] = self._newAxis(name)
+        self.axes = OrderedDict(sorted(list(self.axes.items())))
+
+        # Attach boundary variables
+        for name in coordsaux:
+            var = self.variables[name]
+            bounds = self._convention_.getVariableBounds(self, var)
+            var.setBounds(bounds)
+
+        self.dictdict = {
+            'variable': self.variables,
+            'axis': self.axes,
+            'rectGrid': self.grids,
+            'curveGrid': self.grids,
+            'genericGrid': self.grids}
+
+        # Initialize variable domains
+        for var in list(self.variables.values()):
+            var.initDomain(self.axes)
 
-            # Initialize variable domains
-            for var in list(self.variables.values()):
-                var.initDomain(self.axes)
+        # Build grids
+        for var in list(self.variables.values()):
+            self._setVariableGrid(var, self.grids)
 
-            # Build grids
-            for var in list(self.variables.values()):
-                # Get grid information for the variable. gridkey has the form
-                # (latname,lonname,order,maskname, abstract_class).
-                gridkey, lat, lon = var.generateGridkey(
-                    self._convention_, self.variables)
+    def _initLazyDomains(self, coords1d, coordsaux):
+        """Set up the variables, axes and grids of the file to be built on
+        first access.
 
-                # If the variable is gridded, lookup the grid. If no such grid exists,
-                # create a unique gridname, create the grid, and add to the
-                # gridmap.
-                if gridkey is None:
-                    grid = None
-                else:
-                    grid = self._gridmap_.get(gridkey)
-                    if grid is None:
+        Grids sharing a shape are named in file variable order, as in
+        _initDomains: the grid of a variable is set once the grids of all
+        the variables before it are set.
+        """
+        self._coords1d_ = coords1d
+        self._coordsaux_ = coordsaux
+        varnames = [name for name in self._file_.variables.keys()
+                    if name not in coords1d]
+        self._lazyNames_ = varnames
+        self._lazyIndex_ = dict((name, i) for i, name in enumerate(varnames))
+        # Variables before _gridCursor_ have their grid, the ones up to
+        # _gridTarget_ are waiting for it
+        self._gridCursor_ = 0
+        self._gridTarget_ = -1
+        self._settingGrids_ = False
+        self.variables = _LazyMapping(varnames, self._newVariable,
+                                      finish=self._finishLazyVariable)
+        self.axes = _LazyMapping(sorted(self._file_.dimensions.keys()),
+                                 self._newAxis)
+        self.grids = _LazyMapping([], None, prepare=self._buildAllVariables)
+        self.dictdict = {
+            'variable': self.variables,
+            'axis': self.axes,
+            'rectGrid': self.grids,
+            'curveGrid': self.grids,
+            'genericGrid': self.grids}
+
+    def _finishLazyVariable(self, name, var):
+        # Same steps as _initDomains, for a single variable
+        if name in self._coordsaux_:
+            bounds = self._convention_.getVariableBounds(self, var)
+            var.setBounds(bounds)
+        var.initDomain(self.axes)
+        self._setLazyGrids(self._lazyIndex_[name])
 
-                        if hasattr(var, 'grid_type'):
-                            gridtype = var.grid_type
-                        else:
-                            gridtype = "generic"
+    def _setLazyGrids(self, index):
+        """Set the grids of the variables up to index, in file order.
 
-                        candidateBasename = None
-                        if gridkey[4] == 'rectGrid':
-                            gridshape = (len(lat), len(lon))
-                        elif gridkey[4] == 'curveGrid':
-                            gridshape = lat.shape
-                        elif gridkey[4] == 'genericGrid':
-                            gridshape = lat.shape
-                            candidateBasename = 'grid_%d' % gridshape
-                        else:
-                            gridshape = (len(lat), len(lon))
+        Building a variable while grids are set (e.g. a grid mask variable)
+        only extends the range, so the order never changes.
+        """
+        self._gridTarget_ = max(self._gridTarget_, index)
+        if self._settingGrids_:
+            return
+        self._settingGrids_ = True
+        try:
+            while self._gridCursor_ <= self._gridTarget_:
+                name = self._lazyNames_[self._gridCursor_]
+                try:
+                    var = self.variables[name]
+                    self._setVariableGrid(var, self.grids.data)
+                except BaseException:
+                    self.variables.reset(name)
+                    self._gridTarget_ = self._gridCursor_ - 1
+                    raise
+                self._gridCursor_ += 1
+        finally:
+            self._settingGrids_ = False
+
+    def _buildAllVariables(self):
+        for name in self.variables:
+            self.variables[name]
+
+    def _setVariableGrid(self, var, grids):
+        """Lookup or create the grid of a variable, and set it.
+
+        grids is the dictionary of grids of the file, new grids are added
+        to it.
+        """
+        # Get grid information for the variable. gridkey has the form
+        # (latname,lonname,order,maskname, abstract_class).
+        gridkey, lat, lon = var.generateGridkey(
+            self._convention_, self.variables)
+
+        # If the variable is gridded, lookup the grid. If no such grid exists,
+        # create a unique gridname, create the grid, and add to the
+        # gridmap.
+        if gridkey is None:
+            grid = None
+        else:
+            grid = self._gridmap_.get(gridkey)
+            if grid is None:
 
-                        if candidateBasename is None:
-                            candidateBasename = 'grid_%dx%d' % gridshape
-                        if candidateBasename not in self.grids:
-                            gridname = candidateBasename
-                        else:
-                            foundname = 0
-                            for i in range(97, 123):  # Lower-case letters
-                                candidateName = candidateBasename + \
-                                    '_' + chr(i)
-                                if candidateName not in self.grids:
-                                    gridname = candidateName
-                                    foundname = 1
-                                    break
+                if hasattr(var, 'grid_type'):
+                    gridtype = var.grid_type
+                else:
+                    gridtype = "generic"
+
+                candidateBasename = None
+                if gridkey[4] == 'rectGrid':
+                    gridshape = (len(lat), len(lon))
+                elif gridkey[4] == 'curveGrid':
+                    gridshape = lat.shape
+                elif gridkey[4] == 'genericGrid':
+                    gridshape = lat.shape
+                    candidateBasename = 'grid_%d' % gridshape
+                else:
+                    gridshape = (len(lat), len(lon))
 
-                            if not foundname:
-                                print(
-                                    'Warning: cannot generate a grid for variable', var.id)
-                                continue
+                if candidateBasename is None:
+                    candidateBasename = 'grid_%dx%d' % gridshape
+                if candidateBasename not in grids:
+                    gridname = candidateBasename
+                else:
+                    foundname = 0
+                    for i in range(97, 123):  # Lower-case letters
+                        candidateName = candidateBasename + \
+                            '_' + chr(i)
+                        if candidateName not in grids:
+                            gridname = candidateName
+                            foundname = 1
+                            break
 
-                        # Create the grid
-                        if gridkey[4] == 'rectGrid':
-                            grid = FileRectGrid(
-                                self, gridname, lat, lon, gridkey[2], gridtype)
+                    if not foundname:
+                        print(
+                            'Warning: cannot generate a grid for variable', var.id)
+                        return
+
+                # Create the grid
+                if gridkey[4] == 'rectGrid':
+                    grid = FileRectGrid(
+                        self, gridname, lat, lon, gridkey[2], gridtype)
+                else:
+                    if gridkey[3] != '':
+                        if gridkey[3] in self.variables:
+                            maskvar = self.variables[gridkey[3]]
                         else:
-                            if gridkey[3] != '':
-                                if gridkey[3] in self.variables:
-                                    maskvar = self.variables[gridkey[3]]
-                                else:
-                                    print(
-                                        'Warning: mask variable %s not found' %
-                                        gridkey[3])
-                                    maskvar = None
-                            else:
-                                maskvar = None
-                            if gridkey[4] == 'curveGrid':
-                                grid = FileCurveGrid(
-                                    lat, lon, gridname, parent=self, maskvar=maskvar)
-                            else:
-                                try:
-                                    grid = FileGenericGrid(
-                                        lat, lon, gridname, parent=self, maskvar=maskvar)
-                                except BaseException:
-                                    if(lat.rank() == 1 and lon.rank() == 1):
-                                        grid = FileRectGrid(
-                                            self, gridname, lat, lon, gridkey[2], gridtype)
+                            print(
+                                'Warning: mask variable %s not found' %
+                                gridkey[3])
+                            maskvar = None
+                    else:
+                        maskvar = None
+                    if gridkey[4] == 'curveGrid':
+                        grid = FileCurveGrid(
+                            lat, lon, gridname, parent=self, maskvar=maskvar)
+                    else:
+                        try:
+                            grid = FileGenericGrid(
+                                lat, lon, gridname, parent=self, maskvar=maskvar)
+                        except BaseException:
+                            if(lat.rank() == 1 and lon.rank() == 1):
+                                grid = FileRectGrid(
+                                    self, gridname, lat, lon, gridkey[2], gridtype)
 
-                        self.grids[grid.id] = grid
-                        self._gridmap_[gridkey] = grid
+                grids[grid.id] = grid
+                self._gridmap_[gridkey] = grid
 
-                # Set the variable grid
-                var.setGrid(grid)
-        except BaseException:
-            self.close()
-            raise
+        # Set the variable grid
+        var.setGrid(grid)
 
     def __enter__(self):
         return self
@@ -1518,7 +1923,12 @@ class CdmsFile(CdmsObj, cuDataset):
             return
         if hasattr(self, 'dictdict'):
             for dict in list(self.dictdict.values()):
-                for obj in list(dict.values()):
+                if isinstance(dict, _LazyMapping):
+                    # Don't build objects just to close them
+                    values = dict.builtValues()
+                else:
+                    values = list(dict.values())
+                for obj in values:
                     obj.parent = None
                     del obj
         self.dictdict = self.variables = self.axes = {}
@@ -2,6 +2,7 @@
 # Further modified to be pure new numpy June 24th 2008
 
 "CDMS File-based variables."
+import itertools
 import numpy
 from .cdmsobj import Max32int
 from .variable import DatasetVariable
@@ -13,6 +14,55 @@ from .Cdunif import CdunifError
 FileClosed = "Cannot read from closed file, variable: "
 FileClosedWrite = "Cannot write to a closed file, variable: "
 
+# Default is to pass slices unchanged to Cdunif until
+# setChunkedReadFlag(1) is called
+_chunkedReads = False
+
+
+def setChunkedReadFlag(value):
+    """Enable or disable chunk aligned reads of strided slices.
+
+       When set, strided reads of chunked (netCDF-4) variables are split
+       into one contiguous read per chunk, so that every chunk is
+       decompressed at most once per call.
+
+       Parameters
+       ----------
+       value : 0/1, False/True
+
+       Returns
+       -------
+       No return value.
+    """
+    global _chunkedReads
+    if value not in [True, False, 0, 1]:
+        raise CDMSError(
+            "Error chunked read flag must be 1/0 or true/False")
+    _chunkedReads = bool(value)
+
+
+def getChunkedReadFlag():
+    """Get the chunk aligned read flag.
+
+       Returns
+       -------
+       True if strided reads are aligned with the file chunks.
+    """
+    return _chunkedReads
+
+
+def _chunkGroups(s, chunk):
+    """Split the positive stride slice s into (start, stop, count) reads
+    that each stay within one chunk."""
+    groups = []
+    i = s.start
+    while i < s.stop:
+        end = min(s.stop, (i // chunk + 1) * chunk)
+        count = (end - 1 - i) // s.step + 1
+        groups.append((i, i + (count - 1) * s.step + 1, count))
+        i += count * s.step
+    return groups
+
 
 class FileVariable(DatasetVariable):
     "A variable in a single file."
@@ -95,7 +145,12 @@ class FileVariable(DatasetVariable):
             raise CDMSError(FileClosed + self.id)
         if self.rank() == 0:
             return self._obj_.getValue()
-        result = self._obj_.getitem(*slist)
+        if _chunkedReads:
+            result = self._chunkedRead(slist)
+        else:
+            result = None
+        if result is None:
+            result = self._obj_.getitem(*slist)
 
         # If slices with negative strides were input, apply the appropriate
         # reversals.
@@ -104,6 +159,108 @@ class FileVariable(DatasetVariable):
 
         return result
 
+    def _chunkedRead(self, slist):
+        """Read strided slices one chunk at a time.
+
+        Returns None if the request does not benefit from it: the variable
+        is not chunked or no slice has a stride.
+        """
+        shape = self.shape
+        slist = [slice(*s.indices(n)) for s, n in zip(slist, shape)]
+        if all(s.step == 1 for s in slist):
+            return None
+        chunks = self.getChunks()
+        if chunks is None:
+            return None
+        if any(s.start >= s.stop for s in slist):
+            return None
+
+        # Contiguous slices are read in one go, strided ones per chunk
+        groups = []
+        for s, chunk in zip(slist, chunks):
+            if s.step == 1:
+                groups.append([(s.start, s.stop, s.stop - s.start)])
+            else:
+                groups.append(_chunkGroups(s, chunk))
+
+        resultshape = tuple(sum(g[2] for g in dimgroups) for dimgroups in groups)
+        steps = tuple(slice(None, None, s.step) for s in slist)
+        result = None
+        for block in itertools.product(*[self._offsetGroups(g) for g in groups]):
+            data = self._obj_.getitem(*[slice(b[0], b[1]) for b in block])
+            if result is None:
+                result = numpy.empty(resultshape, dtype=data.dtype)
+            result[tuple(slice(b[2], b[2] + b[3]) for b in block)] = data[steps]
+        return result
+
+    @staticmethod
+    def _offsetGroups(groups):
+        # (start, stop, count) -> (start, stop, result offset, count)
+        offset = 0
+        result = []
+        for start, stop, count in groups:
+            result.append((start, stop, offset, count))
+            offset += count
+        return result
+
+    def getChunks(self):
+        """Get the chunk shape of the variable in the file.
+
+        Returns
+        -------
+        Tuple of chunk lengths, one per dimension, or None if the variable
+        is not chunked (netCDF-3 file, contiguous storage, other format).
+        """
+        if self.parent is None:
+            raise CDMSError(FileClosed + self.id)
+        if not hasattr(self._obj_, 'chunking'):
+            return None
+        return self._obj_.chunking()
+
+    def getChunkCache(self):
+        """Get the chunk cache parameters of the variable.
+
+        Returns
+        -------
+        (size in bytes, number of chunk slots, preemption) or None if the
+        variable has no chunk cache.
+        """
+        if self.parent is None:
+            raise CDMSError(FileClosed + self.id)
+        if not hasattr(self._obj_, 'getchunkcache'):
+            return None
+        return self._obj_.getchunkcache()
+
+    def setChunkCache(self, size, nelems=None, preemption=None):
+        """Set the chunk cache of the variable.
+
+        A cache large enough to hold the chunks crossed by one row of the
+        requests avoids decompressing the same chunk several times, for
+        example when reading time series point by point.
+
+        Parameters
+        ----------
+        size : cache size in bytes
+        nelems : Optional number of chunk slots, unchanged if None
+        preemption : Optional value between 0 and 1, unchanged if None
+
+        Returns
+        -------
+        No return value.
+        """
+        if self.parent is None:
+            raise CDMSError(FileClosed + self.id)
+        if not hasattr(self._obj_, 'setchunkcache'):
+            return
+        if nelems is None:
+            nelems = -1
+        if preemption is None:
+            preemption = -1.
+        try:
+            self._obj_.setchunkcache(int(size), int(nelems), float(preemption))
+        except (ValueError, CdunifError) as err:
+            raise CDMSError("Setting chunk cache of %s: %s" % (self.id, err))
+
     def __setitem__(self, index, value):
         if self.parent is None:
             raise CDMSError(FileClosedWrite + self.id)
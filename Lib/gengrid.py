@@ -200,9 +200,8 @@ class AbstractGenericGrid(AbstractHorizontalGrid):
     def getIndex(self):
         """Get the grid index"""
         if self._index_ is None:
-            latlin = numpy.ma.filled(self._lataxis_)
-            lonlin = numpy.ma.filled(self._lonaxis_)
-            self._index_ = bindex.bindexHorizontalGrid(latlin, lonlin)
+            self._index_ = bindex.getBinIndex(self._lataxis_[:],
+                                              self._lonaxis_[:])
 
         return self._index_
 
@@ -222,30 +221,18 @@ class AbstractGenericGrid(AbstractHorizontalGrid):
        variable with the given grid.
         """
 
-        ncell = self.shape
         index = self.getIndex()
         latspec = spec[CoordTypeToLoc[LatitudeType]]
         lonspec = spec[CoordTypeToLoc[LongitudeType]]
-        latlin = numpy.ma.filled(self._lataxis_)
-        lonlin = numpy.ma.filled(self._lonaxis_)
-        lonlin = numpy.ma.where(
-            numpy.ma.greater_equal(
-                lonlin,
-                360.0),
-            lonlin - 360.0,
-            lonlin)
-        points = bindex.intersectHorizontalGrid(
-            latspec, lonspec, latlin, lonlin, index)
+        points = index.intersect(latspec, lonspec)
         if len(points) == 0:
             raise CDMSError(
                 'No data in the specified region, longitude=%s, latitude=%s' %
                 (repr(lonspec), repr(latspec)))
 
-        fullmask = numpy.ones(ncell)
-        numpy.put(fullmask, points, 0)
-
-        imin, imax = (min(points), max(points) + 1)
-        submask = fullmask[imin:imax]
+        imin, imax = (points[0], points[-1] + 1)
+        submask = numpy.ones(imax - imin)
+        submask[points - imin] = 0
 
         cellid = self.getAxis(0).id
         indexspecs = {cellid: slice(imin, imax)}
@@ -11,10 +11,9 @@ import os.path
 # import PropertiedClasses
 from .error import CDMSError
 from .grid import AbstractGrid, LongitudeType, LatitudeType, CoordTypeToLoc
-from .axis import TransientVirtualAxis
+from .axis import TransientVirtualAxis, TransientAxis
 from .axis import getAutoBounds, allclose
 from cdms2 import bindex
-from cdms2 import _bindex
 from functools import reduce
 import copy
 
@@ -702,16 +701,8 @@ class AbstractCurveGrid(AbstractHorizontalGrid):
     def getIndex(self):
         """Get the grid index"""
         if self._index_ is None:
-            # Trying to stick in Stephane Raynaud's patch for autodetection
-            nj, ni = self._lataxis_.shape
-            dlon = numpy.max(self._lonaxis_[:]) - numpy.min(self._lonaxis_[:])
-            dx = max(dlon / ni, dlon / nj)
-            dlat = numpy.max(self._lataxis_[:]) - numpy.min(self._lataxis_[:])
-            dy = max(dlat / ni, dlat / nj)
-            latlin = numpy.ravel(numpy.ma.filled(self._lataxis_[:]))
-            lonlin = numpy.ravel(numpy.ma.filled(self._lonaxis_[:]))
-            _bindex.setDeltas(dx, dy)
-            self._index_ = bindex.bindexHorizontalGrid(latlin, lonlin)
+            self._index_ = bindex.getBinIndex(self._lataxis_[:],
+                                              self._lonaxis_[:])
 
         return self._index_
 
@@ -737,24 +728,17 @@ class AbstractCurveGrid(AbstractHorizontalGrid):
         index = self.getIndex()
         latspec = spec[CoordTypeToLoc[LatitudeType]]
         lonspec = spec[CoordTypeToLoc[LongitudeType]]
-        latlin = numpy.ravel(numpy.ma.filled(self._lataxis_[:]))
-        lonlin = numpy.ravel(numpy.ma.filled(self._lonaxis_[:]))
-        points = bindex.intersectHorizontalGrid(
-            latspec, lonspec, latlin, lonlin, index)
+        points = index.intersect(latspec, lonspec)
         if len(points) == 0:
             raise CDMSError(
                 'No data in the specified region, longitude=%s, latitude=%s' %
                 (repr(lonspec), repr(latspec)))
 
-        fullmask = numpy.ones(ni * nj)
-        numpy.put(fullmask, points, 0)
-        fullmask = numpy.reshape(fullmask, (ni, nj))
-
-        iind = points // nj
-        jind = points - iind * nj
+        iind, jind = numpy.divmod(points, nj)
         imin, imax, jmin, jmax = (
-            min(iind), max(iind) + 1, min(jind), max(jind) + 1)
-        submask = fullmask[imin:imax, jmin:jmax]
+            iind.min(), iind.max() + 1, jind.min(), jind.max() + 1)
+        submask = numpy.ones((imax - imin, jmax - jmin))
+        submask[iind - imin, jind - jmin] = 0
 
         yid = self.getAxis(0).id
         xid = self.getAxis(1).id
@@ -795,8 +779,12 @@ class AbstractCurveGrid(AbstractHorizontalGrid):
 
         1 iff every element of self.getAxisList() is in the list 'axes'."""
         for item in self.getAxisList():
+            # axes sharing their values with item are not compared
+            if any(axis is item or (isinstance(axis, TransientAxis) and axis.sharesValues(item))
+                   for axis in axes):
+                continue
             # if all [False, False, ....] result=0
-            if not any([allclose(item[:], axis[:]) for axis in axes]):
+            if not any([len(item) == len(axis) and allclose(item[:], axis[:]) for axis in axes]):
                 result = 0
                 break
         else:
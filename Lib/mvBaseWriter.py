@@ -8,9 +8,58 @@ Abstract class for writing data into file
 
 """
 
+import numpy
 from . import mvSphereMesh
 
 
+def writeVTKHeader(f, title, binary, datasetType):
+    """
+    Write the header of a legacy VTK file
+
+    Parameters
+    ----------
+
+         f file opened in binary mode
+
+         title title line
+
+         binary True for BINARY, False for ASCII data
+
+         datasetType e.g. 'STRUCTURED_GRID'
+    """
+    f.write(('# vtk DataFile Version 2.0\n%s\n%s\nDATASET %s\n' %
+             (title, binary and 'BINARY' or 'ASCII', datasetType)).encode())
+
+
+def writeVTKArray(f, header, data, dtype, ncols=1, binary=True):
+    """
+    Write a section of a legacy VTK file in one block
+
+    Parameters
+    ----------
+
+         f file opened in binary mode
+
+         header section header line, e.g. 'POINTS 10 float'
+
+         data array of values, written in C order
+
+         dtype 'f' (float) or 'i' (int)
+
+         ncols number of values per line in ASCII mode
+
+         binary True for big endian binary, False for ASCII data
+    """
+    f.write((header + '\n').encode())
+    if binary:
+        # legacy VTK binary data are big endian
+        f.write(numpy.ascontiguousarray(data, '>' + dtype + '4').tobytes())
+        f.write(b'\n')
+    else:
+        fmt = dtype == 'f' and '%f' or '%d'
+        numpy.savetxt(f, numpy.reshape(data, (-1, ncols)), fmt=fmt)
+
+
 class BaseWriter:
     """
     Constructor
@@ -45,6 +94,7 @@ class BaseWriter:
         self.var = var
         sphere_mesh = mvSphereMesh.SphereMesh(var, maxElev)
 
+        self.meshShape = sphere_mesh.shape
         self.shape = sphere_mesh.shape
         # there is currently a bug in vizSchema which causes
         # visit to crash if the leading index is 1, this is
@@ -54,6 +104,18 @@ class BaseWriter:
 
         self.mesh = sphere_mesh.getXYZCoords(sphereRadius)
 
+    def setVariable(self, var):
+        """
+        Set the data to write, keeping the mesh. Used to write time series
+        one step at a time.
+
+        Parameters
+        ----------
+
+             var a cdms2 variable on the same grid as the original one
+        """
+        self.var = var
+
     def write(self, filename):
         """
         Write data to file. This method is overloaded.
@@ -67,34 +67,52 @@ class SphereMesh:
 
         while len(self.shape) < 3:
             self.shape = [1, ] + list(self.shape)
+        self.shape = list(self.shape)
 
-        # store lon, lat, elv as a curvilinear grid
+        # rectilinear coordinates are kept as axes and only expanded
+        # to the full mesh on demand
         if self.isRectilinear:
-            # apply tensore product of axes to generat curvilinear coordinates
-            if not isinstance(elvs, type(None)):
-                self.elvs = numpy.outer(numpy.outer(numpy.ones(self.shape[:0], numpy.float32), elvs),
-                                        numpy.ones(self.shape[0 + 1:], numpy.float32)).reshape(self.shape)
-            else:
-                self.elvs = numpy.zeros(self.shape, numpy.float32)
-            self.lats = numpy.outer(numpy.outer(numpy.ones(self.shape[:1], numpy.float32), lats),
-                                    numpy.ones(self.shape[1 + 1:], numpy.float32)).reshape(self.shape)
-            self.lons = numpy.outer(numpy.outer(numpy.ones(self.shape[:2], numpy.float32), lons),
-                                    numpy.ones(self.shape[2 + 1:], numpy.float32)).reshape(self.shape)
+            self._axes = [numpy.zeros((1,)) if axis is None else
+                          numpy.asarray(axis[:], numpy.float64)
+                          for axis in (elvs, lats, lons)]
+            self._lons = self._lats = self._elvs = None
 
         else:
             # already in curvilinear form
-            self.lons = lons[:]
-            self.lats = lats[:]
+            sz = reduce(lambda x, y: x * y, self.shape)
+            self._lons = numpy.reshape(lons[:], (sz,))
+            self._lats = numpy.reshape(lats[:], (sz,))
             if not isinstance(elvs, type(None)):
-                self.elvs = elvs[:]
+                self._elvs = numpy.reshape(elvs[:], (sz,))
             else:
-                self.elvs = numpy.zeros(self.shape, numpy.float32)
+                self._elvs = numpy.zeros((sz,), numpy.float32)
 
-        # reshape as flat arrays
-        sz = reduce(lambda x, y: x * y, self.shape)
-        self.lons = numpy.reshape(self.lons, (sz,))
-        self.lats = numpy.reshape(self.lats, (sz,))
-        self.elvs = numpy.reshape(self.elvs, (sz,))
+    def _getCoords(self, index):
+        """
+        Flat elv (0), lat (1) or lon (2) coordinates of the mesh points
+        """
+        axis = self._axes[index]
+        shape = [1, 1, 1]
+        shape[index] = len(axis)
+        return numpy.broadcast_to(axis.reshape(shape), self.shape).ravel()
+
+    @property
+    def lons(self):
+        if self._lons is None:
+            self._lons = self._getCoords(2)
+        return self._lons
+
+    @property
+    def lats(self):
+        if self._lats is None:
+            self._lats = self._getCoords(1)
+        return self._lats
+
+    @property
+    def elvs(self):
+        if self._elvs is None:
+            self._elvs = self._getCoords(0)
+        return self._elvs
 
     def getXYZCoords(self, sphereRadius=1.0):
         """
@@ -112,23 +130,36 @@ class SphereMesh:
              mesh
         """
         sz = reduce(lambda x, y: x * y, self.shape)
-        rr = sphereRadius * (1.0 + self.elvs)
+        if self.isRectilinear:
+            # broadcast the axes, the trigonometric functions are only
+            # evaluated along each axis
+            elvs = self._axes[0].reshape((-1, 1, 1))
+            lats = self._axes[1].reshape((1, -1, 1)) * (numpy.pi / 180.)
+            lons = self._axes[2].reshape((1, 1, -1)) * (numpy.pi / 180.)
+        else:
+            elvs = self.elvs
+            lats = self.lats * (numpy.pi / 180.)
+            lons = self.lons * (numpy.pi / 180.)
+
         diffElv = self.maxElv - self.minElv
-        rr = sphereRadius * numpy.ones(self.lons.shape, numpy.float32)
+        rr = sphereRadius * numpy.ones(elvs.shape, numpy.float32)
         if diffElv != 0:
             coeff = sphereRadius * self.sphereThickness / diffElv
             if self.elvPositiveDown:
                 # depth
-                rr += coeff * (self.maxElv - self.elvs)
+                rr += coeff * (self.maxElv - elvs)
             else:
                 # height
-                rr += coeff * (self.elvs - self.minElv)
+                rr += coeff * (elvs - self.minElv)
 
         mesh = numpy.zeros((sz, 3), numpy.float32)
-        cosLats = numpy.cos(self.lats * numpy.pi / 180.)
-        mesh[:, 0] = rr * numpy.cos(self.lons * numpy.pi / 180.) * cosLats
-        mesh[:, 1] = rr * numpy.sin(self.lons * numpy.pi / 180.) * cosLats
-        mesh[:, 2] = rr * numpy.sin(self.lats * numpy.pi / 180.)
+        xyz = mesh
+        if self.isRectilinear:
+            xyz = mesh.reshape(self.shape + [3, ])
+        cosLats = numpy.cos(lats)
+        xyz[..., 0] = rr * numpy.cos(lons) * cosLats
+        xyz[..., 1] = rr * numpy.sin(lons) * cosLats
+        xyz[..., 2] = rr * numpy.sin(lats)
         return mesh
 
 #####################################################################
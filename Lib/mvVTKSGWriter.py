@@ -7,7 +7,6 @@ Write data to VTK file format using the structured grid format
 
 """
 
-from __future__ import print_function
 import numpy
 import time
 from . import mvBaseWriter
@@ -26,36 +25,32 @@ class VTKSGWriter(mvBaseWriter.BaseWriter):
           _: None
     """
 
-    def write(self, filename):
+    def write(self, filename, binary=True):
         """
+        Write the mesh and the data
 
+        Parameters
+        ----------
+
+             filename file name
+
+             binary write BINARY (default) or ASCII data
         """
-        f = open(filename, 'w')
-        print('# vtk DataFile Version 2.0', file=f)
-        print('generated on %s' % time.asctime(), file=f)
-        print('ASCII', file=f)
-        print('DATASET STRUCTURED_GRID', file=f)
-        shp = self.shape[:]
+        f = open(filename, 'wb')
+        mvBaseWriter.writeVTKHeader(f, 'generated on %s' % time.asctime(),
+                                    binary, 'STRUCTURED_GRID')
+        shp = self.meshShape[:]
         shp.reverse()
-        print('DIMENSIONS %d %d %d' % tuple(shp), file=f)
+        f.write(('DIMENSIONS %d %d %d\n' % tuple(shp)).encode())
         npts = self.mesh.shape[0]
-        print('POINTS %d float' % npts, file=f)
-        for i in range(npts):
-            print('%f %f %f' % tuple(self.mesh[i, :]), file=f)
-        n0, n1, n2 = self.shape
-        # nodal data
-        print('POINT_DATA %d' % (n0 * n1 * n2), file=f)
-        print('SCALARS %s float' % (self.var.id), file=f)
-        print('LOOKUP_TABLE default', file=f)
-        if n0 > 1:
-            for k in range(n0):
-                for j in range(n1):
-                    for i in range(n2):
-                        print('%f' % self.var[k, j, i], file=f)
-        else:
-            for j in range(n1):
-                for i in range(n2):
-                    print('%f' % self.var[j, i], file=f)
+        mvBaseWriter.writeVTKArray(f, 'POINTS %d float' % npts, self.mesh,
+                                   'f', 3, binary)
+        # nodal data, masked values are written as NaN
+        data = numpy.ma.filled(numpy.ma.asarray(self.var, numpy.float32),
+                               numpy.nan)
+        f.write(('POINT_DATA %d\n' % npts).encode())
+        mvBaseWriter.writeVTKArray(f, 'SCALARS %s float\nLOOKUP_TABLE default'
+                                   % (self.var.id), data, 'f', 1, binary)
         f.close()
 
 
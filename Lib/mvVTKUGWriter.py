@@ -7,7 +7,6 @@ Write data to VTK file format using the unstructured grid format
 
 """
 
-from __future__ import print_function
 import numpy
 import time
 from . import mvBaseWriter
@@ -27,66 +26,52 @@ class VTKUGWriter(mvBaseWriter.BaseWriter):
 
     """
 
-    def write(self, filename):
+    def write(self, filename, binary=True):
         """
+        Write the mesh and the data
 
+        Parameters
+        ----------
+
+             filename file name
+
+             binary write BINARY (default) or ASCII data
         """
-        f = open(filename, 'w')
-        print('# vtk DataFile Version 2.0', file=f)
-        print('generated on %s' % time.asctime(), file=f)
-        print('ASCII', file=f)
-        print('DATASET UNSTRUCTURED_GRID', file=f)
+        f = open(filename, 'wb')
+        mvBaseWriter.writeVTKHeader(f, 'generated on %s' % time.asctime(),
+                                    binary, 'UNSTRUCTURED_GRID')
         npts = self.mesh.shape[0]
-        print('POINTS %d float' % npts, file=f)
-        for i in range(npts):
-            print('%f %f %f' % tuple(self.mesh[i, :]), file=f)
-        n0, n1, n2 = self.shape
-        ncells = (n0 - 1) * (n1 - 1) * (n2 - 1)
-        if ncells != 0:
-            # 3d
-            ntot = ncells * (8 + 1)
-            print('CELLS %d %d' % (ncells, ntot), file=f)
-            for k in range(n0 - 1):
-                for j in range(n1 - 1):
-                    for i in range(n2 - 1):
-                        index = i + n2 * (j + n1 * k)
-                        print('8 %d %d %d %d %d %d %d %d' %
-                              (index, index + 1, index + 1 + n2, index + n2,
-                               index + n1 * n2, index + n1 * n2 + 1,
-                               index + n1 * n2 + 1 + n2, index + n1 * n2 + n2), file=f)
-            print('CELL_TYPES %d' % ncells, file=f)
-            for i in range(ncells):
-                # hexahedron
-                print(12, file=f)
-            # nodal data
-            print('POINT_DATA %d' % (n0 * n1 * n2), file=f)
-            print('SCALARS %s float' % (self.var.id), file=f)
-            print('LOOKUP_TABLE default', file=f)
-            for k in range(n0):
-                for j in range(n1):
-                    for i in range(n2):
-                        print('%f' % self.var[k, j, i], file=f)
+        mvBaseWriter.writeVTKArray(f, 'POINTS %d float' % npts, self.mesh,
+                                   'f', 3, binary)
+        n0, n1, n2 = self.meshShape
+        index = numpy.arange(npts, dtype=numpy.int32).reshape((n0, n1, n2))
+        if (n0 - 1) * (n1 - 1) * (n2 - 1) != 0:
+            # 3d, hexahedra
+            index = index[:-1, :-1, :-1]
+            corners = [0, 1, 1 + n2, n2]
+            corners += [c + n1 * n2 for c in corners]
+            cellType = 12
         else:
-            # 2d
-            ncells = (n1 - 1) * (n2 - 1)
-            ntot = ncells * (4 + 1)
-            print('CELLS %d %d' % (ncells, ntot), file=f)
-            for j in range(n1 - 1):
-                for i in range(n2 - 1):
-                    index = i + n2 * j
-                    print('4 %d %d %d %d' %
-                          (index, index + 1, index + 1 + n2, index + n2), file=f)
-            print('CELL_TYPES %d' % ncells, file=f)
-            for i in range(ncells):
-                # quad
-                print(9, file=f)
-            # nodal data
-            print('POINT_DATA %d' % (n0 * n1 * n2), file=f)
-            print('SCALARS %s float' % (self.var.id), file=f)
-            print('LOOKUP_TABLE default', file=f)
-            for j in range(n1):
-                for i in range(n2):
-                    print('%f' % self.var[j, i], file=f)
+            # 2d, quads
+            index = index[0, :-1, :-1]
+            corners = [0, 1, 1 + n2, n2]
+            cellType = 9
+        ncells = index.size
+        cells = numpy.empty((ncells, len(corners) + 1), numpy.int32)
+        cells[:, 0] = len(corners)
+        for k, c in enumerate(corners):
+            cells[:, k + 1] = index.ravel() + c
+        mvBaseWriter.writeVTKArray(f, 'CELLS %d %d' % (ncells, cells.size),
+                                   cells, 'i', cells.shape[1], binary)
+        mvBaseWriter.writeVTKArray(f, 'CELL_TYPES %d' % ncells,
+                                   numpy.full(ncells, cellType, numpy.int32),
+                                   'i', 1, binary)
+        # nodal data, masked values are written as NaN
+        data = numpy.ma.filled(numpy.ma.asarray(self.var, numpy.float32),
+                               numpy.nan)
+        f.write(('POINT_DATA %d\n' % npts).encode())
+        mvBaseWriter.writeVTKArray(f, 'SCALARS %s float\nLOOKUP_TABLE default'
+                                   % (self.var.id), data, 'f', 1, binary)
         f.close()
 
 
@@ -0,0 +1,319 @@
+"""
+Cache of regridding objects used by AbstractVariable.regrid
+
+Computing interpolation weights is by far the most expensive part of a
+regrid call, and the weights only depend on the source and destination
+grids and on the regridding options. Regridders are therefore stored in an
+in-process LRU cache keyed by a fingerprint of
+
+   - the source and destination grid coordinates, bounds, mask and order,
+   - the regridTool and regridMethod,
+   - the regridding keywords (periodicity, mkCyclic, coordSys, ...),
+   - the data type.
+
+Keywords whose values cannot be hashed, other than scalars and numeric
+arrays, disable the cache for that call.
+
+A regridder is shared by all the calls with the same key. ESMF and LibCF
+regridders keep per-call state, so they are used through useRegridder,
+which serializes the calls sharing a regridder.
+
+Regridders whose weights are plain arrays (regrid2.Horizontal) can also be
+stored on disk, see setRegridCacheDirectory. ESMF and LibCF regridders hold
+native handles and are only cached in memory.
+"""
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy
+from .error import CDMSError
+
+_regridCacheSize = 16
+_regridCacheDirectory = None
+_regridCache = OrderedDict()
+_regridCacheLock = threading.RLock()
+_regridCacheStats = {'hits': 0, 'diskHits': 0, 'misses': 0, 'evictions': 0}
+
+# Keywords which are passed through to the regridders but have no effect
+# on the weights.
+_ignoredKeywords = ['diag', 'missing', 'order', 'mask', 'rootPe']
+
+
+def setRegridCacheSize(value):
+    """Set the maximum number of regridders kept in memory.
+
+       Parameters
+       ----------
+       value : integer >= 0, 0 disables the in-memory cache.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _regridCacheSize
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise CDMSError("Error regrid cache size must be an integer >= 0")
+    with _regridCacheLock:
+        _regridCacheSize = value
+        _trim()
+
+
+def getRegridCacheSize():
+    """Get the maximum number of regridders kept in memory.
+
+       Returns
+       -------
+       Regrid cache size.
+    """
+    return _regridCacheSize
+
+
+def setRegridCacheDirectory(path):
+    """Set the directory where regridding weights are stored on disk.
+
+       Parameters
+       ----------
+       path : directory name, or None to disable the on-disk cache.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _regridCacheDirectory
+    if path is not None:
+        path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isdir(path):
+            os.makedirs(path)
+    _regridCacheDirectory = path
+
+
+def getRegridCacheDirectory():
+    """Get the directory where regridding weights are stored on disk.
+
+       Returns
+       -------
+       Directory name or None if the on-disk cache is disabled.
+    """
+    return _regridCacheDirectory
+
+
+def getRegridCacheStats():
+    """Get the regrid cache counters.
+
+       Returns
+       -------
+       Dictionary with the number of in-memory 'hits', on-disk 'diskHits',
+       'misses' (weights were computed), 'evictions' and the current 'size'.
+    """
+    with _regridCacheLock:
+        stats = dict(_regridCacheStats)
+        stats['size'] = len(_regridCache)
+    return stats
+
+
+def clearRegridCache(resetStats=True):
+    """Remove all regridders from the in-memory cache.
+
+       Parameters
+       ----------
+       resetStats : if True (default) also reset the counters.
+
+       Returns
+       -------
+       No return value.
+    """
+    with _regridCacheLock:
+        _regridCache.clear()
+        if resetStats:
+            for k in _regridCacheStats:
+                _regridCacheStats[k] = 0
+
+
+def _trim():
+    while len(_regridCache) > _regridCacheSize:
+        _regridCache.popitem(last=False)
+        _regridCacheStats['evictions'] += 1
+
+
+def _updateArray(h, ar):
+    if ar is None:
+        h.update(b'None')
+        return
+    mask = numpy.ma.getmask(ar)
+    ar = numpy.ascontiguousarray(numpy.ma.getdata(ar))
+    h.update(str((ar.dtype.str, ar.shape)).encode())
+    h.update(ar.tobytes())
+    if mask is not numpy.ma.nomask:
+        h.update(numpy.ascontiguousarray(mask).tobytes())
+
+
+def gridFingerprint(grid):
+    """Return a hex digest identifying a horizontal grid.
+
+    The digest covers the grid type, order, latitude and longitude
+    coordinates, bounds and mask.
+    """
+    h = hashlib.sha1()
+    h.update(grid.__class__.__name__.encode())
+    try:
+        h.update(str(grid.getOrder()).encode())
+    except Exception:
+        pass
+    for c in grid.getLatitude(), grid.getLongitude():
+        _updateArray(h, c[:])
+    try:
+        bounds = grid.getBounds()
+    except Exception:
+        bounds = None
+    if bounds is None:
+        bounds = (None, None)
+    for b in bounds:
+        _updateArray(h, b)
+    try:
+        mask = grid.getMask()
+    except Exception:
+        mask = None
+    _updateArray(h, mask)
+    return h.hexdigest()
+
+
+def regridKey(fromgrid, togrid, regridTool, regridMethod, dtype=None,
+              **keywords):
+    """Return the cache key of a regridding operation.
+
+    Parameters
+    ----------
+    fromgrid : source grid
+    togrid : destination grid
+    regridTool : regridding tool ('regrid2', 'esmf', 'libcf')
+    regridMethod : regridding method ('linear', 'conserve', 'patch')
+    dtype : Optional data type the weights are built for
+    **keywords : regridder options
+
+    Returns
+    -------
+    Hex digest string, or None if a keyword value cannot be hashed.
+    """
+    h = hashlib.sha1()
+    h.update(gridFingerprint(fromgrid).encode())
+    h.update(gridFingerprint(togrid).encode())
+    h.update(str(regridTool).lower().encode())
+    h.update(str(regridMethod).lower().encode())
+    if dtype is not None:
+        h.update(numpy.dtype(dtype).str.encode())
+    for k in sorted(keywords):
+        v = keywords[k]
+        if k in _ignoredKeywords:
+            continue
+        if isinstance(v, (bool, int, float, str, bytes)) or v is None:
+            h.update(repr((k, v)).encode())
+            continue
+        try:
+            ar = numpy.asarray(v)
+        except Exception:
+            return None
+        if ar.dtype.hasobject:
+            return None
+        h.update(repr(k).encode())
+        _updateArray(h, ar)
+    return h.hexdigest()
+
+
+def _diskPath(key):
+    return os.path.join(_regridCacheDirectory, "regrid_%s.npz" % key)
+
+
+def _diskLoad(key, load):
+    if _regridCacheDirectory is None or load is None:
+        return None
+    path = _diskPath(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with numpy.load(path) as f:
+            weights = dict((k, f[k]) for k in f.files)
+        return load(weights)
+    except Exception:
+        # A corrupted or stale file is simply recomputed
+        return None
+
+
+def _diskSave(key, regridder, save):
+    if _regridCacheDirectory is None or save is None:
+        return
+    fd, tmp = tempfile.mkstemp(dir=_regridCacheDirectory, suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            numpy.savez(f, **save(regridder))
+        os.replace(tmp, _diskPath(key))
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def getRegridder(key, build, save=None, load=None):
+    """Return the regridder cached under key, building it on a miss.
+
+    The regridder may be used by several threads at once, see useRegridder
+    for the regridders which are not reentrant.
+
+    Parameters
+    ----------
+    key : cache key, see regridKey, None bypasses the cache
+    build : callable returning a new regridder
+    save : Optional callable returning a dictionary of the regridder
+           weight arrays, enables the on-disk cache
+    load : Optional callable rebuilding a regridder from the dictionary
+           returned by save
+
+    Returns
+    -------
+    regridder
+    """
+    return _getEntry(key, build, save, load)[0]
+
+
+@contextmanager
+def useRegridder(key, build, save=None, load=None):
+    """Context manager giving exclusive use of the regridder cached under key.
+
+    Calls sharing a cached regridder wait for each other, the parameters
+    are the ones of getRegridder.
+    """
+    regridder, lock = _getEntry(key, build, save, load)
+    with lock:
+        yield regridder
+
+
+def _getEntry(key, build, save, load):
+    if key is None:
+        regridder = build()
+        with _regridCacheLock:
+            _regridCacheStats['misses'] += 1
+        return regridder, threading.Lock()
+
+    with _regridCacheLock:
+        if key in _regridCache:
+            _regridCache.move_to_end(key)
+            _regridCacheStats['hits'] += 1
+            return _regridCache[key]
+
+    regridder = _diskLoad(key, load)
+    if regridder is not None:
+        with _regridCacheLock:
+            _regridCacheStats['diskHits'] += 1
+    else:
+        regridder = build()
+        with _regridCacheLock:
+            _regridCacheStats['misses'] += 1
+        _diskSave(key, regridder, save)
+
+    entry = (regridder, threading.Lock())
+    with _regridCacheLock:
+        if _regridCacheSize > 0:
+            _regridCache[key] = entry
+            _trim()
+    return entry
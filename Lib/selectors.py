@@ -1,12 +1,64 @@
 
 """Classes to support easy selection of climate data"""
 from __future__ import print_function
+import threading
+from collections import OrderedDict
+import numpy
 from .axis import axisMatches
 from .error import CDMSError
 from .grid import AbstractRectGrid, defaultRegion, setRegionSpecs, LongitudeType, LatitudeType, TimeType, VerticalType
 
 _debug = 0
 
+# Selections are compiled into one index slice per axis and read at once,
+# see Selector.plan. Plans of file variables are cached by selector
+# components and domain.
+_fuseSelection = 1
+_planCacheSize = 32
+_planCache = OrderedDict()
+_planCacheLock = threading.RLock()
+
+
+def setSelectorFusionFlag(value):
+    """Enable/Disable compiling selectors into a single read.
+
+       Parameters
+       ----------
+       value : 0/1, False/True. If 0, the components are applied round by
+               round with one subRegion call each.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _fuseSelection
+    if value not in [True, False, 0, 1]:
+        raise CDMSError("Error selector fusion flag must be 1/0 or true/False")
+    _fuseSelection = int(value)
+    if not _fuseSelection:
+        clearSelectorPlanCache()
+
+
+def getSelectorFusionFlag():
+    """Get the selector fusion flag.
+
+       Returns
+       -------
+       1 if selectors are compiled into a single read, 0 otherwise.
+    """
+    return _fuseSelection
+
+
+def clearSelectorPlanCache():
+    """Remove all compiled selections from the cache.
+
+       Returns
+       -------
+       No return value.
+    """
+    with _planCacheLock:
+        _planCache.clear()
+
 
 class SelectorError (CDMSError):
     "The exception type for errors in the selector packages"
@@ -139,9 +191,75 @@ class Selector:
                                    grid=grid,
                                    raw=raw)
 
+    def plan(self, variable):
+        """Compile this selector into index slices of variable.
+
+           The rounds of unmodified_select are simulated on the axes of
+           variable only: each round's specifications are mapped to index
+           slices, which are composed with those of the previous rounds.
+           The selection can then be read with a single subRegion call.
+
+           Returns
+           -------
+           (slices, mask, gridindices) where slices has one index slice per
+           axis of variable, mask is the grid mask of a curvilinear or
+           generic grid selection (or None) and gridindices are the
+           variable indices of the grid axes. Returns None if the selection
+           has to be made round by round, e.g. if a round wraps around a
+           circular axis or a component is not one of this module.
+        """
+        components = self.components()
+        for c in components:
+            if type(c) not in _plannedComponents:
+                return None
+        axes = variable.getAxisList()
+        vargrid = variable.getGrid()
+        if isinstance(vargrid, AbstractRectGrid):
+            vargrid = None
+
+        # Axes of transient variables may be modified in place, only cache
+        # the plans of file and dataset variables. The axis versions make
+        # plans stale when values or bounds are set in a writable file.
+        from .tvariable import TransientVariable
+        key = None
+        if not isinstance(variable, TransientVariable):
+            key = (tuple(id(c) for c in components),
+                   tuple((id(ax), len(ax), ax._getVersion()) for ax in axes),
+                   id(vargrid))
+            with _planCacheLock:
+                if key in _planCache:
+                    _planCache.move_to_end(key)
+                    return _planCache[key][1]
+
+        result = _compile(variable, axes, vargrid, components)
+
+        if key is not None:
+            with _planCacheLock:
+                # The keyed objects are kept alive so that their ids are not
+                # reused while the plan is cached.
+                _planCache[key] = ((components, axes, vargrid), result)
+                while len(_planCache) > _planCacheSize:
+                    _planCache.popitem(last=False)
+        return result
+
     def unmodified_select(self, variable, raw=0,
                           squeeze=0, order=None, grid=None):
         "Select using this selector without further modification"
+        if _fuseSelection:
+            plan = self.plan(variable)
+            if plan is not None:
+                slices, mask, gridindices = plan
+                if mask is None:
+                    return variable.subRegion(*slices, squeeze=squeeze,
+                                              order=order, grid=grid, raw=raw)
+                result = variable.subRegion(*slices)
+                result = result.setMaskFromGridMask(mask.copy(), gridindices)
+                if squeeze != 0 or order is not None or grid is not None or \
+                   raw != 0:
+                    return result.subRegion(squeeze=squeeze, order=order,
+                                            grid=grid, raw=raw)
+                return result
+
         result = variable
         components = self.components()
 
@@ -388,6 +506,111 @@ class positionalComponent (SelectorComponent):
         return s
 
 
+_plannedComponents = (SelectorComponent, axisComponent, coordinateComponent,
+                      requiredComponent, indexComponent, indexedComponent,
+                      positionalComponent)
+
+
+def _stop(r):
+    "Stop of the slice equivalent to range r"
+    if r.stop < 0:
+        return None
+    return r.stop
+
+
+def _narrow(axes, ranges, subaxes, specifications):
+    """Apply one round of specifications, as subRegion would on a variable
+       with axes subaxes. ranges are the indices of subaxes in axes.
+
+       Returns the new (ranges, subaxes), or None if the round wraps around
+       or selects nothing.
+    """
+    from .avariable import axesRegSpecs2slices, axesSpecs2slices
+    for item in specifications:
+        if item is None or item is Ellipsis:
+            return None
+    slicelist = axesRegSpecs2slices(subaxes, specifications)
+    circulardim = None
+    for i in range(len(subaxes)):
+        if subaxes[i].isCircular():
+            circulardim = i
+            start, stop = slicelist[i].start, slicelist[i].stop
+            length = len(subaxes[i])
+            if not ((start is None or 0 <= start < length) and
+                    (stop is None or 0 <= stop <= length)):
+                return None
+    if circulardim is not None:
+        slicelist = axesRegSpecs2slices(subaxes, specifications,
+                                        force=circulardim)
+    slicelist = axesSpecs2slices(subaxes, slicelist, force=1)
+
+    newranges = []
+    newaxes = []
+    for i in range(len(axes)):
+        r = ranges[i][slicelist[i]]
+        if len(r) == 0:
+            return None
+        if r == ranges[i]:
+            newaxes.append(subaxes[i])
+        else:
+            newaxes.append(axes[i].subaxis(r.start, _stop(r), r.step))
+        newranges.append(r)
+    return newranges, newaxes
+
+
+def _compile(variable, axes, vargrid, components):
+    "See Selector.plan"
+    ranges = [range(len(ax)) for ax in axes]
+    subaxes = list(axes)
+    mask = gridindices = None
+
+    # Non-rectilinear grids are first confined by the coordinate components.
+    if vargrid is not None:
+        specs = defaultRegion()
+        components = [c for c in components
+                      if c.specifyGrid(variable, vargrid, specs)]
+        if specs != defaultRegion():
+            gridindices = variable.getGridIndices()
+            mask, indexspecs = vargrid.intersect(specs)
+            specifications = [':'] * len(axes)
+            for k, v in indexspecs.items():
+                i = variable.getAxisIndex(k)
+                if i < 0 or k == 'time' or \
+                        k[0:3].lower() in ['lat', 'lon', 'lev', 'req']:
+                    return None
+                specifications[i] = v
+            origin = [specifications[i].start for i in gridindices]
+            narrowed = _narrow(axes, ranges, subaxes, specifications)
+            if narrowed is None:
+                return None
+            ranges, subaxes = narrowed
+
+    while components:
+        specifications = [':'] * len(axes)
+        confined_by = [None] * len(axes)
+        aux = {}
+        overflow = []
+        for c in components:
+            if c.specify(variable, subaxes, specifications, confined_by, aux):
+                overflow.append(c)
+        if not len(overflow) < len(components):
+            raise SelectorError(
+                'Internal selector error, infinite loop detected.')
+        narrowed = _narrow(axes, ranges, subaxes, specifications)
+        if narrowed is None:
+            return None
+        ranges, subaxes = narrowed
+        components = overflow
+
+    if mask is not None:
+        # The mask covers the intersection, take the selected part
+        index = [numpy.array(ranges[i]) - o
+                 for i, o in zip(gridindices, origin)]
+        mask = mask[numpy.ix_(*index)]
+    slices = [slice(r.start, _stop(r), r.step) for r in ranges]
+    return slices, mask, gridindices
+
+
 def longitude(*value):
     "Creates default selector corresponding to keyword longitude = value"
     if not value:
@@ -1,5 +1,7 @@
 from __future__ import print_function
 "Utilities for manipulating slices"
+from array import array
+from bisect import bisect_left, bisect_right
 
 # Intersect a slice with a half-open interval [i,j).
 # slice.start and slice.stop must be integers (not None).
@@ -52,6 +54,8 @@ def sliceIntersect(aSlice, interval):
 
 
 def slicePartition(aSlice, partition):
+    if isinstance(partition, PartitionIndex):
+        return partition.intersect(aSlice)
     result = []
     for interval in partition:
         intslice = sliceIntersect(aSlice, interval)
@@ -60,6 +64,64 @@ def slicePartition(aSlice, partition):
     return result
 
 
+class PartitionIndex(object):
+    """Sorted partition of an index range, searched by bisection.
+
+    Stores the interval starts and ends in two integer arrays, and
+    behaves as the equivalent list of [start, end] intervals. Intersecting
+    a slice only visits the intervals overlapping the slice, so mapping an
+    index range to files is O(log n) in the number of intervals.
+
+    Parameters
+    ----------
+    intervals : iterable of (start, end) half-open intervals.
+    """
+
+    def __init__(self, intervals):
+        intervals = sorted((int(p0), int(p1)) for p0, p1 in intervals)
+        self.starts = array('q', [p0 for p0, p1 in intervals])
+        self.ends = array('q', [p1 for p0, p1 in intervals])
+        # Bisecting the ends requires them to be sorted too, which holds
+        # unless intervals overlap
+        self.monotonic = all(self.ends[i] <= self.ends[i + 1]
+                             for i in range(len(self.ends) - 1))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        return [self.starts[i], self.ends[i]]
+
+    def __iter__(self):
+        for p0, p1 in zip(self.starts, self.ends):
+            yield [p0, p1]
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def intersect(self, aSlice):
+        """Intersect a slice with the partition, see slicePartition."""
+        i = aSlice.start
+        j = aSlice.stop
+        k = aSlice.step
+        if k is None or k > 0:
+            low, high = i, j
+        else:
+            low, high = j + 1, i + 1
+        if self.monotonic:
+            first = bisect_right(self.ends, low)
+        else:
+            first = 0
+        last = bisect_left(self.starts, high)
+        result = []
+        for n in range(first, last):
+            interval = [self.starts[n], self.ends[n]]
+            intslice = sliceIntersect(aSlice, interval)
+            if intslice is not None:
+                result.append((interval, intslice))
+        return result
+
+
 def lenSlice(aSlice):
     "Return the number of values associated with a slice"
 
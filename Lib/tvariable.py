@@ -17,7 +17,7 @@ from numpy import sctype2char
 from .error import CDMSError
 from .avariable import AbstractVariable
 
-from .axis import createAxis, AbstractAxis
+from .axis import createAxis, AbstractAxis, TransientAxis
 from .grid import createRectGrid, AbstractRectGrid
 from .hgrid import AbstractCurveGrid
 from .gengrid import AbstractGenericGrid
@@ -159,32 +159,103 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
         "Convert a Transient Variable into a numpy masked array."
         return numpy.ma.array(self._data, mask=self._mask)
 
+    # Attributes shared with views
+    #
+    # numpy.ma creates a new object for every slice, view and ufunc result,
+    # and calls _update_from to carry the metadata over. Instead of copying
+    # each attribute, the public attributes of a variable are moved into a
+    # dictionary (_cdattrs_) which is shared with its views and never
+    # modified afterwards. Attributes set later go to the __dict__ of the
+    # object and hide the shared value, so the store is copied on write.
+    def _attributeStore(self):
+        """Return the public attributes as a dictionary to share with a view."""
+        d = self.__dict__
+        store = d.get('_cdattrs_')
+        own = [nm for nm in d if nm[0] != '_']
+        if own:
+            store = {} if store is None else dict(store)
+            for nm in own:
+                store[nm] = d.pop(nm)
+            d['_cdattrs_'] = store
+        elif store is None:
+            store = d['_cdattrs_'] = {}
+        return store
+
+    def _unshareAttributes(self):
+        """Copy the shared attributes back into __dict__."""
+        d = self.__dict__
+        store = d.pop('_cdattrs_', None)
+        if store:
+            for nm, val in store.items():
+                d.setdefault(nm, val)
+
+    def __getattr__(self, name):
+        if not name.startswith('_'):
+            store = self.__dict__.get('_cdattrs_')
+            if store is not None and name in store:
+                return store[name]
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (self.__class__.__name__, name))
+
+    def __dir__(self):
+        names = set(object.__dir__(self))
+        names.update(self.__dict__.get('_cdattrs_') or ())
+        return sorted(names)
+
+    def __delattr__(self, name):
+        store = self.__dict__.get('_cdattrs_')
+        if store is not None and name in store:
+            self._unshareAttributes()
+        super(TransientVariable, self).__delattr__(name)
+
+    def _listatts(self):
+        dic = AbstractVariable._listatts(self)
+        store = self.__dict__.get('_cdattrs_')
+        if store:
+            internals = self.__cdms_internals__
+            shared = dict((nm, val) for nm, val in store.items() if nm not in internals)
+            shared.update(dic)
+            dic = shared
+        return dic
+
+    attributes = property(_listatts, AbstractVariable._setatts)
+
     def _update_from(self, obj):
         numpy.ma.MaskedArray._update_from(self, obj)
-        if not hasattr(self, '___cdms_internals__'):
-            self.__dict__['___cdms_internals__'] = ['__cdms_internals__',
-                                                    '___cdms_internals__', '_node_', 'parent', 'attributes', 'shape']
-        if not hasattr(self, 'attributes'):
-            self.attributes = {}
+        d = self.__dict__
+        if '___cdms_internals__' not in d:
+            d['___cdms_internals__'] = ['__cdms_internals__',
+                                        '___cdms_internals__', '_node_', 'parent', 'attributes', 'shape']
         self._grid_ = getattr(obj, '_grid_', None)
-        try:
-            for nm, val in list(obj.__dict__.items()):
-                if nm[0] == '_':
-                    # print nm
-                    pass
-# self.__dict__[nm]=val
-                else:
-                    setattr(self, nm, val)
-        except Exception:
-            pass
-        id = getattr(self, 'id', None)
+        fromVariable = isinstance(obj, TransientVariable)
+        if fromVariable:
+            # Share the attributes of obj, the values of obj replace ours
+            store = obj._attributeStore()
+            for nm in [nm for nm in d if nm[0] != '_' and nm in store]:
+                del d[nm]
+            d['_cdattrs_'] = store
+        else:
+            try:
+                for nm, val in list(obj.__dict__.items()):
+                    if nm[0] != '_':
+                        setattr(self, nm, val)
+            except Exception:
+                pass
+        # Same as getattr, without going through __getattr__
+        shared = d.get('_cdattrs_') or {}
+        id = d.get('id', shared.get('id'))
         if id is None:
             TransientVariable.variable_count += 1
             id = 'variable_' + str(TransientVariable.variable_count)
             self.id = id
-        self.name = getattr(obj, 'name', id)
-        if not hasattr(self, '__domain'):
-            self.initDomain(axes=None)
+        if fromVariable:
+            name = shared.get('name', id)
+        else:
+            name = getattr(obj, 'name', id)
+        if d.get('name', shared.get('name')) is not name:
+            self.name = name
+        # The axes are only built when they are asked for, see _getDomainList
+        d['_TransientVariable__domain'] = None
 
     def __array_finalize__(self, obj):
         numpy.ma.MaskedArray.__array_finalize__(self, obj)
@@ -287,7 +358,11 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
 
         # Initialize the attributes
         if attributes is not None:
+            # Values already shared with data (see _update_from) are not set again
+            store = self.__dict__.get('_cdattrs_') or {}
             for key, value in attributes.items():
+                if store.get(key, store) is value and key not in self.__dict__:
+                    continue
                 if (key in ['shape', 'flat', 'imaginary', 'real'] or
                         key[0] == '_') and key not in ['_FillValue']:
                     raise CDMSError('Bad key in attributes: ' + key)
@@ -419,7 +494,11 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
             mask = numpy.ma.masked.mask
 
         if dtype is None and data is not None:
-            dtype = numpy.array(data).dtype
+            if isinstance(data, numpy.ndarray):
+                # Don't copy the data to find its type
+                dtype = data.dtype
+            else:
+                dtype = numpy.array(data).dtype
 
         if any(x == 'N/A' for x in str(fill_value)):
             fill_value = None
@@ -485,16 +564,49 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
             if newgrid is not None:     # Do this after setting the axes, so the grid is consistent
                 self.setGrid(newgrid)
 
+    def _reuseDomain(self, axes, grid=None):
+        """Set the domain to the axes and grid of an operand.
+
+        Same result as initDomain followed by setGrid, for axes which were
+        already checked against the grid (see MV2.commonGrid): the axes are
+        shared or shallow copied and the grid is not checked again.
+        """
+        if len(axes) != self.rank():
+            raise CDMSError("Wrong number of axes to initialize domain.")
+        domain = self._getDomainList()
+        for n, axis in enumerate(axes):
+            if axis is None:
+                continue
+            if len(axis) != self.shape[n]:
+                raise CDMSError(
+                    "axis length %d does not match corresponding dimension %d" %
+                    (len(axis), self.shape[n]))
+            if grid is None and not axis.isVirtual():
+                if type(axis) is not TransientAxis:
+                    self.copyAxis(n, axis)
+                    continue
+                axis = axis.shallowCopy()
+            domain[n] = (axis, 0, len(axis), len(axis))
+        self._grid_ = grid
+
+    def _getDomainList(self):
+        domain = self.__domain
+        if domain is None:
+            domain = self.__domain = [None] * self.rank()
+        return domain
+
     def getDomain(self):
+        domain = self._getDomainList()
         for i in range(self.rank()):
-            if self.__domain[i] is None:
+            if domain[i] is None:
                 self.getAxis(i)  # will force a fill in
-        return self.__domain
+        return domain
 
     def getAxis(self, n):
         if n < 0:
             n = n + self.rank()
-        if self.__domain[n] is None:
+        domain = self._getDomainList()
+        if domain[n] is None:
             length = numpy.ma.size(self, n)
             # axis = createAxis(numpy.ma.arange(numpy.ma.size(self, n), typecode=numpy.Float))
             axis = createAxis(
@@ -504,8 +616,8 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
                         n),
                     dtype=numpy.float_))
             axis.id = "axis_" + str(n)
-            self.__domain[n] = (axis, 0, length, length)
-        return self.__domain[n][0]
+            domain[n] = (axis, 0, length, length)
+        return domain[n][0]
 
     def setAxis(self, n, axis, savegrid=0):
         """Set n axis of self to a copy of axis. (0-based index)
@@ -519,7 +631,7 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
                 (len(axis), axislen))
         if not isinstance(axis, AbstractAxis):
             raise CDMSError("copydimension, other not a slab.")
-        self.__domain[n] = (axis, 0, len(axis), len(axis))
+        self._getDomainList()[n] = (axis, 0, len(axis), len(axis))
 
     def setAxisList(self, axislist):
         """Set the axes to axislist."""
@@ -534,6 +646,11 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
             n = n + self.rank()
         if not isinstance(axis, AbstractAxis):
             raise CDMSError("copydimension, other not an axis.")
+        if type(axis) is TransientAxis:
+            # The copy below shares the values too, skip the bounds and
+            # attributes round trip
+            self.setAxis(n, axis.shallowCopy())
+            return
         isGeneric = [False]
         b = axis.getBounds(isGeneric)
         mycopy = createAxis(axis[:], b, genericBounds=isGeneric[0])
@@ -775,23 +892,77 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
 
         Transient variable the column of the DataFrame.
         The DataFrame is be indexed by the cartesian product of
-        this Transient variable dimensions
+        this Transient variable dimensions, time values are converted
+        to datetime64.
+
+        The column shares memory with the variable when the data are
+        contiguous and have no masked values. Masked values are NaN for
+        floating point data and missing values of a nullable dtype for
+        integer and boolean data.
         """
         import pandas as pd
-        from collections import OrderedDict
-        columns = [self.id]
-        data = [self[:]._data.reshape(-1)]
-        axes = []
-        axes.append([str(i) for i in self.getTime().asComponentTime()])
-        if self.getLevel() is not None:
-            axes.append(self.getLevel()[:])
-        if self.getLatitude() is not None:
-            axes.append(self.getLatitude()[:])
-        if self.getLongitude() is not None:
-            axes.append(self.getLongitude()[:])
-        names = [axis.id for axis in self.getAxisList()]
-        index = pd.MultiIndex.from_product(axes, names=names)
-        return pd.DataFrame(OrderedDict(zip(columns, data)), index=index)
+        levels = []
+        for axis in self.getAxisList():
+            if axis.isTime() and hasattr(axis, 'units'):
+                try:
+                    levels.append(axis.asdatetime64())
+                except CDMSError:
+                    # e.g. 360 day calendar dates
+                    levels.append([str(c) for c in axis.asComponentTime()])
+            else:
+                levels.append(axis[:])
+        index = pd.MultiIndex.from_product(levels, names=self.getAxisIds())
+
+        data = numpy.ma.getdata(self).reshape(-1)
+        mask = numpy.ma.getmask(self)
+        if mask is not numpy.ma.nomask and mask.any():
+            mask = mask.reshape(-1)
+            if data.dtype.kind in 'iu':
+                data = pd.arrays.IntegerArray(data, mask)
+            elif data.dtype.kind == 'b':
+                data = pd.arrays.BooleanArray(data, mask)
+            elif data.dtype.kind in 'fc':
+                data = numpy.where(mask, numpy.nan, data)
+            else:
+                data = numpy.where(mask, None, data.astype(object))
+        return pd.DataFrame({self.id: data}, index=index, copy=False)
+
+    def to_xarray(self):
+        """Convert a TransientVariable into a xarray.DataArray.
+
+        The DataArray shares memory with the variable when it has no
+        masked values, otherwise masked values are replaced by NaN in a
+        floating point copy. Axes become dimension coordinates, with time
+        values converted to datetime64 when possible, and the latitude and
+        longitude of curvilinear and generic grids become auxiliary
+        coordinates.
+        """
+        import xarray
+        coords = {}
+        for axis in self.getAxisList():
+            values = axis[:]
+            attrs = dict(axis.attributes)
+            if axis.isTime() and hasattr(axis, 'units'):
+                try:
+                    values = axis.asdatetime64()
+                    attrs.pop('units', None)
+                    attrs.pop('calendar', None)
+                except CDMSError:
+                    pass
+            coords[axis.id] = (axis.id, values, attrs)
+        grid = self.getGrid()
+        if isinstance(grid, (AbstractCurveGrid, AbstractGenericGrid)):
+            for coord in grid.getLatitude(), grid.getLongitude():
+                dims = [axis.id for axis in coord.getAxisList()]
+                coords[coord.id] = (dims, numpy.ma.filled(coord[:], numpy.nan),
+                                    dict(coord.attributes))
+
+        data = numpy.ma.getdata(self)
+        mask = numpy.ma.getmask(self)
+        if mask is not numpy.ma.nomask and mask.any():
+            data = numpy.where(mask, numpy.nan, data)
+        return xarray.DataArray(data, coords=coords, dims=self.getAxisIds(),
+                                name=self.id, attrs=dict(self.attributes))
 
     def toVisit(self, filename, format='Vs', sphereRadius=1.0,
                 maxElev=0.1):
@@ -832,36 +1003,39 @@ class TransientVariable(AbstractVariable, numpy.ma.MaskedArray):
         if timeAxis is None or timeIndex == -1:
             # static data
             if format == 'VTK':
-                vw = mvVTKSGWriter.VTKSGWriter(self, maxElev)
+                vw = mvVTKSGWriter.VTKSGWriter(self, sphereRadius, maxElev)
                 if filename.find('.vtk') == -1:
                     filename += '.vtk'
                 vw.write(filename)
             else:
-                vw = mvVsWriter.VsWriter(self, maxElev)
+                vw = mvVsWriter.VsWriter(self, sphereRadius, maxElev)
                 if filename.find('.vsh5') == -1:
                     filename += '.vsh5'
                 vw.write(filename)
         else:
-            # time dependent data
+            # time dependent data, the mesh is computed once and the
+            # steps are written one at a time
             tIndexMax = len(timeAxis)
+            vw = None
             for tIndex in range(tIndexMax):
-                sliceOp = 'self[' + (':,' * timeIndex) + \
-                    ('%d,' % tIndex) + '...]'
-                var = eval(sliceOp)
+                var = self[(slice(None),) * timeIndex + (tIndex, Ellipsis)]
                 if format == 'VTK':
                     if filename.find('.vtk') == -1:
                         filename += '.vtk'
                     tFilename = generateTimeFileName(filename,
                                                      tIndex, tIndexMax, 'vtk')
-                    vw = mvVTKSGWriter.VTKSGWriter(var, maxElev)
-                    vw.write(tFilename)
+                    if vw is None:
+                        vw = mvVTKSGWriter.VTKSGWriter(var, sphereRadius,
+                                                       maxElev)
                 else:
                     if filename.find('.h5') == -1:
                         filename += '.h5'
                     tFilename = generateTimeFileName(filename,
                                                      tIndex, tIndexMax, 'h5')
-                    vw = mvVsWriter.VsWriter(var, maxElev)
-                    vw.write(tFilename)
+                    if vw is None:
+                        vw = mvVsWriter.VsWriter(var, sphereRadius, maxElev)
+                vw.setVariable(var)
+                vw.write(tFilename)
 
     # Following are distributed array methods, they require mpi4py
     # to be installed
@@ -8,6 +8,7 @@ import numpy
 from . import cdmsNode
 import cdtime
 import copy
+from concurrent.futures import ThreadPoolExecutor
 # import os
 import string
 # import sys
@@ -27,6 +28,39 @@ WriteNotImplemented = "Dataset write operation not implemented"
 FileClosed = "Cannot read from closed file or dataset, variable: "
 
 
+# Number of threads used by DatasetVariable.expertSlice to read the files
+# spanned by a request, 0 reads them one after the other.
+_readWorkers = 0
+
+
+def setDatasetReadWorkers(value):
+    """Set the number of threads used to read the files of a dataset.
+
+       Parameters
+       ----------
+       value : integer >= 0, 0 (default) reads the files serially.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _readWorkers
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise CDMSError(
+            "Error dataset read workers must be an integer >= 0")
+    _readWorkers = value
+
+
+def getDatasetReadWorkers():
+    """Get the number of threads used to read the files of a dataset.
+
+       Returns
+       -------
+       Number of read threads, 0 means serial reads.
+    """
+    return _readWorkers
+
+
 def timeindex(value, units, basetime, delta, delunits, calendar):
     """ Calculate (t - basetime)/delu
 
@@ -507,6 +541,112 @@ class DatasetVariable(AbstractVariable):
 
         return result
 
+    def _readPartitionChunk(self, filename, slicelist, fci):
+        """Read the chunk (filename, slicelist) returned by expertPaths.
+
+        Parameters
+        ----------
+
+        filename : file to read, None if the chunk is missing data.
+
+        slicelist : list of slices within the file.
+
+        fci : index of the forecast axis, or None.
+
+        Returns
+        -------
+        numpy.ma array with singleton dimensions included.
+        """
+
+        # If the slice is missing, interpose missing data
+        if filename is None:
+            shapelist = list(map(lenSlice, slicelist))
+            chunk = numpy.ma.zeros(
+                tuple(shapelist), self._numericType_)
+            chunk[...] = numpy.ma.masked
+            return chunk
+
+        # else read the data and close the file
+        f = self.parent.openFile(filename, 'r')
+        try:
+            var = f.variables[self.name_in_file]
+            if fci is None:
+                chunk = var.getitem(*tuple(slicelist))
+            else:
+                # If there's a forecast axis, the file doesn't know about it so
+                # don't use it in slicing data out of the file.
+                chunk = var.getitem(
+                    *tuple(slicelist[0:fci] + slicelist[fci + 1:]))
+                # But the chunk still needs an index in the forecast direction,
+                # which is simple to do because there is only one
+                # forecast per file:
+                chunk.resize(list(map(lenSlice, slicelist)))
+
+        finally:
+            f.close()
+        sh = chunk.shape
+        if 0 in sh:
+            raise CDMSError('Coordinates out of Domain')
+
+        return self._returnArray(chunk, 0)
+
+    def _readPartitionsParallel(self, npart, idims, partitionSlices, fci):
+        """Read the partitionSlices returned by expertPaths with a thread pool.
+
+        Each chunk is written directly into its place in a preallocated
+        result, instead of concatenating the chunks.
+        """
+
+        # Map each chunk to its region of the result
+        if npart == 1:
+            rows = [partitionSlices]
+        else:
+            rows = partitionSlices
+        npart1 = idims[0]
+        npart2 = idims[-1]
+        tasks = []
+        shape = None
+        start1 = 0
+        for row in rows:
+            start2 = 0
+            for filename, slicelist in row:
+                shapelist = list(map(lenSlice, slicelist))
+                index = [slice(None)] * len(shapelist)
+                if npart == 1:
+                    index[npart1] = slice(start1, start1 + shapelist[npart1])
+                    start1 += shapelist[npart1]
+                else:
+                    index[npart1] = slice(start1, start1 + shapelist[npart1])
+                    index[npart2] = slice(start2, start2 + shapelist[npart2])
+                    start2 += shapelist[npart2]
+                tasks.append((filename, slicelist, tuple(index)))
+                if shape is None:
+                    shape = shapelist
+            if npart == 2:
+                if row is rows[0]:
+                    shape[npart2] = start2
+                start1 += lenSlice(row[0][1][npart1])
+        shape[npart1] = start1
+
+        data = numpy.zeros(tuple(shape), self._numericType_)
+        mask = numpy.zeros(tuple(shape), numpy.bool_)
+
+        # The regions are disjoint, so the workers can write concurrently
+        def read(task):
+            filename, slicelist, index = task
+            chunk = self._readPartitionChunk(filename, slicelist, fci)
+            data[index] = numpy.ma.getdata(chunk)
+            mask[index] = numpy.ma.getmaskarray(chunk)
+
+        nworkers = min(_readWorkers, len(tasks))
+        with ThreadPoolExecutor(max_workers=nworkers) as pool:
+            # list() re-raises the first exception from the workers
+            list(pool.map(read, tasks))
+
+        if not mask.any():
+            mask = numpy.ma.nomask
+        return numpy.ma.masked_array(data, mask=mask)
+
     def expertSlice(self, initslist):
 
         # Handle negative slices
@@ -579,6 +719,11 @@ class DatasetVariable(AbstractVariable):
             if 0 in sh:
                 raise CDMSError(IndexError + 'Coordinates out of Domain')
 
+        # Read the files concurrently into a preallocated array
+        elif _readWorkers > 0:
+            result = self._readPartitionsParallel(
+                npart, idims, partitionSlices, fci)
+
         # If one partitioned axes:
         elif npart == 1:
 
@@ -586,37 +731,8 @@ class DatasetVariable(AbstractVariable):
             resultlist = []
             for filename, slicelist in partitionSlices:
 
-                # If the slice is missing, interpose missing data
-                if filename is None:
-                    shapelist = list(map(lenSlice, slicelist))
-                    chunk = numpy.ma.zeros(
-                        tuple(shapelist), self._numericType_)
-                    chunk[...] = numpy.ma.masked
-
-                # else read the data and close the file
-                else:
-                    f = self.parent.openFile(filename, 'r')
-                    try:
-                        var = f.variables[self.name_in_file]
-                        if fci is None:
-                            chunk = var.getitem(*tuple(slicelist))
-                        else:
-                            # If there's a forecast axis, the file doesn't know about it so
-                            # don't use it in slicing data out of the file.
-                            chunk = var.getitem(
-                                *tuple(slicelist[0:fci] + slicelist[fci + 1:]))
-                            # But the chunk still needs an index in the forecast direction,
-                            # which is simple to do because there is only one
-                            # forecast per file:
-                            chunk.resize(list(map(lenSlice, slicelist)))
-
-                    finally:
-                        f.close()
-                    sh = chunk.shape
-                    if 0 in sh:
-                        raise CDMSError('Coordinates out of Domain')
-
-                resultlist.append(self._returnArray(chunk, 0))
+                resultlist.append(
+                    self._readPartitionChunk(filename, slicelist, fci))
 
             # Combine the chunks into a single array
             # Note: This works because slicelist is the same length
@@ -628,7 +744,7 @@ class DatasetVariable(AbstractVariable):
                 del(chunk)
 
         # If two partitioned axes, 2-D version of previous case
-        if npart == 2:
+        elif npart == 2:
             npart1, npart2 = idims
 
             resultlist = []
@@ -636,36 +752,8 @@ class DatasetVariable(AbstractVariable):
                 chunklist = []
                 for filename, slicelist in filelist:
 
-                    # If the slice is missing, interpose missing data
-                    if filename is None:
-                        shapelist = list(map(lenSlice, slicelist))
-                        chunk = numpy.ma.zeros(
-                            tuple(shapelist), self._numericType_)
-                        chunk[...] = numpy.ma.masked
-
-                    # else read the data and close the file
-                    else:
-                        f = self.parent.openFile(filename, 'r')
-                        try:
-                            var = f.variables[self.name_in_file]
-                            if fci is None:
-                                chunk = var.getitem(*tuple(slicelist))
-                            else:
-                                # If there's a forecast axis, the file doesn't know about it so
-                                # don't use it in slicing data out of the file.
-                                chunk = var.getitem(
-                                    *tuple(slicelist[0:fci] + slicelist[fci + 1:]))
-                                # But the chunk still needs an index in the forecast direction,
-                                # which is simple to do because there is only
-                                # one forecast per file:
-                                chunk.resize(list(map(lenSlice, slicelist)))
-
-                        finally:
-                            f.close()
-                        sh = chunk.shape
-                        if 0 in sh:
-                            raise CDMSError('Coordinates out of Domain')
-                    chunklist.append(self._returnArray(chunk, 0))
+                    chunklist.append(
+                        self._readPartitionChunk(filename, slicelist, fci))
 
                 # Note: This works because slicelist is the same length
                 # as the domain, and var.getitem returns a chunk
@@ -29,6 +29,14 @@
 int nc_def_var_deflate(int i,int j,int k,int l, int m) {return 0;};
 int nc_def_var_chunking(int i,int j,int k,size_t *l) {return 0;};
 #endif
+#ifndef NC_CHUNKED
+#define NC_CHUNKED 0
+#define NC_CONTIGUOUS 1
+#define NC_ENOTNC4 (-111)
+int nc_inq_var_chunking(int i,int j,int *k,size_t *l) {*k = NC_CONTIGUOUS; return 0;};
+int nc_get_var_chunk_cache(int i,int j,size_t *k,size_t *l,float *m) {return NC_ENOTNC4;};
+int nc_set_var_chunk_cache(int i,int j,size_t k,size_t l,float m) {return NC_ENOTNC4;};
+#endif
 
 int cdms_classic = 1;
 int cdms_netcdf4 = 1;
@@ -2286,6 +2294,131 @@ PyCdunifVariableObject_typecode(PyCdunifVariableObject *self, PyObject *args) {
 	return PyStr_FromStringAndSize(&t, (Py_ssize_t) 1);
 }
 
+/* Return the chunk shape, or None if the variable is not chunked */
+
+static PyObject *
+PyCdunifVariableObject_chunking(PyCdunifVariableObject *self, PyObject *args) {
+	int storage = NC_CONTIGUOUS;
+	int ret = NC_NOERR;
+	int i;
+	size_t chunks[NC_MAX_VAR_DIMS];
+	PyObject *result;
+	if (!PyArg_ParseTuple(args, ""))
+		return NULL;
+	if (!check_if_open(self->file, -1))
+		return NULL;
+	if (self->file->filetype != CuNetcdf || self->nd == 0) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+	Py_BEGIN_ALLOW_THREADS
+	;
+	acquire_Cdunif_lock()
+	;
+	ret = nc_inq_var_chunking(self->file->id, self->id, &storage, chunks);
+	release_Cdunif_lock()
+	;
+	Py_END_ALLOW_THREADS
+	;
+	if (ret != NC_NOERR) {
+		cdunif_signalerror(ret);
+		return NULL;
+	}
+	if (storage != NC_CHUNKED) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+	result = PyTuple_New(self->nd);
+	if (result == NULL)
+		return NULL;
+	for (i = 0; i < self->nd; i++)
+		PyTuple_SET_ITEM(result, i, PyLong_FromSize_t(chunks[i]));
+	return result;
+}
+
+/* Return the chunk cache (size, nelems, preemption), or None if the
+ * variable has no chunk cache (netCDF-3 and non-netCDF files) */
+
+static PyObject *
+PyCdunifVariableObject_getchunkcache(PyCdunifVariableObject *self,
+		PyObject *args) {
+	size_t size, nelems;
+	float preemption;
+	int ret = NC_ENOTNC4;
+	if (!PyArg_ParseTuple(args, ""))
+		return NULL;
+	if (!check_if_open(self->file, -1))
+		return NULL;
+	if (self->file->filetype == CuNetcdf) {
+		Py_BEGIN_ALLOW_THREADS
+		;
+		acquire_Cdunif_lock()
+		;
+		ret = nc_get_var_chunk_cache(self->file->id, self->id, &size, &nelems,
+				&preemption);
+		release_Cdunif_lock()
+		;
+		Py_END_ALLOW_THREADS
+		;
+	}
+	if (ret == NC_ENOTNC4) {
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+	if (ret != NC_NOERR) {
+		cdunif_signalerror(ret);
+		return NULL;
+	}
+	return Py_BuildValue("(nnd)", (Py_ssize_t) size, (Py_ssize_t) nelems,
+			(double) preemption);
+}
+
+/* Set the chunk cache. nelems and preemption keep their current value if
+ * they are negative. Ignored for variables without a chunk cache. */
+
+static PyObject *
+PyCdunifVariableObject_setchunkcache(PyCdunifVariableObject *self,
+		PyObject *args) {
+	Py_ssize_t size;
+	Py_ssize_t nelems = -1;
+	double preemption = -1.;
+	size_t cursize, curnelems;
+	float curpreemption;
+	int ret = NC_ENOTNC4;
+	if (!PyArg_ParseTuple(args, "n|nd", &size, &nelems, &preemption))
+		return NULL;
+	if (size < 0 || preemption > 1.) {
+		PyErr_SetString(PyExc_ValueError,
+				"cdunif: invalid chunk cache parameters");
+		return NULL;
+	}
+	if (!check_if_open(self->file, -1))
+		return NULL;
+	if (self->file->filetype == CuNetcdf) {
+		Py_BEGIN_ALLOW_THREADS
+		;
+		acquire_Cdunif_lock()
+		;
+		ret = nc_get_var_chunk_cache(self->file->id, self->id, &cursize,
+				&curnelems, &curpreemption);
+		if (ret == NC_NOERR)
+			ret = nc_set_var_chunk_cache(self->file->id, self->id,
+					(size_t) size,
+					nelems < 0 ? curnelems : (size_t) nelems,
+					preemption < 0. ? curpreemption : (float) preemption);
+		release_Cdunif_lock()
+		;
+		Py_END_ALLOW_THREADS
+		;
+	}
+	if (ret != NC_NOERR && ret != NC_ENOTNC4) {
+		cdunif_signalerror(ret);
+		return NULL;
+	}
+	Py_INCREF(Py_None);
+	return Py_None;
+}
+
 /* Get an item: wrapper for subscript */
 PyObject *
 PyCdunifVariableObject_getitem(PyCdunifVariableObject *self, PyObject *args) {
@@ -2340,7 +2473,11 @@ static PyMethodDef PyCdunifVariableObject_methods[] = { { "assignValue",
 		(PyCFunction) PyCdunifVariableObject_getitem, 1 }, { "getslice",
 		(PyCFunction) PyCdunifVariableObject_getslice, 1 }, { "setitem",
 		(PyCFunction) PyCdunifVariableObject_setitem, 1 }, { "setslice",
-		(PyCFunction) PyCdunifVariableObject_setslice, 1 }, { NULL, NULL } /* sentinel */
+		(PyCFunction) PyCdunifVariableObject_setslice, 1 }, { "chunking",
+		(PyCFunction) PyCdunifVariableObject_chunking, 1 }, { "getchunkcache",
+		(PyCFunction) PyCdunifVariableObject_getchunkcache, 1 }, {
+		"setchunkcache", (PyCFunction) PyCdunifVariableObject_setchunkcache,
+		1 }, { NULL, NULL } /* sentinel */
 };
 
 /* Attribute access */
@@ -2498,7 +2635,7 @@ static PyArrayObject *
 PyCdunifVariable_ReadAsArray(PyCdunifVariableObject *self,
 		PyCdunifIndex *indices) {
 	npy_intp *dims;
-	PyArrayObject *array;
+	PyArrayObject *array = NULL;
 	int i, d;
 	unsigned long nitems;
 	int error = 0;
@@ -2596,65 +2733,89 @@ PyCdunifVariable_ReadAsArray(PyCdunifVariableObject *self,
 					count[i] = (indices[i].stop - indices[i].start - 1)
 							/ indices[i].stride + 1;
 				}
-				Py_BEGIN_ALLOW_THREADS
-
-				acquire_Cdunif_lock()
-
-
                 if (self->type == NPY_STRING) {
                     if( d > 1) {
                         // *********************
                         // Limit to 1 dimension
                         // **********************
                         PyErr_SetString(PyExc_IOError, "cdunif: More than 1 dimension String variables not allowed");
+                        free(start);
+                        free(count);
+                        free(stride);
+                        free(dims);
+                        free(indices);
                         return NULL;
                     }
                     value = (char**) PyMem_Malloc(nitems * sizeof(char*));
-                    err = nc_get_vara_string(self->file->id, self->id, start,
-                            count, (void *) value);
-                    // Look for maximum string size to create object.
-                    // -----------------------------------------------
-                    maxsize = -1;
-                    for( i=0; i<nitems; i++) {
-                            int len = strlen(value[i]);
-                            if( maxsize < len) {
-                                maxsize = len+1;
-                            }
+                    if (value == NULL) {
+                        free(start);
+                        free(count);
+                        free(stride);
+                        free(dims);
+                        free(indices);
+                        return (PyArrayObject *) PyErr_NoMemory();
                     }
-                    array = (PyArrayObject *) PyArray_New(&PyArray_Type, d,
-                                                         dims,
-                                                         NPY_STRING, NULL,
-                                                         NULL, maxsize, 0, NULL);
-                    //
-                    // Copy each string into new PyArray.
-                    //
+                    // Only the netCDF read runs without the GIL, the
+                    // Python objects are built once it is held again.
+                    Py_BEGIN_ALLOW_THREADS
+                    acquire_Cdunif_lock()
+                    err = nc_get_vara_string(self->file->id, self->id,
+                            (size_t *) start, (size_t *) count, value);
+                    release_Cdunif_lock()
+                    Py_END_ALLOW_THREADS
                     if (err == NC_NOERR) {
+                        // Look for maximum string size to create object.
+                        // -----------------------------------------------
+                        maxsize = 1;
+                        for( i=0; i<nitems; i++) {
+                                int len = strlen(value[i]);
+                                if( maxsize < len + 1) {
+                                    maxsize = len+1;
+                                }
+                        }
+                        array = (PyArrayObject *) PyArray_New(&PyArray_Type, d,
+                                                             dims,
+                                                             NPY_STRING, NULL,
+                                                             NULL, maxsize, 0, NULL);
+                        //
+                        // Copy each string into new PyArray.
+                        //
                         // Note limited to 1 dimension...
-                        for (j = 0; j < count[0]; j++) {
+                        for (j = 0; array != NULL && j < count[0]; j++) {
                             PyObject *obj = PyUnicode_FromString(value[j]);
                             if (obj != NULL) {
                                 PyArray_SETITEM((PyArrayObject*)array,
                                 PyArray_GETPTR1((PyArrayObject*)array, j), obj);
+                                Py_DECREF(obj);
                             }
                         }
-                    }
-                    PyMem_Free(value);
-                } else {
-                    if(array != NULL) {
-                        ret = cdvargets(self->file,
-                                self->id, start,
-                                count, stride,
-                                array->data);
+                        Py_BEGIN_ALLOW_THREADS
+                        acquire_Cdunif_lock()
+                        nc_free_string(nitems, value);
+                        release_Cdunif_lock()
+                        Py_END_ALLOW_THREADS
                     } else {
                         ret = -1;
                     }
+                    PyMem_Free(value);
+                } else if (array != NULL) {
+                    // Bulk read into the array buffer. The array is owned
+                    // by this function, so the GIL can be dropped for the
+                    // whole read and decompression.
+                    Py_BEGIN_ALLOW_THREADS
+                    acquire_Cdunif_lock()
+                    ret = cdvargets(self->file,
+                            self->id, start,
+                            count, stride,
+                            array->data);
+                    release_Cdunif_lock()
+                    Py_END_ALLOW_THREADS
+                } else {
+                    ret = -1;
                 }
-				release_Cdunif_lock()
-				Py_END_ALLOW_THREADS
-				;
 				if (ret == -1) {
 					Cdunif_seterror();
-					Py_DECREF(array);
+					Py_XDECREF(array);
 					array = NULL;
 				}
 			}
@@ -2788,7 +2949,7 @@ static int PyCdunifVariable_WriteArray(PyCdunifVariableObject *self,
 			Py_END_ALLOW_THREADS
 			;
 			if (error != NC_NOERR) {
-				cdunif_signalerror(ret);
+				cdunif_signalerror(error);
 				ret = -1;
 			}
 		} else {
@@ -2841,14 +3002,18 @@ static int PyCdunifVariable_WriteArray(PyCdunifVariableObject *self,
 					}
 				} else
 					ret = -1;
-				if (ret == -1)
+				if (ret == -1) {
 					PyErr_SetString(PyExc_ValueError, "shapes are not aligned");
+					repeat = 0;
+				}
+				/* The contiguous copy of the data belongs to this function,
+				 * so the GIL is dropped for all the hyperslab writes. */
 				Py_BEGIN_ALLOW_THREADS
 				;
 				acquire_Cdunif_lock()
 				;
 				error = NC_NOERR;
-				while (repeat--) {
+				while (repeat-- > 0) {
 					error = nc_put_vars_any(self->file->id, self->id,
 							cdunif_type_from_type(self->type), start, count1,
 							stride, array->data);
@@ -2878,7 +3043,7 @@ static int PyCdunifVariable_WriteArray(PyCdunifVariableObject *self,
 				;
 				Py_END_ALLOW_THREADS
 				;
-				if (error == -1) {
+				if (error != NC_NOERR) {
 					cdunif_signalerror(error);
 					ret = -1;
 				}
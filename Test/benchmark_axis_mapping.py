@@ -0,0 +1,73 @@
+"""
+Benchmark of coordinate to index mapping on long axes.
+
+Writes a file with a long daily time axis and a fine lat/lon grid, then
+times mapIntervalExt and var(time=..., lat=..., lon=...) selections. The
+cold timings drop the cached search structure of the axes before every
+call, which is what each call cost before the structure was cached: the
+values are read again and the bounds are regenerated (O(n)), instead of
+a binary search on the cached values (O(log n)).
+
+Usage: python benchmark_axis_mapping.py [ntime nlat nlon]
+"""
+import os
+import sys
+import time
+import tempfile
+
+import numpy
+import cdms2
+
+
+def write(path, ntime, nlat, nlon):
+    t = cdms2.createAxis(numpy.arange(ntime, dtype=numpy.float64), id='time')
+    t.units = 'days since 1850-1-1'
+    t.designateTime()
+    lat = cdms2.createAxis(numpy.linspace(-90., 90., nlat), id='lat')
+    lat.designateLatitude()
+    lon = cdms2.createAxis(numpy.linspace(0., 360., nlon, endpoint=False), id='lon')
+    lon.designateLongitude()
+    f = cdms2.open(path, 'w')
+    f.write(cdms2.createVariable(numpy.zeros(ntime, dtype=numpy.float32),
+                                 axes=[t], id='point'))
+    f.write(cdms2.createVariable(numpy.zeros((nlat, nlon), dtype=numpy.float32),
+                                 axes=[lat, lon], id='field'))
+    f.close()
+
+
+def timeit(function, axes, cold, n=200):
+    start = time.time()
+    for i in range(n):
+        if cold:
+            for axis in axes:
+                axis._invalidateSearch()
+        function()
+    return (time.time() - start) / n
+
+
+def main(ntime=73000, nlat=1800, nlon=3600):
+    path = os.path.join(tempfile.mkdtemp(), 'benchmark_axis_mapping.nc')
+    write(path, ntime, nlat, nlon)
+    f = cdms2.open(path)
+    t = f['time']
+    lat = f['lat']
+    lon = f['lon']
+    cases = [
+        ("time.mapIntervalExt", [t], lambda: t.mapIntervalExt(('1900-1-1', '1901-1-1'))),
+        ("lat.mapIntervalExt", [lat], lambda: lat.mapIntervalExt((-10., 10.))),
+        ("lon.mapIntervalExt wrapped", [lon], lambda: lon.mapIntervalExt((-20., 20.))),
+        ("point(time=...)", [t], lambda: f('point', time=('1900-1-1', '1900-2-1'))),
+        ("field(lat=..., lon=...)", [lat, lon],
+         lambda: f('field', lat=(-10., 10.), lon=(100., 110.))),
+    ]
+    for name, axes, function in cases:
+        cold = timeit(function, axes, True)
+        warm = timeit(function, axes, False)
+        print("%-28s cold %8.1f us  cached %8.1f us  speedup %.1f" %
+              (name, cold * 1e6, warm * 1e6, cold / warm))
+    f.close()
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,68 @@
+"""
+Benchmark of concurrent reads through Cdunif.
+
+Writes a compressed netCDF4 file and reads it back one time step per task
+with a thread pool of 1, 2, 4 and 8 workers. Cdunif drops the GIL for the
+bulk reads and writes, so the Python side of a read (masking, decoding,
+building the TransientVariable) overlaps with the I/O of other threads.
+netCDF-C itself is not thread-safe and calls into it are still serialized,
+so the speedup is bounded by the share of time spent outside the library.
+
+Usage: python benchmark_threaded_read.py [ntime nlat nlon]
+"""
+import os
+import sys
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+import cdms2
+
+
+def write(path, ntime, nlat, nlon):
+    cdms2.setNetcdfShuffleFlag(1)
+    cdms2.setNetcdfDeflateFlag(1)
+    cdms2.setNetcdfDeflateLevelFlag(4)
+    data = numpy.random.random((ntime, nlat, nlon)).astype(numpy.float32)
+    t = cdms2.createAxis(numpy.arange(ntime, dtype=numpy.float64), id='time')
+    t.units = 'days since 2000-1-1'
+    t.designateTime()
+    lat = cdms2.createAxis(numpy.linspace(-90., 90., nlat), id='lat')
+    lat.designateLatitude()
+    lon = cdms2.createAxis(numpy.linspace(0., 360., nlon, endpoint=False), id='lon')
+    lon.designateLongitude()
+    var = cdms2.createVariable(data, axes=[t, lat, lon], id='ta')
+    f = cdms2.open(path, 'w')
+    start = time.time()
+    f.write(var)
+    f.close()
+    return time.time() - start
+
+
+def read(path, ntime, nworkers):
+    files = [cdms2.open(path) for i in range(nworkers)]
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=nworkers) as pool:
+        blocks = list(pool.map(lambda i: files[i % nworkers]('ta', time=slice(i, i + 1)),
+                               range(ntime)))
+    elapsed = time.time() - start
+    for f in files:
+        f.close()
+    assert len(blocks) == ntime
+    return elapsed
+
+
+def main(ntime=64, nlat=360, nlon=720):
+    path = os.path.join(tempfile.mkdtemp(), 'benchmark_threaded_read.nc')
+    print("write %dx%dx%d: %.3f s" % (ntime, nlat, nlon, write(path, ntime, nlat, nlon)))
+    serial = None
+    for nworkers in 1, 2, 4, 8:
+        elapsed = min(read(path, ntime, nworkers) for i in range(3))
+        serial = serial or elapsed
+        print("read with %d thread(s): %.3f s  speedup %.2f" % (nworkers, elapsed, serial / elapsed))
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,60 @@
+"""
+Benchmark of the per-access overhead of indexing a TransientVariable.
+
+Creates a variable with 0, 10 and 100 attributes and times per-element
+indexing (v[i, j, k]), per-slice indexing (v[i]) and the numpy.ma views
+(slices, ufunc results) which go through _update_from. Views share the
+attributes of the variable they come from, so their cost should not grow
+with the number of attributes. The memory allocated by a slice is measured
+with tracemalloc; the data of a slice is a view, so it should be small.
+
+Usage: python benchmark_tvariable_indexing.py [nlev nlat nlon]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy
+import cdms2
+
+
+def timeit(function, n=2000):
+    start = time.time()
+    for i in range(n):
+        function()
+    return (time.time() - start) / n
+
+
+def allocated(function, n=100):
+    tracemalloc.start()
+    function()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [function() for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return (after - before) / n
+
+
+def main(nlev=20, nlat=180, nlon=360):
+    data = numpy.random.random((nlev, nlat, nlon))
+    for natts in 0, 10, 100:
+        v = cdms2.createVariable(data, id='ta')
+        for i in range(natts):
+            setattr(v, 'attribute_%d' % i, 'value %d' % i)
+        getitem = numpy.ma.MaskedArray.__getitem__
+        cases = [
+            ("v[i, j, k]", lambda: v[1, 2, 3]),
+            ("v[i]", lambda: v[1]),
+            ("ma view v[i]", lambda: getitem(v, 1)),
+            ("ma view v[i, :, k]", lambda: getitem(v, (1, slice(None), 3))),
+            ("ufunc v[i] + 1", lambda: numpy.ma.add(getitem(v, 1), 1.)),
+        ]
+        print("%d attributes" % natts)
+        for name, function in cases:
+            print("  %-20s %8.1f us  %10.0f bytes" %
+                  (name, timeit(function) * 1e6, allocated(function)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -6,12 +6,12 @@ __all__ = ["horizontal", "pressure", "crossSection", "scrip",
 
 from .error import RegridError  # noqa
 from .horizontal import Horizontal, Regridder  # noqa
-from .pressure import PressureRegridder  # noqa
+from .pressure import PressureRegridder, setLevelRegridThreads, getLevelRegridThreads  # noqa
 from .crossSection import CrossSectionRegridder  # noqa
 from .scrip import ConservativeRegridder, BilinearRegridder, BicubicRegridder  # noqa
-from .scrip import DistwgtRegridder, readRegridder  # noqa
+from .scrip import DistwgtRegridder, readRegridder, setScripThreads, getScripThreads  # noqa
 from regrid2 import gsRegrid  # noqa
-from .mvGenericRegrid import GenericRegrid  # noqa
+from .mvGenericRegrid import GenericRegrid, setGenericRegridProcesses, getGenericRegridProcesses  # noqa
 from .mvLibCFRegrid import LibCFRegrid  # noqa
 try:
     import ESMF
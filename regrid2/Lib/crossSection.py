@@ -6,6 +6,7 @@ import copy
 # from . import _regrid
 import regrid2._regrid as _regrid
 from .error import RegridError
+from .pressure import interpolateLevels
 
 
 class CrossSectionRegridder:
@@ -470,48 +471,12 @@ class CrossSectionRegridder:
             dataIn,
             aout)
 
-        #      ------------- call rgdpressure to regrid pressure  -------------
-
-        # allocate memory for ap -- the array with new number of levels and the
-        # new number of latitudes
-
-        apList = list(dataIn.shape)
-        apList[positionIn[0]] = self.nlato
-        apList[positionIn[1]] = self.nlevo
-        # memory for ap
-        ap = numpy.zeros(tuple(apList), numpy.float32)
-
-        nlon = 0
-        if missingMatch is None:                                                # if no missing do not pass None
-            missingMatch = 'none'
-
-        # if no missing do not pass None
-        if missingValueIn is None:
-            missingValueIn = 1.333e33
-
-        if logYes != 'yes':
-            logYes = 'no'
+        #      ------------- interpolate along the level axis  -------------
 
         levIn = self.levIn[:].astype(numpy.float64)
         levOut = self.levOut[:].astype(numpy.float64)
-        _regrid.rgdpressure(
-            self.nlevi,
-            self.nlevo,
-            self.nlato,
-            nlon,
-            ntim2,
-            missingValueIn,
-            missingMatch,
-            logYes,
-            levIn,
-            levOut,
-            aout,
-            ap)
-
-        if missingMatch == 'none':                    # if no missing do not pass None
-            missingMatch = None
-        if missingValueIn == 1.333e33:
-            missingValueIn = None
+        ap = interpolateLevels(aout, levIn, levOut, positionIn[1], logYes,
+                               missingValueIn, missingMatch)
 
         return ap
 
@@ -24,13 +24,17 @@ def extractBounds(bounds):
 
     return (lower.astype(numpy.float32), upper.astype(numpy.float32))
 
+
+# Names of the weight arrays computed by _regrid.maparea
+_weightNames = ['londx', 'lonpt', 'wtlon', 'latdx', 'latpt', 'wtlat']
+
 # Create a horizontal regridder. ingrid and outgrid are CDMS AbstractGrid
 # objects.
 
 
 class Horizontal:
 
-    def __init__(self, ingrid, outgrid):
+    def __init__(self, ingrid, outgrid, weights=None):
         """
         Constructor for regridding class
 
@@ -42,6 +46,10 @@ class Horizontal:
 
              outgrid cdms2,
                  ndarray variable
+
+             weights
+                 Optional dictionary returned by getWeights for the same
+                 grids, skips the computation of the weights
         """
 
         inlat = ingrid.getLatitude()
@@ -85,9 +93,21 @@ class Horizontal:
             print(("bwout = ", numpy.array2string(bwout, precision=3)))
             print(("beout = ", numpy.array2string(beout, precision=3)))
 
+        if weights is not None:
+            for name in _weightNames:
+                setattr(self, name, weights[name])
+            return
+
         self.londx, self.lonpt, self.wtlon, self.latdx, self.latpt, self.wtlat = _regrid.maparea(
             self.nloni, self.nlono, self.nlati, self.nlato, bnin, bnout, bsin, bsout, bein, beout, bwin, bwout)
 
+    def getWeights(self):
+        """
+        Return the interpolation weights as a dictionary of arrays, which
+        can be passed back to the constructor as weights.
+        """
+        return dict((name, getattr(self, name)) for name in _weightNames)
+
     def __call__(self, ar, missing=None, order=None,
                  mask=None, returnTuple=0, **args):
         """
@@ -11,12 +11,86 @@ import numpy
 
 import regrid2
 import re
-from distarray import MultiArrayIter
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 
 # used to locate fully masked cells
 EPS = 10 * 1.19209e-07
 
+# Number of worker processes regridding the non-horizontal slices, 0
+# regrids them in the calling process
+_genericRegridProcesses = 0
+_pool = None
+# Regridders built by a worker process, keyed by the regridder they copy
+_workerRegridders = {}
+_regridderKeys = itertools.count()
+
+
+def setGenericRegridProcesses(value):
+    """
+    Set the number of processes used to regrid the non-horizontal slices.
+
+    The regrid tools are not reentrant, so each worker process builds its
+    own copy of the regridder, once, and regrids a contiguous block of
+    slices. The workers are started with the spawn method since the parent
+    may already have initialized ESMF.
+
+    Parameters
+    ----------
+
+    value : integer >= 0, 0 regrids the slices in the calling process
+    """
+    global _genericRegridProcesses, _pool
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise regrid2.RegridError(
+            "Error number of processes must be an integer >= 0")
+    if value != _genericRegridProcesses and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+    _genericRegridProcesses = value
+
+
+def getGenericRegridProcesses():
+    """
+    Get the number of processes used to regrid the non-horizontal slices.
+
+    Returns
+    -------
+
+    number of processes
+    """
+    return _genericRegridProcesses
+
+
+def _getPool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=_genericRegridProcesses,
+            mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def _applyBlock(key, cls, initArgs, weightsArgs, srcStack, dstStack,
+                srcMasks, missingValue, args):
+    """
+    Regrid a block of slices in a worker process
+    """
+    regridder = _workerRegridders.get(key)
+    if regridder is None:
+        regridder = cls(*initArgs[0], **initArgs[1])
+        if weightsArgs is not None:
+            regridder.computeWeights(**weightsArgs)
+        # keep the regridders of the last few calls only
+        if len(_workerRegridders) >= 4:
+            _workerRegridders.clear()
+        _workerRegridders[key] = regridder
+    regridder._applySlices(srcStack, dstStack, srcMasks, None, missingValue,
+                           **args)
+    return dstStack
+
 
 def guessPeriodicity(srcBounds):
     """
@@ -104,6 +178,14 @@ class GenericRegrid:
 
         """
 
+        # kept to rebuild the regridder in worker processes
+        self._initArgs = ((srcGrid, dstGrid, dtype, regridMethod, regridTool),
+                          dict(srcGridMask=srcGridMask, srcBounds=srcBounds,
+                               srcGridAreas=srcGridAreas,
+                               dstGridMask=dstGridMask, dstBounds=dstBounds,
+                               dstGridAreas=dstGridAreas, **args))
+        self._weightsArgs = None
+
         self.nGridDims = len(srcGrid)
         self.regridMethod = regridMethod
 
@@ -187,6 +269,9 @@ valid choices are: 'libcf', 'esmf'""" % regridTool
         Compute Weights
         """
         self.tool.computeWeights(**args)
+        self._weightsArgs = args
+        # the copies in the worker processes are out of date
+        self.__dict__.pop('_key', None)
 
     def apply(self, srcData, dstData,
               rootPe=None,
@@ -206,6 +291,10 @@ valid choices are: 'libcf', 'esmf'""" % regridTool
 
         missingValue : if not None, then data mask will be interpolated
                        and data value set to missingValue when masked
+
+        The non-horizontal slices are regridded in worker processes when
+        setGenericRegridProcesses was given more than one process and the
+        results are not MPI gathered.
         """
 
         # assuming the axes are the slowly varying indices
@@ -269,70 +358,122 @@ valid choices are: 'libcf', 'esmf'""" % regridTool
                                           str(nonHorizShape))
                 raise regrid2.RegridError(msg)
 
-            #
-            # iterate over all axes
-            #
+            # stack the horizontal slices, views if the data are contiguous
+            nslices = reduce(operator.mul, nonHorizShape, 1)
+            srcStack = srcData.reshape((nslices,) + srcHorizShape)
+            dstStack = dstData.reshape((nslices,) + dstHorizShape)
 
-            # create containers to hold input/output values
-            # (a copy is essential here)
-            zros = '[' + ('0,' * len(nonHorizShape)) + '...]'
-            indata = numpy.array(eval('srcData' + zros))
-            outdata = numpy.array(eval('dstData' + zros))
-
-            # now iterate over all non lat/lon coordinates
-            for it in MultiArrayIter(nonHorizShape):
-
-                indices = it.getIndices()
-                slce = '['
-                slce += reduce(operator.add, ['%d,' % i for i in indices])
-                slce += '...]'
-                indata = eval('srcData' + slce)
-
-                # adjust for masking
-                if missingValue is not None:
-
-                    srcDataMaskFloat[:] = (indata == missingValue)
-
-                    # set field values to zero where missing, we'll add the mask
-                    # contribution later
-#                    indata *= (1 - (srcDataMaskFloat == 1))
-
-#                    srcDataMaskFloatData = srcDataMaskFloat * numpy.random.rand(srcHorizShape[0],srcHorizShape[1])*100
-                    # interpolate mask
-                    self.tool.apply(srcDataMaskFloat, dstDataMaskFloat,
-                                    rootPe=rootPe, globalIndexing=True,
-                                    srcDataMask=(1 - srcDataMaskFloat), **args)
-
-                    if re.search('conserv', self.regridMethod.lower(), re.I):
-                        # cell interpolation
-                        dstMask = numpy.array(
-                            (dstDataMaskFloat > 1 - EPS), numpy.int32)
-                    else:
-                        # nodal interpolation
-                        dstMask = numpy.array(
-                            (dstDataMaskFloat > 0), numpy.int32)
-
-                # interpolate the data, using the appropriate tool
-                self.tool.apply(indata, outdata, rootPe=rootPe,
-                                globalIndexing=True,
-                                srcDataMask=srcDataMaskFloat, **args)
-
-#                import vcs
-#                pp = vcs.init()
-#                pp.plot(indata)
-#                pp.interact()
-#                pp.clear()
-#                pp.plot(outdata)
-#                pp.interact()
-#                pp.clear()
-                # apply missing value contribution
-                if missingValue is not None:
-                    # add mask contribution
-                    outdata *= (1 - dstMask)
-                    outdata += dstMask * missingValue
-
-                # fill in dstData
-                exec('dstData' + slce + ' = outdata')
+            # interpolate each distinct mask once, most fields have the
+            # same mask for all the slices
+            srcMasks = None
+            dstMasks = None
+            if missingValue is not None:
+                srcMasks = (srcStack == missingValue)
+                dstMasks = self._interpolateMasks(srcMasks, srcData.dtype,
+                                                  dstHorizShape, dstData.dtype,
+                                                  rootPe=rootPe, **args)
+
+            nprocs = min(_genericRegridProcesses, nslices)
+            if nprocs > 1 and rootPe is None and \
+               getattr(self, '_initArgs', None) is not None:
+                # each worker regrids a contiguous block of slices
+                bounds = numpy.linspace(0, nslices, nprocs + 1).astype(int)
+                blocks = list(zip(bounds[:-1], bounds[1:]))
+                key = self.__dict__.setdefault('_key', next(_regridderKeys))
+                weightsArgs = getattr(self, '_weightsArgs', None)
+                futures = [_getPool().submit(
+                    _applyBlock, key, type(self), self._initArgs, weightsArgs,
+                    srcStack[i:j], dstStack[i:j],
+                    None if srcMasks is None else srcMasks[i:j],
+                    missingValue, args) for i, j in blocks]
+                for (i, j), future in zip(blocks, futures):
+                    dstStack[i:j] = future.result()
+                if dstMasks is not None:
+                    for k in range(nslices):
+                        dstStack[k][dstMasks[k]] = missingValue
+            else:
+                self._applySlices(srcStack, dstStack, srcMasks, dstMasks,
+                                  missingValue, rootPe=rootPe, **args)
+
+            if not numpy.shares_memory(dstStack, dstData):
+                dstData[...] = dstStack.reshape(dstData.shape)
+
+    def _applySlices(self, srcStack, dstStack, srcMasks, dstMasks,
+                     missingValue, rootPe=None, **args):
+        """
+        Regrid a stack of horizontal slices
+
+        Parameters
+        ----------
+
+        srcStack : array (nslices, ...), input
+
+        dstStack : array (nslices, ...), output
+
+        srcMasks : boolean array (nslices, ...), True where data are
+                   missing, or None
+
+        dstMasks : list of boolean destination masks, or None to leave the
+                   masked values to the caller
+        """
+        srcDataMaskFloat = None
+        if srcMasks is not None:
+            srcDataMaskFloat = numpy.zeros(srcStack.shape[1:], srcStack.dtype)
+
+        # the tools need a contiguous output buffer
+        outdata = numpy.empty(dstStack.shape[1:], dstStack.dtype)
+        for k in range(len(srcStack)):
+            if srcMasks is not None:
+                srcDataMaskFloat[:] = srcMasks[k]
+            outdata[...] = dstStack[k]
+
+            # interpolate the data, using the appropriate tool
+            self.tool.apply(srcStack[k], outdata, rootPe=rootPe,
+                            globalIndexing=True,
+                            srcDataMask=srcDataMaskFloat, **args)
+
+            # apply missing value contribution
+            if dstMasks is not None:
+                outdata[dstMasks[k]] = missingValue
+
+            dstStack[k] = outdata
+
+    def _interpolateMasks(self, srcMasks, srcDtype, dstHorizShape, dstDtype,
+                          rootPe=None, **args):
+        """
+        Interpolate the masks of a stack of slices
+
+        Parameters
+        ----------
+
+        srcMasks : boolean array (nslices, ...), True where data are missing
+
+        Returns
+        -------
+
+        list of boolean destination masks, one per slice. Slices with the
+        same source mask share the same destination mask, which is only
+        interpolated once.
+        """
+        conservative = re.search('conserv', self.regridMethod.lower(), re.I)
+        dstMasks = []
+        interpolated = {}
+        for srcMask in srcMasks:
+            key = numpy.packbits(srcMask).tobytes()
+            if key not in interpolated:
+                srcDataMaskFloat = numpy.array(srcMask, srcDtype)
+                dstDataMaskFloat = numpy.zeros(dstHorizShape, dstDtype)
+                self.tool.apply(srcDataMaskFloat, dstDataMaskFloat,
+                                rootPe=rootPe, globalIndexing=True,
+                                srcDataMask=(1 - srcDataMaskFloat), **args)
+                if conservative:
+                    # cell interpolation
+                    interpolated[key] = (dstDataMaskFloat > 1 - EPS)
+                else:
+                    # nodal interpolation
+                    interpolated[key] = (dstDataMaskFloat > 0)
+            dstMasks.append(interpolated[key])
+        return dstMasks
 
     def getDstGrid(self):
         """
@@ -1,10 +1,44 @@
 # Automatically adapted for numpy.oldnumeric Aug 02, 2007 by
 import cdms2
 import numpy
-# from . import _regrid
-import regrid2._regrid as _regrid
 from .error import RegridError
 import copy
+from concurrent.futures import ThreadPoolExecutor
+
+# Number of threads used to interpolate along the level axis, 0 runs in
+# the calling thread
+_levelThreads = 0
+
+
+def setLevelRegridThreads(value):
+    """Set the number of threads used by the vertical regridders.
+
+       PressureRegridder and CrossSectionRegridder split the data in blocks
+       along a non-level axis and interpolate the blocks concurrently; numpy
+       releases the GIL for the gathers and arithmetic involved.
+
+       Parameters
+       ----------
+       value : integer >= 0, 0 interpolates in the calling thread.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _levelThreads
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise RegridError("Error number of threads must be an integer >= 0")
+    _levelThreads = value
+
+
+def getLevelRegridThreads():
+    """Get the number of threads used by the vertical regridders.
+
+       Returns
+       -------
+       Number of threads.
+    """
+    return _levelThreads
 
 
 class PressureRegridder:
@@ -250,11 +284,9 @@ class PressureRegridder:
             sendmsg(msg, missingMatch)
             raise ValueError
 
-        # --- Check data type and change to float if necessary ----
-
-        if dataIn.dtype.char != 'f':
-            dataIn = dataIn.astype(numpy.float32)
+        # --- The data is converted to float32 by interpolateLevels ----
 
+        dataIn = numpy.asarray(dataIn)
         dataShape = dataIn.shape
         numberDim = len(dataShape)
 
@@ -274,34 +306,14 @@ class PressureRegridder:
         for n in range(numberDim, 4):            # fill end of list with Nones
             positionList.append(None)
 
-        positionCheck = tuple(positionList)
-
-        standardPosition = 0                            # transpose required
-
         if positionIn is None:                          # construct the default positionIn tuple
-            positionIn = positionCheck
-            standardPosition = 1                        # no need for a transpose with this data
-        else:
-            if positionIn == positionCheck:             # compare to the standard
-                standardPosition = 1                    # no need for a transpose with this data
+            positionIn = tuple(positionList)
 
         if len(positionIn) != 4:
             msg = 'Error in call to rgrd -- positionIn must be a tuple of length 4'
             sendmsg(msg)
             raise TypeError
 
-        # transpose data to the standard order (t,z,y,x)
-        if standardPosition == 0:
-
-            newOrder, inverseOrder = checkorder(positionIn)
-
-            # transpose data to standard order (t,z,y,x)
-            dataIn = numpy.transpose(dataIn, newOrder)
-            dataIn = numpy.array(
-                dataIn.astype(
-                    numpy.float32),
-                numpy.float32)       # make contiguous
-
         # set dimension sizes and check for consistency
 
         if positionIn[0] is not None:
@@ -312,68 +324,23 @@ class PressureRegridder:
             self.nlat = (dataShape[positionIn[1]])
         else:
             self.nlat = 0
-        if positionIn[2] is not None:
-            if self.nlevi != (dataShape[positionIn[2]]):
-                msg = 'Level size is inconsistent with input data'
-                sendmsg(msg)
-                raise ValueError
+        if positionIn[2] is None:
+            msg = 'Error in call to rgrd -- positionIn must give the position of the level'
+            sendmsg(msg)
+            raise TypeError
+        if self.nlevi != (dataShape[positionIn[2]]):
+            msg = 'Level size is inconsistent with input data'
+            sendmsg(msg)
+            raise ValueError
         if positionIn[3] is not None:
             self.ntime = (dataShape[positionIn[3]])
         else:
             self.ntime = 0
 
-        # allocate memory for dataOut -- the array with new number of levels
-
-        outList = list(dataIn.shape)
-
-        for i in range(len(outList)):
-            if outList[i] == self.nlevi:
-                outList[i] = self.nlevo
-                break
+        # interpolate along the level axis, in the input dimension order
 
-        dataOut = numpy.zeros(
-            tuple(outList),
-            numpy.float32)                      # memory for aout
-
-        if missingMatch is None:                                                # if no missing do not pass None
-            missingMatch = 'none'
-
-        # if no missing do not pass None
-        if missingValueIn is None:
-            missingValueIn = 1.333e33
-
-        if logYes != 'yes':
-            logYes = 'no'
-
-        levIn = self.axisIn[:].astype(numpy.float64)
-        levOut = self.axisOut[:].astype(numpy.float64)
-        _regrid.rgdpressure(
-            self.nlevi,
-            self.nlevo,
-            self.nlat,
-            self.nlon,
-            self.ntime,
-            missingValueIn,
-            missingMatch,
-            logYes,
-            levIn,
-            levOut,
-            dataIn,
-            dataOut)
-
-        # if no missing do not pass None
-        if missingMatch == 'none':
-            missingMatch = None
-        if missingValueIn == 1.333e33:
-            missingValueIn = None
-
-        if standardPosition == 0:
-            # transpose data to original order
-            dataOut = numpy.transpose(dataOut, inverseOrder)
-            dataOut = numpy.array(
-                dataOut.astype(
-                    numpy.float32),
-                numpy.float32)            # make contiguous
+        dataOut = interpolateLevels(dataIn, self.axisIn[:], self.axisOut[:], positionIn[2],
+                                    logYes, missingValueIn, missingMatch)
 
         if missingValueOut is not None:                # set the missing value in data to missingValueOut
 
@@ -415,6 +382,117 @@ class PressureRegridder:
         return dataOut
 
 
+def _levelIndices(levIn, levOut, logYes):
+    """Locate the output levels in the input levels.
+
+    Returns the index of the input level below each output level and the
+    interpolation weight of the level above, following cd_locate and
+    cd_linear_interpolation in _regridmodule.c. Output levels outside of
+    the input levels take the value of the nearest input level (weight 0).
+    """
+    x = numpy.asarray(levIn, dtype=numpy.float64).reshape(-1)
+    xp = numpy.asarray(levOut, dtype=numpy.float64).reshape(-1)
+    if logYes == 'yes':
+        x = numpy.log(x)
+        xp = numpy.log(xp)
+    n = len(x)
+    if x[n - 1] > x[0]:
+        below = numpy.searchsorted(x, xp, 'left') - 1
+    else:
+        below = n - 1 - numpy.searchsorted(x[::-1], xp, 'left')
+    inside = (below >= 0) & (below < n - 1)
+    lower = numpy.where(below < 0, 0, numpy.minimum(below, n - 1))
+    weight = numpy.zeros(len(xp), dtype=numpy.float64)
+    k = lower[inside]
+    weight[inside] = (xp[inside] - x[k]) / (x[k + 1] - x[k])
+    return lower, weight, inside
+
+
+def _missingThreshold(missingValueIn, missingMatch):
+    """Return the missing data test applied to the input values."""
+    missing = numpy.float32(missingValueIn)
+    if missingMatch == 'greater':
+        threshold = numpy.float32((0.99 if missingValueIn > 0.0 else 1.01) * missingValueIn)
+        return lambda y: y > threshold
+    elif missingMatch == 'equal':
+        return lambda y: y == missing
+    elif missingMatch == 'less':
+        threshold = numpy.float32((0.99 if missingValueIn < 0.0 else 1.01) * missingValueIn)
+        return lambda y: y < threshold
+    return None
+
+
+def interpolateLevels(dataIn, levIn, levOut, axis, logYes='yes',
+                      missingValueIn=None, missingMatch=None):
+    """Interpolate data along its level axis.
+
+    All the columns are interpolated at once, in the dimension order of the
+    input, so the data is neither transposed nor copied to float32 first.
+    The results are those of _regrid.rgdpressure.
+
+    Parameters
+    ----------
+    dataIn : numpy array
+    levIn : input levels, the length of dataIn along axis
+    levOut : output levels
+    axis : position of the level axis in dataIn
+    logYes : 'yes' to interpolate linearly in the log of the level, anything
+             else interpolates linearly in the level
+    missingValueIn : missing data value, or None
+    missingMatch : 'greater', 'equal', 'less' or None, the test used to
+                   detect missing data, see PressureRegridder.rgrd. An
+                   interpolated value depending on missing data is set to
+                   missingValueIn.
+
+    Returns
+    -------
+    float32 array with the shape of dataIn and len(levOut) levels.
+    """
+    dataIn = numpy.asarray(dataIn)
+    lower, weight, inside = _levelIndices(levIn, levOut, logYes)
+    ismissing = None
+    if missingValueIn is not None:
+        ismissing = _missingThreshold(missingValueIn, missingMatch)
+
+    outshape = list(dataIn.shape)
+    outshape[axis] = len(lower)
+    dataOut = numpy.empty(outshape, dtype=numpy.float32)
+
+    interior = numpy.nonzero(inside)[0]
+    exterior = numpy.nonzero(~inside)[0]
+    wshape = [1] * dataIn.ndim
+    wshape[axis] = len(interior)
+    w = weight[interior].reshape(wshape)
+
+    def levels(k):
+        return (slice(None),) * axis + (k,)
+
+    def interpolate(a, out):
+        if len(exterior) > 0:
+            out[levels(exterior)] = numpy.take(a, lower[exterior], axis)
+        if len(interior) > 0:
+            y0 = numpy.take(a, lower[interior], axis).astype(numpy.float32, copy=False)
+            y1 = numpy.take(a, lower[interior] + 1, axis).astype(numpy.float32, copy=False)
+            values = y0 + (y1 - y0) * w
+            if ismissing is not None:
+                values[ismissing(y0) | ismissing(y1)] = numpy.float32(missingValueIn)
+            out[levels(interior)] = values
+
+    # Split the data in blocks along the outermost other axis
+    others = [i for i in range(dataIn.ndim) if i != axis]
+    nthreads = _levelThreads
+    if nthreads > 1 and others and dataIn.shape[others[0]] > 1:
+        split = others[0]
+        size = dataIn.shape[split]
+        step = -(-size // nthreads)
+        blocks = [(slice(None),) * split + (slice(k, k + step),) for k in range(0, size, step)]
+        with ThreadPoolExecutor(max_workers=nthreads) as pool:
+            list(pool.map(lambda b: interpolate(dataIn[b], dataOut[b]), blocks))
+    else:
+        interpolate(dataIn, dataOut)
+    return dataOut
+
+
 def checkorder(positionIn):
     """
     Purpose :
@@ -6,9 +6,47 @@ import regrid2._scrip as _scrip
 from .error import RegridError
 import numpy
 from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 
 """Regrid support for nonrectangular grids, based on the SCRIP package."""
 
+# Number of threads used to apply the remap weights, 0 applies them in
+# the calling thread
+_scripThreads = 0
+# Maximum number of link values gathered at once when applying the weights
+_scripBlockSize = 1 << 22
+
+
+def setScripThreads(value):
+    """Set the number of threads used to apply SCRIP remap weights.
+
+       The leading (non-grid) dimensions of the input are split in blocks
+       which are regridded concurrently; numpy releases the GIL for the
+       gathers and sums involved.
+
+       Parameters
+       ----------
+       value : integer >= 0, 0 applies the weights in the calling thread.
+
+       Returns
+       -------
+       No return value.
+    """
+    global _scripThreads
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise RegridError("Error number of threads must be an integer >= 0")
+    _scripThreads = value
+
+
+def getScripThreads():
+    """Get the number of threads used to apply SCRIP remap weights.
+
+       Returns
+       -------
+       Number of threads.
+    """
+    return _scripThreads
+
 
 class ScripRegridder:
 
@@ -21,6 +59,97 @@ class ScripRegridder:
         self.inputGrid = inputGrid
         self.sourceFrac = sourceFrac
         self.destFrac = destFrac
+        self._sparse = None
+
+    def getLinkWeights(self):
+        """Return the weight of each link, one value per link."""
+        remapMatrix = numpy.asarray(self.remapMatrix, dtype=numpy.float64)
+        if remapMatrix.ndim == 1:
+            return remapMatrix
+        return remapMatrix.reshape((remapMatrix.shape[0], -1))[:, 0]
+
+    def getSparseMatrix(self):
+        """Return the remap weights as a compressed sparse row matrix.
+
+           The matrix is built on first use and kept with the regridder.
+
+           Returns
+           -------
+           (indptr, indices, weights) : row i (destination cell i) holds the
+           weights weights[indptr[i]:indptr[i+1]] of the source cells
+           indices[indptr[i]:indptr[i+1]], in link order.
+        """
+        if self._sparse is None:
+            noutput = self.outputGrid.size()
+            dst = numpy.asarray(self.destAddress).reshape(-1).astype(numpy.intp) - 1
+            src = numpy.asarray(self.sourceAddress).reshape(-1).astype(numpy.intp) - 1
+            weights = self.getLinkWeights()
+            order = numpy.argsort(dst, kind='stable')
+            indptr = numpy.zeros(noutput + 1, dtype=numpy.intp)
+            numpy.cumsum(numpy.bincount(dst, minlength=noutput), out=indptr[1:])
+            self._sparse = (indptr, src[order], weights[order])
+        return self._sparse
+
+    def _applyBlock(self, data, mask, output, outmask):
+        indptr, indices, weights = self.getSparseMatrix()
+        rows = numpy.nonzero(indptr[1:] > indptr[:-1])[0]
+        if len(rows) == 0:
+            return
+        starts = indptr[rows]
+        values = data[:, indices] * weights
+        if mask is not None:
+            linkmask = mask[:, indices]
+            values[linkmask] = 0.0
+            outmask[:, rows] = numpy.logical_or.reduceat(linkmask, starts, axis=1)
+        output[:, rows] = numpy.add.reduceat(values, starts, axis=1)
+
+    def apply(self, data, mask=None):
+        """Apply the remap weights.
+
+           Computes output = W.data for all the rows of data at once, with
+           W the sparse matrix returned by getSparseMatrix.
+
+           Parameters
+           ----------
+           data : array of shape (nextra, ninput)
+           mask : Optional boolean array of shape (nextra, ninput). Masked
+                  values do not contribute to the output.
+
+           Returns
+           -------
+           output : float64 array of shape (nextra, noutput)
+           outmask : boolean array of shape (nextra, noutput), True where
+                     a masked value contributed to the output cell, or
+                     None if mask is None.
+        """
+        nextra = data.shape[0]
+        noutput = self.outputGrid.size()
+        output = numpy.zeros((nextra, noutput), dtype=numpy.float64)
+        outmask = None
+        if mask is not None:
+            outmask = numpy.zeros((nextra, noutput), dtype=bool)
+        nlinks = max(len(self.getSparseMatrix()[1]), 1)
+        step = max(1, min(_scripBlockSize // nlinks,
+                          -(-nextra // max(_scripThreads, 1))))
+        blocks = [slice(k, min(k + step, nextra)) for k in range(0, nextra, step)]
+
+        def applyBlock(b):
+            self._applyBlock(data[b], None if mask is None else mask[b],
+                             output[b], None if outmask is None else outmask[b])
+
+        if _scripThreads > 1 and len(blocks) > 1:
+            with ThreadPoolExecutor(max_workers=_scripThreads) as pool:
+                list(pool.map(applyBlock, blocks))
+        else:
+            for b in blocks:
+                applyBlock(b)
+        return output, outmask
+
+    def regrid(self, input):
+        """
+        call regridder
+        """
+        return self.apply(input)[0]
 
     def __call__(self, input):
 
@@ -68,23 +197,28 @@ class ScripRegridder:
                     1),
             )
 
-        # If input is an numpy.ma, make it Numeric
-        if numpy.ma.isMaskedArray(input):
-            input = input.filled()
+        # Masked values are excluded from the sums, output cells which
+        # depend on them are masked
+        mask = numpy.ma.getmask(input)
+        data = numpy.ma.getdata(input)
 
         restoreShape = input.shape[:-rank]
         restoreLen = reduce(lambda x, y: x * y, restoreShape, 1)
-        oldshape = input.shape
         newshape = (restoreLen, gridsize)
-        input.shape = newshape
 
-        # Regrid
-        output = self.regrid(input)
+        # Regrid all the leading dimensions at once
+        if mask is numpy.ma.nomask:
+            output, outmask = self.apply(data.reshape(newshape))
+        else:
+            output, outmask = self.apply(data.reshape(newshape),
+                                         mask.reshape(newshape))
 
-        # Reshape output and restore input shape
-        input.shape = oldshape
+        # Reshape output
         outshape = restoreShape + outgridshape
         output.shape = outshape
+        if outmask is not None:
+            outmask.shape = outshape
+            output = numpy.ma.array(output, mask=outmask, copy=0)
 
         # If the input was a variable, so is the output
         if isvar:
@@ -147,6 +281,7 @@ class ConservativeRegridder(ScripRegridder):
             destFrac=destFrac)
         self.normalize = normalize
         self.normal = None
+        self._sparseNormal = None
         self.sourceArea = sourceArea
         self.destArea = destArea
 
@@ -156,36 +291,19 @@ class ConservativeRegridder(ScripRegridder):
     def getDestinationArea(self):
         return self.destArea
 
-    def regrid(self, input):
-        """
-        call regridder
-        """
-        if self.normal is None:
-            # print "On input, num_links = %d"%(len(self.sourceAddress))
-            # print "On input, nextra = %d"%(input.shape[0])
-            # print "On input, ninput = %d"%(input.shape[1])
-            # print "On input, noutput = %d"%(self.outputGrid.size())
-            # print "On input, shape(input) = %s"%`input.shape`
-            # print "On input, shape(output) = %s"%`self.outputGrid.shape`
-            # print "On input, shape(remap_matrix) = %s"%`self.remapMatrix.shape`
-            # print "On input, shape(src_address) = %s"%`self.sourceAddress.shape`
-            # print "On input, shape(dst_address) =
-            # %s"%`self.destAddress.shape`
-            result = _scrip.conserv_regrid(
-                self.outputGrid.size(),
-                input,
-                self.remapMatrix,
-                self.sourceAddress,
-                self.destAddress)
-        else:
-            result = _scrip.conserv_regrid_normal(
-                self.outputGrid.size(),
-                input,
-                self.remapMatrix,
-                self.sourceAddress,
-                self.destAddress,
-                self.normal)
-        return result
+    def getLinkWeights(self):
+        weights = ScripRegridder.getLinkWeights(self)
+        if self.normal is not None:
+            dst = numpy.asarray(self.destAddress).reshape(-1).astype(numpy.intp) - 1
+            weights = weights / numpy.asarray(self.normal, dtype=numpy.float64).reshape(-1)[dst]
+        return weights
+
+    def getSparseMatrix(self):
+        # The weights depend on the normalization array
+        if self._sparseNormal is not self.normal:
+            self._sparse = None
+            self._sparseNormal = self.normal
+        return ScripRegridder.getSparseMatrix(self)
 
 
 class BilinearRegridder(ScripRegridder):
@@ -202,15 +320,6 @@ class BilinearRegridder(ScripRegridder):
             sourceFrac=sourceFrac,
             destFrac=destFrac)
 
-    def regrid(self, input):
-        result = _scrip.bilinear_regrid(
-            self.outputGrid.size(),
-            input,
-            self.remapMatrix,
-            self.sourceAddress,
-            self.destAddress)
-        return result
-
 
 class BicubicRegridder(ScripRegridder):
     """Bicubic regrid.
@@ -358,15 +467,6 @@ class DistwgtRegridder(ScripRegridder):
             sourceFrac=sourceFrac,
             destFrac=destFrac)
 
-    def regrid(self, input):
-        result = _scrip.distwgt_regrid(
-            self.outputGrid.size(),
-            input,
-            self.remapMatrix,
-            self.sourceAddress,
-            self.destAddress)
-        return result
-
 
 def readRegridder(fileobj, mapMethod=None, checkGrid=1):
     """Read a regridder from an open fileobj.
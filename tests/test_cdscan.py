@@ -1,11 +1,13 @@
 import basetest
 import os
+import multiprocessing
 
 try:
     os.unlink(os.environ["HOME"] + "/.dodsrc")
 except Exception:
     pass
 from cdms2.cdscan import main as cdscan
+from cdms2 import cdscan as cdscanmodule
 import os
 import xml.etree.ElementTree as ET
 import cdat_info
@@ -37,6 +39,17 @@ def diffElements(el1, el2):
             return r
 
 
+def scanOutput(path):
+    """CDML text of a cdscan output, without the history which holds the
+    command line and time of the scan."""
+    root = ET.parse(path).getroot()
+    root.attrib.pop("history", None)
+    for attr in root.findall("attr"):
+        if attr.get("name") == "history":
+            root.remove(attr)
+    return ET.tostring(root)
+
+
 class TestCDScan(basetest.CDMSBaseTest):
     def testScan(self):
         argv = "cdscan -q -d test -x some_junk.xml u_2000.nc u_2001.nc u_2002.nc v_2000.nc v_2001.nc v_2002.nc".split()
@@ -51,6 +64,45 @@ class TestCDScan(basetest.CDMSBaseTest):
         self.assertIsNone(results)
         os.unlink("some_junk.xml")
 
+    def testParallelScan(self):
+        files = "u_2000.nc u_2001.nc u_2002.nc v_2000.nc v_2001.nc v_2002.nc"
+        pth = cdat_info.get_sampledata_path()
+        os.chdir(pth)
+        serial = os.path.join(self.tempdir, "serial.xml")
+        parallel = os.path.join(self.tempdir, "parallel.xml")
+        cdscan(("cdscan -q -d test -x %s %s" % (serial, files)).split())
+        cdscan(("cdscan -q -J 3 -d test -x %s %s" % (parallel, files)).split())
+        self.assertEqual(scanOutput(serial), scanOutput(parallel))
+
+        # The workers are stopped when the scan fails
+        with self.assertRaises(RuntimeError):
+            cdscan(("cdscan -q -J 3 -d test -x %s %s missing.nc" % (parallel, files)).split())
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def testManifest(self):
+        files = "u_2000.nc u_2001.nc u_2002.nc v_2000.nc v_2001.nc v_2002.nc"
+        pth = cdat_info.get_sampledata_path()
+        os.chdir(pth)
+        manifest = os.path.join(self.tempdir, "scan.manifest")
+        first = os.path.join(self.tempdir, "first.xml")
+        second = os.path.join(self.tempdir, "second.xml")
+        cdscan(("cdscan -q --manifest %s -d test -x %s %s" % (manifest, first, files)).split())
+        self.assertEqual(len(cdscanmodule.loadManifest(manifest, ([], False))), 6)
+
+        # Nothing changed, so no file may be read again
+        def scanFile(*args, **kargs):
+            raise AssertionError("file rescanned")
+        saveScanFile = cdscanmodule.scanFile
+        cdscanmodule.scanFile = scanFile
+        try:
+            cdscan(("cdscan -q --manifest %s -d test -x %s %s" % (manifest, second, files)).split())
+        finally:
+            cdscanmodule.scanFile = saveScanFile
+        self.assertEqual(scanOutput(first), scanOutput(second))
+
+        # Other scan options invalidate the manifest
+        self.assertEqual(cdscanmodule.loadManifest(manifest, ([], True)), {})
+
 
 if __name__ == "__main__":
     basetest.run()
@@ -1,4 +1,5 @@
 import cdms2
+import numpy
 import os
 import basetest
 
@@ -43,6 +44,37 @@ class TestCompression(basetest.CDMSBaseTest):
         f = self.getTempFile("crap_justdeflate9.nc", 'w')
         f.write(a)
 
+    def testChunkedRead(self):
+        a = cdms2.MV2.reshape(cdms2.MV2.arange(24 * 30 * 40, dtype='f'), (24, 30, 40))
+        a.id = 'a'
+        cdms2.setNetcdfDeflateFlag(1)
+        f = self.getTempFile("chunked.nc", 'w')
+        f.write(a)
+        f.close()
+
+        f = self.getTempFile("chunked.nc")
+        v = f['a']
+        chunks = v.getChunks()
+        self.assertEqual(len(chunks), 3)
+        cache = v.getChunkCache()
+        v.setChunkCache(2 * cache[0])
+        self.assertEqual(v.getChunkCache()[0], 2 * cache[0])
+
+        specs = [(slice(None, None, 4),),
+                 (slice(1, 20, 3), 5, slice(None, None, 7)),
+                 (slice(None, None, -5), slice(2, 29, 2))]
+        expected = [v[spec] for spec in specs]
+        cdms2.setChunkedReadFlag(1)
+        try:
+            self.assertTrue(cdms2.getChunkedReadFlag())
+            for spec, slab in zip(specs, expected):
+                self.assertTrue(numpy.ma.allequal(v[spec], slab))
+                self.assertTrue(numpy.ma.allequal(a.data[spec], slab))
+        finally:
+            cdms2.setChunkedReadFlag(0)
+        with self.assertRaises(cdms2.CDMSError):
+            cdms2.setChunkedReadFlag(2)
+
 
 if __name__ == "__main__":
     basetest.run()
@@ -172,6 +172,31 @@ class TestCurvilinearGrids(basetest.CDMSBaseTest):
         curveGrid = rectGrid.toCurveGrid()
         genGrid = curveGrid.toGenericGrid()
 
+    def testBinIndex(self):
+        from cdms2.bindex import BinIndex
+        f = self.getDataFile('sampleCurveGrid4.nc')
+        grid = f['sample'].getGrid()
+        index = grid.getIndex()
+
+        # Grids with the same coordinates share their index
+        self.assertTrue(f('sample').getGrid().getIndex() is index)
+
+        # Points are the same as a brute force search
+        lat = numpy.ma.filled(grid.getLatitude()[:]).ravel()
+        lon = numpy.mod(numpy.ma.filled(grid.getLongitude()[:]).ravel(), 360)
+        expected = numpy.nonzero((lat >= -10) & (lat <= 30) &
+                                 (lon >= 90) & (lon < 150))[0]
+        points = index.intersect((-10, 30, 'cc'), (90, 150, 'co'))
+        self.assertTrue(numpy.array_equal(points, expected))
+        points = index.intersect((-10, 30, 'cc'), (-270, -210, 'co'))
+        self.assertTrue(numpy.array_equal(points, expected))
+
+        path = os.path.join(self.tempdir, 'bindex.npz')
+        index.save(path)
+        loaded = BinIndex.load(path)
+        self.assertTrue(numpy.array_equal(
+            loaded.intersect((-10, 30, 'cc'), (90, 150, 'co')), expected))
+
 
 if __name__ == "__main__":
     basetest.run()
@@ -0,0 +1,40 @@
+import unittest
+import numpy
+import basetest
+
+try:
+    from cdms2 import dask_protocol
+except ImportError:
+    dask_protocol = None
+
+
+@unittest.skipIf(dask_protocol is None, "distributed is not installed")
+class TestDaskProtocol(basetest.CDMSBaseTest):
+
+    def testSerializeTV(self):
+        f = self.getDataFile('clt.nc')
+        clt = f('clt', time=slice(0, 3))
+        clt[0, 0, 0] = numpy.ma.masked
+        header, frames = dask_protocol.serialize_TV(clt)
+        # Only raw buffers are sent, no list of values in the header
+        self.assertNotIn('TV', header)
+        self.assertEqual(sum(len(fr) for fr in frames[:2]),
+                         clt.nbytes + clt.mask.nbytes)
+
+        new = dask_protocol.deserialize_TV(header, [bytes(fr) for fr in frames])
+        self.assertEqual(new.id, clt.id)
+        self.assertEqual(new.dtype, clt.dtype)
+        self.assertTrue(numpy.ma.allequal(new, clt))
+        self.assertTrue((new.mask == clt.mask).all())
+        self.assertEqual(new.units, clt.units)
+        for a, b in zip(new.getAxisList(), clt.getAxisList()):
+            self.assertEqual(a.id, b.id)
+            self.assertTrue(numpy.allclose(a[:], b[:]))
+            self.assertTrue(numpy.allclose(a.getBounds(), b.getBounds()))
+        self.assertEqual(new.getTime().units, clt.getTime().units)
+        self.assertTrue(new.getLatitude().isLatitude())
+        new[0, 0, 1] = 1.
+
+
+if __name__ == "__main__":
+    basetest.run()
@@ -10,6 +10,7 @@ import sys
 import shutil
 import basetest
 import cdat_info
+from cdms2.sliceut import PartitionIndex, slicePartition
 
 
 class TestDatasetFilemap(basetest.CDMSBaseTest):
@@ -90,6 +91,20 @@ class TestDatasetFilemap(basetest.CDMSBaseTest):
         tar2p = numpy.ma.concatenate((tar[numpy.newaxis, 54], tar[60:66]))
         self.assertTrue(numpy.ma.allclose(tar2, tar2p))
 
+        # The time partition is an index searched by bisection
+        self.assertIsInstance(tt._varpart_[0], PartitionIndex)
+        self.assertEqual(list(tt._varpart_[0])[4], [54, 55])
+
+    def testPartitionIndex(self):
+        partition = [[0, 12], [12, 24], [30, 31], [31, 48], [60, 72]]
+        index = PartitionIndex(reversed(partition))
+        self.assertEqual(len(index), 5)
+        self.assertEqual(list(index), partition)
+        for aSlice in [slice(0, 72), slice(5, 6), slice(24, 30),
+                       slice(10, 65, 7), slice(70, 2, -3), slice(47, 29, -1)]:
+            self.assertEqual(slicePartition(aSlice, index),
+                             slicePartition(aSlice, partition))
+
 
 if __name__ == "__main__":
     basetest.run()
@@ -3,6 +3,7 @@ import numpy
 import string
 import os
 import sys
+import cdat_info
 
 cdms2.setNetcdfUseParallelFlag(0)
 
@@ -82,6 +83,99 @@ class TestDatasetIO(basetest.CDMSBaseTest):
     def testStridePartitioned(self):
         strided = self.u[0:3:2, 0:16:2, 0:32:2]
 
+    def testParallelRead(self):
+        serial = self.u[:]
+        strided = self.u[0:3:2, 0:16:2, 0:32:2]
+        reversed_ = self.u[::-1]
+        cdms2.setDatasetReadWorkers(4)
+        try:
+            self.assertEqual(cdms2.getDatasetReadWorkers(), 4)
+            self.assertTrue(numpy.ma.allequal(self.u[:], serial))
+            self.assertTrue(numpy.ma.allequal(
+                self.u[0:3:2, 0:16:2, 0:32:2], strided))
+            self.assertTrue(numpy.ma.allequal(self.u[::-1], reversed_))
+        finally:
+            cdms2.setDatasetReadWorkers(0)
+        with self.assertRaises(cdms2.CDMSError):
+            cdms2.setDatasetReadWorkers(-1)
+
+    def testIterChunks(self):
+        full = self.u[:]
+        for prefetch in True, False:
+            blocks = list(self.u.iterchunks('time', 2, prefetch=prefetch))
+            self.assertEqual([b.shape[0] for b in blocks], [2, 1])
+            self.assertTrue(numpy.ma.allequal(
+                numpy.ma.concatenate(blocks), full))
+            times = numpy.concatenate([b.getTime()[:] for b in blocks])
+            self.assertTrue(numpy.allclose(times, self.u.getTime()[:]))
+            self.assertEqual(blocks[1].getTime().units,
+                             self.u.getTime().units)
+        blocks = list(self.u.iterchunks('longitude', 10))
+        self.assertEqual([b.shape[-1] for b in blocks], [10, 10, 10, 2])
+        self.assertTrue(numpy.allclose(blocks[3].getLongitude()[:],
+                                       self.u.getLongitude()[30:]))
+        with self.assertRaises(cdms2.CDMSError):
+            list(self.u.iterchunks('time', 0))
+        with self.assertRaises(cdms2.CDMSError):
+            list(self.u.iterchunks('nosuchaxis'))
+
+    def testFilePool(self):
+        first = self.u[:]
+        stats = self.file.getFilePoolStats()
+        self.assertGreater(stats['misses'], 0)
+        self.assertEqual(stats['size'], stats['misses'])
+        self.assertTrue(numpy.ma.allequal(self.u[:], first))
+        stats2 = self.file.getFilePoolStats()
+        self.assertEqual(stats2['misses'], stats['misses'])
+        self.assertEqual(stats2['hits'], stats['misses'])
+
+        self.file.setFilePoolSize(1)
+        self.assertEqual(self.file.getFilePoolSize(), 1)
+        self.assertEqual(self.file.getFilePoolStats()['size'], 1)
+        self.assertTrue(numpy.ma.allequal(self.u[:], first))
+        self.assertEqual(self.file.getFilePoolStats()['size'], 1)
+
+        self.file.close()
+        self.assertEqual(self.file.getFilePoolStats()['size'], 0)
+
+    def testCdmlParser(self):
+        from cdms2.CDMLParser import CDMLParser, ExpatCDMLParser
+        path = os.path.join(cdat_info.get_sampledata_path(), 'test.xml')
+        with open(path) as f:
+            text = f.read()
+
+        def tree(node):
+            return (node.tag, node.id, node.content,
+                    sorted((k, repr(v)) for k, v in node.attribute.items()),
+                    [tree(c) for c in node.children()])
+        roots = []
+        for parser in CDMLParser(), ExpatCDMLParser():
+            parser.feed(text)
+            parser.close()
+            roots.append(tree(parser.getRoot()))
+        self.assertEqual(roots[0], roots[1])
+
+    def testCdmlCache(self):
+        path = os.path.join(cdat_info.get_sampledata_path(), 'test.xml')
+        cachedir = os.path.join(self.tempdir, 'cdml')
+        cdms2.setCdmlCacheDirectory(cachedir)
+        parseCDML = cdms2.dataset.parseCDML
+        try:
+            self.assertEqual(cdms2.getCdmlCacheDirectory(), cachedir)
+            f = self.getFile(path)
+            self.assertEqual(len(os.listdir(cachedir)), 1)
+
+            # The second open must not parse the XML text
+            def fail(text):
+                raise AssertionError("CDML parsed again")
+            cdms2.dataset.parseCDML = fail
+            g = self.getFile(path)
+            self.assertEqual(sorted(g.variables), sorted(f.variables))
+            self.assertTrue(numpy.ma.allequal(g['u'][:], self.u[:]))
+        finally:
+            cdms2.dataset.parseCDML = parseCDML
+            cdms2.setCdmlCacheDirectory(None)
+
     def testClosedOperations(self):
         u = self.u
         transient_u = self.u[:]
@@ -3,6 +3,7 @@
 # Test extended wraparound
 
 import cdms2
+import numpy
 import os
 import sys
 import basetest
@@ -120,6 +121,47 @@ class TestExtendedWraparound(basetest.CDMSBaseTest):
         self.assertWrapsCorrectly(lev, (0.05035, 0.05035), (0, 1))
         self.assertWrapsCorrectly(lev, (0.1009, 0.1009), (1, 2))
 
+    def testWrappedSubRegion(self):
+        f = self.getDataFile('test.xml')
+        u = f['u']
+        full = u[:]
+
+        # Small request, read piece by piece
+        region = u.subRegion(longitude=(-90, 90))
+        expected = numpy.ma.concatenate(
+            (full[..., 24:32], full[..., 0:9]), axis=-1)
+        self.assertTrue(numpy.ma.allequal(region, expected))
+        self.assertEqual(region.getLongitude()[0], -90.)
+        self.assertEqual(region.getLongitude()[-1], 90.)
+
+        # Whole circle, read once and rolled in memory
+        region = u.subRegion(longitude=(-180, 180, 'co'))
+        expected = numpy.ma.concatenate(
+            (full[..., 16:32], full[..., 0:16]), axis=-1)
+        self.assertTrue(numpy.ma.allequal(region, expected))
+        self.assertEqual(region.getLongitude()[0], -180.)
+
+    def testSearchInvalidation(self):
+        lon = cdms2.createAxis(numpy.arange(0., 360., 10.), id='lon')
+        lon.designateLongitude()
+        self.assertEqual(lon.mapIntervalExt((20., 40.)), (2, 5, 1))
+        self.assertEqual(lon.mapIntervalExt((-20., 20.)), (-2, 3, 1))
+        search = lon._getSearch()
+        self.assertTrue(lon._getSearch() is search)
+
+        # Shallow copies share the search structure and its invalidation
+        copy = lon.shallowCopy()
+        lon.assignValue(numpy.arange(5., 365., 10.))
+        self.assertEqual(lon.mapIntervalExt((20., 40.)), (2, 4, 1))
+        self.assertEqual(copy.mapIntervalExt((20., 40.)), (2, 4, 1))
+
+        self.assertEqual(lon.mapIntervalExt((24.5, 40., 'ccb')), (2, 5, 1))
+        bounds = lon.getBounds()
+        bounds[2, 1] = 24.
+        bounds[3, 0] = 24.
+        lon.setBounds(bounds)
+        self.assertEqual(lon.mapIntervalExt((24.5, 40., 'ccb')), (3, 5, 1))
+
 
 if __name__ == "__main__":
     basetest.run()
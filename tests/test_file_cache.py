@@ -0,0 +1,89 @@
+import os
+import multiprocessing
+import cdms2
+import cdat_info
+import basetest
+from cdms2 import cache
+
+
+def _fetch(args):
+    directory, url = args
+    c = cache.Cache(directory)
+    return c.getFile(url, ('dataset', os.path.basename(url)))
+
+
+class TestFileCache(basetest.CDMSBaseTest):
+
+    def setUp(self):
+        super(TestFileCache, self).setUp()
+        # A local directory stands in for the remote server
+        self.remote = os.path.join(self.tempdir, 'remote')
+        os.mkdir(self.remote)
+        for i in range(4):
+            with open(os.path.join(self.remote, 'file%d.nc' % i), 'wb') as f:
+                f.write(b'%d' % i * 1000)
+        self.direc = os.path.join(self.tempdir, 'cache')
+
+    def url(self, i):
+        return 'file://' + os.path.join(self.remote, 'file%d.nc' % i)
+
+    def testGetFile(self):
+        c = cache.Cache(self.direc)
+        self.assertIsNone(c.get(('dataset', 'file0.nc')))
+        path = c.getFile(self.url(0), ('dataset', 'file0.nc'))
+        self.assertEqual(os.path.dirname(path), c.direc)
+        self.assertEqual(c.get(('dataset', 'file0.nc')), path)
+        self.assertEqual(c.getFile(self.url(0), ('dataset', 'file0.nc')), path)
+
+        # Another cache object on the same directory shares the index
+        self.assertEqual(cache.Cache(self.direc).get(('dataset', 'file0.nc')), path)
+
+        # A file removed behind the cache is fetched again
+        os.remove(path)
+        path = c.getFile(self.url(0), ('dataset', 'file0.nc'))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'0' * 1000)
+
+        c.delete()
+        self.assertFalse(os.path.exists(path))
+
+        # Cached files keep their extension and can be opened
+        c = cache.Cache(self.direc)
+        url = 'file://' + os.path.join(cdat_info.get_sampledata_path(), 'clt.nc')
+        f = self.getFile(c.getFile(url, ('dataset', 'clt.nc')))
+        self.assertTrue('clt' in f.variables)
+
+    def testEviction(self):
+        c = cache.Cache(self.direc, maxsize=2500)
+        paths = [c.getFile(self.url(0), ('dataset', 0)),
+                 c.getFile(self.url(1), ('dataset', 1))]
+        # Use file0.nc, file1.nc is now the least recently used
+        os.utime(paths[1], (0, 0))
+        self.assertEqual(c.get(('dataset', 0)), paths[0])
+        c.getFile(self.url(2), ('dataset', 2))
+        self.assertEqual(c.get(('dataset', 0)), paths[0])
+        self.assertIsNone(c.get(('dataset', 1)))
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertIsNotNone(c.get(('dataset', 2)))
+
+        with self.assertRaises(cdms2.CDMSError):
+            cdms2.setFileCacheSize(-1)
+
+    def testConcurrentGetFile(self):
+        urls = [self.url(i % 2) for i in range(8)]
+        pool = multiprocessing.Pool(4)
+        try:
+            paths = pool.map(_fetch, [(self.direc, url) for url in urls])
+        finally:
+            pool.close()
+            pool.join()
+        # Each file was copied once and all processes got the same copy
+        self.assertEqual(len(set(paths)), 2)
+        for url, path in zip(urls, paths):
+            self.assertEqual(path, paths[urls.index(url)])
+        cached = [name for name in os.listdir(self.direc) if name.endswith('.nc')]
+        self.assertEqual(len(cached), 2)
+
+
+if __name__ == "__main__":
+    basetest.run()
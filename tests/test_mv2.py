@@ -66,6 +66,41 @@ class TestMV2(basetest.CDMSBaseTest):
         x2 = 1.0 - self.u_file
         self.assertTrue(MV2.allequal(x1 + x2[0], 2.0))
 
+    def testSharedDomain(self):
+        x1 = self.u_transient + 1.0
+        x2 = x1 * 2.0
+        lat1 = x1.getLatitude()
+        lat2 = x2.getLatitude()
+        self.assertFalse(lat1 is lat2)
+        self.assertTrue(lat2.sharesValues(lat1))
+        ilat = x1.getAxisIds().index(lat1.id)
+        self.assertTrue(MV2.commonDomain(x1, x2)[ilat] is lat1)
+        # Attributes of the axis copies are independent
+        lat2.units = "degrees"
+        self.assertEqual(lat1.units, self.u_lat.units)
+        self.assertTrue(numpy.allclose(lat2.getBounds(), lat1.getBounds()))
+
+    def testSharedCurveGrid(self):
+        from cdms2.coord import TransientAxis2D
+        from cdms2.hgrid import TransientCurveGrid
+        y = cdms2.createAxis(numpy.arange(3.), id="y")
+        x = cdms2.createAxis(numpy.arange(4.), id="x")
+        lat = TransientAxis2D(numpy.ones((3, 4)), axes=(y, x), id="lat")
+        lon = TransientAxis2D(numpy.ones((3, 4)) * 2., axes=(y, x), id="lon")
+        grid = TransientCurveGrid(lat, lon, id="grid")
+        t = cdms2.createAxis([0., 1.], id="time")
+        c = cdms2.createVariable(numpy.ones((2, 3, 4)), axes=[t, y, x], grid=grid, id="c")
+
+        d = (c + 1.) * (c + 2.)
+        self.assertTrue(d.getGrid() is grid)
+        self.assertEqual(d.getAxisIds(), ["time", "y", "x"])
+        self.assertTrue(d.getAxis(0).sharesValues(t))
+        self.assertTrue(MV2.allequal(d, 6.))
+        # Copies of the grid axes sharing their values keep the grid
+        copies = [axis.shallowCopy() for axis in c.getAxisList()]
+        self.assertTrue(MV2.commonGrid(c, d, copies) is grid)
+        self.assertTrue(MV2.commonGrid(c, d, [t, y, cdms2.createAxis(numpy.arange(4.))]) is None)
+
     def testNegAbs(self):
         x11 = -self.other_u_file
         x12 = MV2.absolute(self.u_file)
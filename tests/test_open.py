@@ -1,9 +1,59 @@
+import os
 import basetest
 import cdms2
+import numpy
 
 class TestOpenFile(basetest.CDMSBaseTest):
     def test_write_to_file(self):
         f = cdms2.open("bad.nc", "w")
 
+    def test_lazy_open(self):
+        eager = self.getDataFile("clt.nc")
+        cdms2.setLazyOpenFlag(1)
+        try:
+            self.assertTrue(cdms2.getLazyOpenFlag())
+            lazy = self.getDataFile("clt.nc")
+        finally:
+            cdms2.setLazyOpenFlag(0)
+        self.assertEqual(sorted(lazy.variables.keys()),
+                         sorted(eager.variables.keys()))
+        self.assertEqual(list(lazy.axes.keys()), list(eager.axes.keys()))
+        self.assertEqual(lazy.variables.builtValues(), [])
+
+        clt = lazy["clt"]
+        # Only the variables up to clt, whose grids are named first
+        built = lazy.variables.builtValues()
+        self.assertTrue(clt in built)
+        self.assertTrue(len(built) <= list(lazy.variables.keys()).index("clt") + 1)
+        self.assertEqual(clt.getAxisIds(), eager["clt"].getAxisIds())
+        self.assertEqual(clt.getGrid().id, eager["clt"].getGrid().id)
+        self.assertTrue(numpy.ma.allequal(clt[0], eager["clt"][0]))
+        self.assertEqual(sorted(lazy.grids.keys()), sorted(eager.grids.keys()))
+
+    def test_lazy_grid_names(self):
+        # Two grids of the same shape, named in file order
+        path = os.path.join(self.tempdir, "grids.nc")
+        f = cdms2.open(path, "w")
+        for i in 1, 2:
+            lat = cdms2.createAxis(numpy.array([-30., 0., 30.]) + i, id="lat%d" % i)
+            lat.designateLatitude()
+            lat.units = "degrees_north"
+            lon = cdms2.createAxis(numpy.array([0., 90., 180., 270.]) + i, id="lon%d" % i)
+            lon.designateLongitude()
+            lon.units = "degrees_east"
+            f.write(cdms2.createVariable(numpy.ones((3, 4)), axes=[lat, lon], id="v%d" % i))
+        f.close()
+
+        eager = self.getFile(path)
+        cdms2.setLazyOpenFlag(1)
+        try:
+            lazy = self.getFile(path)
+        finally:
+            cdms2.setLazyOpenFlag(0)
+        self.assertEqual(lazy["v2"].getGrid().id, eager["v2"].getGrid().id)
+        self.assertEqual(lazy["v1"].getGrid().id, eager["v1"].getGrid().id)
+        self.assertNotEqual(lazy["v1"].getGrid().id, lazy["v2"].getGrid().id)
+        self.assertEqual(sorted(lazy.grids.keys()), sorted(eager.grids.keys()))
+
 if __name__ == "__main__":
     basetest.run()
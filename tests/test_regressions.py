@@ -64,6 +64,36 @@ class TestRegressions(basetest.CDMSBaseTest):
             dt[0], datetime.datetime(
                 2014, 10, 6, 10, 12, 23, 813))
 
+    def testAxisTimeConversions(self):
+        values = numpy.arange(-40., 800., 6.25)
+        for units in ["hours since 1979-1-1 6:0:0", "days since 1850-1-1",
+                      "months since 2000-1-1"]:
+            for calendar in [cdtime.StandardCalendar, cdtime.MixedCalendar,
+                             cdtime.NoLeapCalendar, cdtime.Calendar360,
+                             cdtime.JulianCalendar]:
+                ax = cdms2.createAxis(values, id="time")
+                ax.units = units
+                ax.designateTime(calendar=calendar)
+                expected = [cdtime.reltime(v, units).tocomp(calendar) for v in values]
+                comptimes = ax.asComponentTime()
+                self.assertEqual(len(comptimes), len(expected))
+                for c, e in zip(comptimes, expected):
+                    self.assertEqual((c.year, c.month, c.day, c.hour, c.minute),
+                                     (e.year, e.month, e.day, e.hour, e.minute))
+                    self.assertAlmostEqual(c.second, e.second, places=4)
+                self.assertEqual(ax.asDTGTime(),
+                                 ["%04d%02d%02d%02d" % (e.year, e.month, e.day, e.hour) for e in expected])
+
+        # Cached results follow changes of the axis values and units
+        ax = cdms2.createAxis([0., 1.], id="time")
+        ax.units = "days since 2000-1-1"
+        ax.designateTime()
+        self.assertEqual(ax.asdatetime()[1], datetime.datetime(2000, 1, 2))
+        ax[1] = 2.
+        self.assertEqual(ax.asdatetime()[1], datetime.datetime(2000, 1, 3))
+        ax.units = "hours since 2000-1-1"
+        self.assertEqual(ax.asdatetime()[1], datetime.datetime(2000, 1, 1, 2))
+
     def testFileURI(self):
         pth = os.path.join(cdat_info.get_sampledata_path(), "clt.nc")
         f = cdms2.open("file://" + pth)
@@ -220,6 +250,61 @@ class TestRegressions(basetest.CDMSBaseTest):
         self.assertTrue(s0.getAxis(0).isLatitude())
         self.assertTrue(s0.getAxis(1).isLongitude())
 
+    def testToDataFrame(self):
+        try:
+            import pandas  # noqa
+        except ImportError:
+            self.skipTest("pandas is not installed")
+        f = self.getFile(cdat_info.get_sampledata_path() + "/clt.nc")
+        s = f("clt", time=slice(0, 2))
+        df = s.to_dataframe()
+        self.assertEqual(list(df.index.names), s.getAxisIds())
+        self.assertEqual(df.index.levels[0][1],
+                         numpy.datetime64(s.getTime().asdatetime()[1]))
+        self.assertTrue(numpy.shares_memory(df[s.id].to_numpy(), s.data))
+        s[0, 0, 0] = MV2.masked
+        df = s.to_dataframe()
+        self.assertTrue(numpy.isnan(df[s.id].iloc[0]))
+        self.assertTrue(numpy.allclose(df[s.id].iloc[1:], s.compressed()))
+
+    def testToXarray(self):
+        try:
+            import xarray  # noqa
+        except ImportError:
+            self.skipTest("xarray is not installed")
+        f = self.getFile(cdat_info.get_sampledata_path() + "/clt.nc")
+        s = f("clt", time=slice(0, 2))
+        da = s.to_xarray()
+        self.assertEqual(da.name, s.id)
+        self.assertEqual(list(da.dims), s.getAxisIds())
+        self.assertEqual(da.attrs['units'], s.units)
+        lat = s.getLatitude()
+        self.assertTrue(numpy.allclose(da.coords[lat.id].values, lat[:]))
+        self.assertEqual(da.coords[lat.id].attrs['units'], lat.units)
+        self.assertTrue(numpy.allclose(da.coords[s.getLongitude().id].values,
+                                       s.getLongitude()[:]))
+        self.assertEqual(da.coords[s.getTime().id].values[1],
+                         numpy.datetime64(s.getTime().asdatetime()[1]))
+        self.assertTrue(numpy.shares_memory(da.values, s.data))
+        s[0, 0, 0] = MV2.masked
+        da = s.to_xarray()
+        self.assertFalse(numpy.shares_memory(da.values, s.data))
+        self.assertTrue(numpy.isnan(da.values[0, 0, 0]))
+        self.assertEqual(int(numpy.isnan(da.values).sum()), 1)
+        self.assertTrue(numpy.allclose(da.values.ravel()[1:], s.compressed()))
+
+    def testToVisitVTK(self):
+        f = self.getFile(cdat_info.get_sampledata_path() + "/clt.nc")
+        s = f("clt", time=slice(0, 3))
+        filename = os.path.join(self.tempdir, "clt.vtk")
+        s.toVisit(filename, format='VTK')
+        for i in range(3):
+            with open(os.path.join(self.tempdir, "clt_%d.vtk" % i), "rb") as vtk:
+                header = vtk.read(200)
+            self.assertTrue(b"BINARY\nDATASET STRUCTURED_GRID\n" in header)
+            self.assertTrue(b"DIMENSIONS %d %d 1\n" % (s.shape[2], s.shape[1])
+                            in header)
+
     def testReshapeMaskedAverage(self):
         a = MV2.arange(100)
         a = MV2.reshape(a, (10, 10))
@@ -9,6 +9,32 @@ import numpy
 import basetest
 import cdat_info
 
+
+class BlockMeanTool(object):
+    """Regrid tool averaging 2x2 blocks, counts the mask interpolations."""
+
+    def __init__(self):
+        self.nmasks = 0
+
+    def apply(self, srcData, dstData, rootPe=None, globalIndexing=True,
+              srcDataMask=None):
+        # the masks are interpolated with the valid points as data mask
+        if srcDataMask is not None and (srcData + srcDataMask == 1).all():
+            self.nmasks += 1
+        ny, nx = dstData.shape
+        dstData[...] = srcData.reshape((ny, 2, nx, 2)).mean(axis=(1, 3))
+
+
+class BlockMeanRegrid(regrid.GenericRegrid):
+    """GenericRegrid using BlockMeanTool, can be rebuilt in worker processes."""
+
+    def __init__(self, regridMethod):
+        self.nGridDims = 2
+        self.regridMethod = regridMethod
+        self.tool = BlockMeanTool()
+        self._initArgs = ((regridMethod,), {})
+
+
 class TestRegridding(basetest.CDMSBaseTest):
 
     def testRegrid2(self):
@@ -141,5 +167,94 @@ class TestRegridding(basetest.CDMSBaseTest):
         # fails
         s2 =  s.regrid(g, regridTool=u"esmf", regridMethod=u"linear")
 
+    def testPressureRegridOrder(self):
+        levin = cdms2.createAxis(numpy.array([1000., 850., 500., 200., 50.]), id='level')
+        levout = cdms2.createAxis(numpy.array([1100., 925., 300., 100., 10.]), id='level')
+        numpy.random.seed(5)
+        data = numpy.random.random((4, 5, 6, 7)).astype(numpy.float32)
+        data[1, 2, 3, 4] = 1.e20
+        regridder = regrid.PressureRegridder(levin, levout)
+        for method in "log", "linear":
+            expected = regridder(data, missing=1.e20, order="tzyx", method=method)
+            self.assertEqual(expected.shape, (4, 5, 6, 7))
+            # Nearest input level outside of the input range
+            self.assertTrue(numpy.ma.allequal(expected[:, 0], data[:, 0]))
+            self.assertTrue(numpy.ma.allequal(expected[:, 4], data[:, 4]))
+            # Missing data only spoils the output levels next to it
+            self.assertEqual(expected[1, 2, 3, 4], numpy.float32(1.e20))
+            self.assertNotEqual(expected[1, 1, 3, 4], numpy.float32(1.e20))
+            for threads in 0, 3:
+                regrid.setLevelRegridThreads(threads)
+                result = regridder(numpy.transpose(data, (2, 0, 3, 1)), missing=1.e20,
+                                   order="ytxz", method=method)
+                self.assertTrue(numpy.ma.allequal(numpy.transpose(result, (1, 3, 0, 2)), expected))
+        regrid.setLevelRegridThreads(0)
+
+    def testScripSparseApply(self):
+        outgrid = cdms2.createUniformGrid(-90., 10, 20., 0., 12, 30.)
+        nin = 50
+        nout = outgrid.size()
+        numpy.random.seed(3)
+        src = numpy.random.randint(1, nin + 1, 400).astype(numpy.int32)
+        dst = numpy.random.randint(1, nout, 400).astype(numpy.int32)
+        weights = numpy.random.random((400, 3))
+        dense = numpy.zeros((nout, nin))
+        numpy.add.at(dense, (dst - 1, src - 1), weights[:, 0])
+
+        data = numpy.random.random((4, 3, nin))
+        for threads in 0, 3:
+            regrid.setScripThreads(threads)
+            regridder = regrid.ConservativeRegridder(outgrid, weights, src, dst)
+            out = regridder(data)
+            self.assertEqual(out.shape, (4, 3, nout))
+            self.assertTrue(numpy.allclose(out, numpy.dot(data, dense.T)))
+        regrid.setScripThreads(0)
+
+        # Masked values do not contribute, and mask the cells they map to
+        masked = numpy.ma.masked_greater(data, 0.95)
+        out = regridder(masked)
+        self.assertTrue(numpy.allclose(out.data, numpy.dot(masked.filled(0.), dense.T)))
+        outmask = numpy.dot(numpy.ma.getmaskarray(masked).astype(float), (dense > 0).T) > 0
+        self.assertTrue((numpy.ma.getmaskarray(out) == outmask).all())
+
+        with self.assertRaises(regrid.RegridError):
+            regrid.setScripThreads(-1)
+
+    def testGenericRegridSlices(self):
+        numpy.random.seed(7)
+        data = numpy.random.random((2, 3, 4, 6))
+        data[:, :, 1, 2] = 1.e20
+        for method in "linear", "conservative":
+            regridder = BlockMeanRegrid(method)
+            expected = numpy.zeros((2, 3, 2, 3))
+            for i in range(2):
+                for j in range(3):
+                    regridder.apply(data[i:i + 1, j], expected[i:i + 1, j],
+                                    missingValue=1.e20)
+            self.assertEqual(expected[0, 0, 0, 1] == 1.e20, method == "linear")
+
+            # All the slices share a mask, which is interpolated once
+            for processes in 0, 2:
+                regrid.setGenericRegridProcesses(processes)
+                regridder.tool.nmasks = 0
+                result = numpy.zeros((2, 3, 2, 3))
+                regridder.apply(data, result, missingValue=1.e20)
+                self.assertEqual(regridder.tool.nmasks, 1)
+                self.assertTrue(numpy.array_equal(result, expected))
+            regrid.setGenericRegridProcesses(0)
+
+        # Slices with different masks get their own mask
+        data[1, 2, 0, 0] = 1.e20
+        regridder = BlockMeanRegrid("linear")
+        result = numpy.zeros((2, 3, 2, 3))
+        regridder.apply(data, result, missingValue=1.e20)
+        self.assertEqual(regridder.tool.nmasks, 2)
+        self.assertEqual(result[1, 2, 0, 0], 1.e20)
+        self.assertNotEqual(result[1, 1, 0, 0], 1.e20)
+
+        with self.assertRaises(regrid.RegridError):
+            regrid.setGenericRegridProcesses(-1)
+
+
 if __name__ == "__main__":
     basetest.run()
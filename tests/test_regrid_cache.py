@@ -0,0 +1,111 @@
+import os
+import time
+import threading
+import cdms2
+import numpy
+import basetest
+from cdms2 import regridcache
+
+
+class TestRegridCache(basetest.CDMSBaseTest):
+
+    def setUp(self):
+        super(TestRegridCache, self).setUp()
+        cdms2.clearRegridCache()
+
+    def tearDown(self):
+        cdms2.setRegridCacheDirectory(None)
+        cdms2.clearRegridCache()
+        super(TestRegridCache, self).tearDown()
+
+    def testMemoryCache(self):
+        outgrid = cdms2.createGaussianGrid(32)
+        f = self.getDataFile('readonly.nc')
+        u = f.variables['u']
+
+        first = u.regrid(outgrid, regridTool='regrid2')
+        stats = cdms2.getRegridCacheStats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 0)
+
+        second = u.regrid(outgrid, regridTool='regrid2')
+        stats = cdms2.getRegridCacheStats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertTrue(numpy.ma.allclose(first, second))
+
+        # A different destination grid must not hit
+        u.regrid(cdms2.createGaussianGrid(16), regridTool='regrid2')
+        self.assertEqual(cdms2.getRegridCacheStats()['misses'], 2)
+
+    def testDiskCache(self):
+        outgrid = cdms2.createGaussianGrid(32)
+        f = self.getDataFile('readonly.nc')
+        u = f.variables['u']
+
+        cdms2.setRegridCacheDirectory(os.path.join(self.tempdir, 'weights'))
+        first = u.regrid(outgrid, regridTool='regrid2')
+        self.assertEqual(len(os.listdir(cdms2.getRegridCacheDirectory())), 1)
+
+        cdms2.clearRegridCache()
+        second = u.regrid(outgrid, regridTool='regrid2')
+        stats = cdms2.getRegridCacheStats()
+        self.assertEqual(stats['diskHits'], 1)
+        self.assertEqual(stats['misses'], 0)
+        self.assertTrue(numpy.ma.allclose(first, second))
+
+    def testDisable(self):
+        outgrid = cdms2.createGaussianGrid(32)
+        f = self.getDataFile('readonly.nc')
+        u = f.variables['u']
+        size = cdms2.getRegridCacheSize()
+        cdms2.setRegridCacheSize(0)
+        try:
+            u.regrid(outgrid, regridTool='regrid2')
+            u.regrid(outgrid, regridTool='regrid2')
+            stats = cdms2.getRegridCacheStats()
+            self.assertEqual(stats['misses'], 2)
+            self.assertEqual(stats['size'], 0)
+        finally:
+            cdms2.setRegridCacheSize(size)
+
+    def testKeywords(self):
+        ingrid = cdms2.createUniformGrid(-80., 9, 20., 0., 18, 20.)
+        outgrid = cdms2.createUniformGrid(-80., 5, 40., 0., 9, 40.)
+
+        def key(**keywords):
+            return regridcache.regridKey(ingrid, outgrid, 'esmf', 'linear',
+                                         **keywords)
+        self.assertEqual(key(opt=numpy.array([1, 2])), key(opt=numpy.array([1, 2])))
+        self.assertNotEqual(key(opt=numpy.array([1, 2])), key(opt=numpy.array([1, 3])))
+        self.assertNotEqual(key(opt=(1, 2)), key(opt=(1, 2, 3)))
+        self.assertNotEqual(key(opt=[1., 2.]), key(opt=[1, 2]))
+        # Values which cannot be hashed bypass the cache
+        self.assertIsNone(key(opt={'a': 1}))
+        regridcache.getRegridder(None, object)
+        regridcache.getRegridder(None, object)
+        stats = cdms2.getRegridCacheStats()
+        self.assertEqual((stats['misses'], stats['size']), (2, 0))
+
+    def testUseRegridder(self):
+        # Calls sharing a regridder do not overlap
+        calls = []
+
+        def use():
+            with regridcache.useRegridder('key', dict) as regridder:
+                regridder['active'] = regridder.get('active', 0) + 1
+                calls.append(regridder['active'])
+                time.sleep(0.01)
+                regridder['active'] -= 1
+        threads = [threading.Thread(target=use) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(calls, [1, 1, 1, 1])
+        stats = cdms2.getRegridCacheStats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 3))
+
+
+if __name__ == "__main__":
+    basetest.run()
@@ -194,5 +194,35 @@ class TestTransientVariables(basetest.CDMSBaseTest):
         v_dim_attr = v.getdimattribute(0, 'bounds')
         self.assertTrue(numpy.array_equal(v_dim_attr, t_bounds))
 
+    def testSharedAttributes(self):
+        v = cdms2.createVariable(numpy.ones((3, 4)), id='v',
+                                 attributes={'units': 'K', 'long_name': 'ones'})
+        w = numpy.ma.MaskedArray.__getitem__(v, 1)
+        self.assertEqual((w.id, w.units, w.long_name), ('v', 'K', 'ones'))
+        self.assertEqual(w.attributes['units'], 'K')
+        self.assertTrue('units' in dir(v))
+        self.assertTrue('long_name' in dir(w))
+        self.assertEqual(len(w.getAxis(0)), 4)
+
+        # Changes are not seen by the other variables
+        w.units = 'C'
+        v.long_name = 'one'
+        self.assertEqual((v.units, w.units), ('K', 'C'))
+        self.assertEqual((v.long_name, w.long_name), ('one', 'ones'))
+        del w.long_name
+        self.assertFalse(hasattr(w, 'long_name'))
+        self.assertFalse('long_name' in w.attributes)
+        self.assertEqual(v.long_name, 'one')
+        del v.units
+        self.assertFalse(hasattr(v, 'units'))
+        self.assertEqual(w.units, 'C')
+        with self.assertRaises(AttributeError):
+            v.missing_attribute
+
+        # Slices and ufunc results keep the attributes
+        s = (v + 1)[1:]
+        self.assertEqual(s.long_name, 'one')
+        self.assertEqual(v[1].long_name, 'one')
+
 if __name__ == "__main__":
     basetest.run()
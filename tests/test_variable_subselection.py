@@ -154,6 +154,59 @@ class TestVariableSubselection(basetest.CDMSBaseTest):
         #with self.assertRaises(cdms2.SelectorError):
         #    s3 = self.var.subSlice(required='lumbarsupport')
 
+    def testSelectorPlan(self):
+        u = self.file['u']
+        sel = cdms2.selectors.Selector(cdms2.latitude(-42., 42.) & cdms2.latitude(-20., 20.),
+                                       cdms2.timeslice(1, None), slice(None, None, -1))
+        plan = sel.plan(self.var)
+        self.assertEqual(len(plan[0]), self.var.rank())
+        # Cached per selector and domain, across variables sharing the axes
+        self.assertTrue(sel.plan(self.var) is plan)
+        self.assertTrue(sel.plan(u) is sel.plan(u))
+        # Wraparound is read round by round
+        self.assertTrue(cdms2.selectors.Selector(longitude=(-180, 180)).plan(self.var) is None)
+
+        samp = self.getDataFile('sampleCurveGrid4.nc')['sample']
+        cases = [(self.var, (sel,), {}),
+                 (self.var, (cdms2.timeslice(0, 2), cdms2.timeslice(None, None, -1)),
+                  {'latitude': (-42., 42.), 'squeeze': 1}),
+                 (self.var, (), {'longitude': (-180, 180), 'order': 'yxt'}),
+                 (u, (sel,), {}),
+                 (samp, (slice(2, None, 3),), {'lat': (-10, 30), 'lon': (90, 150)})]
+        for var, args, kwargs in cases:
+            fused = var(*args, **kwargs)
+            cdms2.setSelectorFusionFlag(0)
+            try:
+                expected = var(*args, **kwargs)
+            finally:
+                cdms2.setSelectorFusionFlag(1)
+            self.assertEqual(fused.shape, expected.shape)
+            self.assertTrue(numpy.ma.allequal(fused, expected))
+            self.assertTrue(numpy.array_equal(numpy.ma.getmaskarray(fused),
+                                              numpy.ma.getmaskarray(expected)))
+            for a, b in zip(fused.getAxisList(), expected.getAxisList()):
+                self.assertTrue(numpy.array_equal(a[:], b[:]))
+
+    def testSelectorPlanAxisChange(self):
+        lat = cdms2.createAxis(numpy.arange(-90., 91., 10.), id='lat')
+        lat.designateLatitude()
+        data = cdms2.createVariable(numpy.ones(len(lat)), axes=[lat], id='v')
+        f = self.getTempFile('plan_axis_change.nc', 'w')
+        f.write(data)
+        f.close()
+        f = self.getTempFile('plan_axis_change.nc', 'r+')
+        var = f['v']
+        lat = var.getLatitude()
+        sel = cdms2.selectors.Selector(latitude=(0., 30.))
+        self.assertEqual(sel.plan(var)[0][0], slice(9, 13, 1))
+        lat.assignValue(numpy.arange(-90., 91., 10.) * 2.)
+        self.assertEqual(sel.plan(var)[0][0], slice(9, 11, 1))
+        # Bounds are used by 'b' intervals
+        sel = cdms2.selectors.Selector(latitude=(0., 30., 'cob'))
+        self.assertEqual(sel.plan(var)[0][0], slice(*lat.mapIntervalExt((0., 30., 'cob'))))
+        lat.setBounds(lat.getBounds() * 0.5)
+        self.assertEqual(sel.plan(var)[0][0], slice(*lat.mapIntervalExt((0., 30., 'cob'))))
+
     def testSpatial(self):
         varlist = self.file.getVariables(spatial=1)
 